@@ -1,10 +1,23 @@
 """A collection of python utilities for ArcGIS Pro
+
+Submodules are imported on first access (eg arc_utils.table), and arcpy is
+only imported when a function needs it, so importing arc_utils is fast.
 """
+import importlib
+
 __version__ = '1.1'
 __author__ = 'Grant Herbert'
 
-__all__ = ['aprx.py', 'gdb.py', 'table.py']
+__all__ = ['aprx', 'gdb', 'table', 'output', 'schema_cache', 'sketch', 'instrument', 'backends', 'result_cache']
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module("." + name, __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
 
-from arc_utils import gdb
-from arc_utils import table
-from arc_utils import aprx
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Data backend protocol and helpers shared by the backends which do not use arcpy, see arc_utils.backends."""
+import operator
+import os
+import re
+import types
+
+_CONDITION = re.compile(r"""^\s*"?(\w+)"?\s*(?:(>=|<=|<>|!=|=|<|>)\s*"""
+                        r"""(-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|'(?:[^']|'')*')|IS\s+(NOT\s+)?NULL)\s*$""",
+                        re.IGNORECASE)
+_AND = re.compile(r"\s+AND\s+", re.IGNORECASE)
+_ORDER_BY = re.compile(r"""^\s*ORDER\s+BY\s+"?(\w+)"?(?:\s+(ASC|DESC))?\s*$""", re.IGNORECASE)
+_OPERATORS = {"=": operator.eq, "<>": operator.ne, "<": operator.lt, "<=": operator.le,
+              ">": operator.gt, ">=": operator.ge}
+
+
+class DataBackend(object):
+    """ data access protocol of TableObj and GDBObj
+    Paths are catalog paths of tables and featureclasses, or of workspaces (geodatabases).
+    Subclasses implement exists, describe, fields, iter_row_chunks, domains, walk and workspace.
+    """
+    def exists(self, path):
+        """True if the table or workspace exists"""
+        raise NotImplementedError
+
+    def describe(self, path):
+        """arcpy.Describe like object of a table (name, baseName, catalogPath, path, dataType,
+        fields, hasOID, OIDFieldName and shapeType for featureclasses) or workspace
+        """
+        raise NotImplementedError
+
+    def fields(self, path):
+        """field properties keyed by field name, as per TableObj.field_dict, in table column order"""
+        raise NotImplementedError
+
+    def iter_row_chunks(self, path, fields, batch_size, where_clause=None, sql_clause=(None, None)):
+        """Yield lists of at most batch_size row tuples of fields (names or OID@),
+        as per arcpy.da.SearchCursor(path, fields, where_clause, sql_clause=sql_clause)
+        """
+        raise NotImplementedError
+
+    def domains(self, workspace):
+        """domain index of a workspace, as per gdb.build_domain_index"""
+        raise NotImplementedError
+
+    def walk(self, workspace, datatype):
+        """Yield (path, name, dataset) of the tables or featureclasses (datatype 'Table' or 'FeatureClass')
+        of a workspace, dataset is the feature dataset name or ''
+        """
+        raise NotImplementedError
+
+    def workspace(self, path):
+        """Path of the workspace (geodatabase) containing a table"""
+        raise NotImplementedError
+
+    def delimit_field(self, path, field):
+        """Field name as written in a where clause of the table"""
+        return field
+
+    def sql_pushdown(self, path, describe_obj):
+        """SQLPushdown running aggregate queries on the table in its database, None to read rows"""
+        return None
+
+    def change_stamp(self, path, describe_obj):
+        """Cheap value which changes when the rows of the table change, None if the backend has none
+        (results of the table are then not cached, see arc_utils.result_cache)
+        """
+        return None
+
+
+def _workspace_description(path, workspace_factory):
+    """arcpy.Describe like object of a workspace"""
+    return types.SimpleNamespace(
+        name=os.path.basename(path), baseName=os.path.splitext(os.path.basename(path))[0],
+        catalogPath=path, path=os.path.dirname(path), Path=os.path.dirname(path),
+        dataType="Workspace", workspaceType="LocalDatabase", workspaceFactoryProgID=workspace_factory)
+
+
+def _table_description(name, path, datatype, field_dict, oid_field=None, shape_type=None):
+    """arcpy.Describe like object of a table or featureclass"""
+    parent = os.path.dirname(path)
+    desc = types.SimpleNamespace(
+        name=name, baseName=name.split(".")[-1], catalogPath=path,
+        path=parent, Path=parent, dataType=datatype, isVersioned=False)
+    if datatype == "FeatureDataset":
+        return desc
+    desc.fields = [types.SimpleNamespace(**field) for field in field_dict.values()]
+    if oid_field is None:
+        oid_field = next((f["name"] for f in field_dict.values() if f["type"] == "OID"), None)
+    desc.hasOID = oid_field is not None
+    desc.OIDFieldName = oid_field or ''
+    if datatype == "FeatureClass":
+        desc.shapeType = shape_type
+    return desc
+
+
+def _file_stamp(paths):
+    """(path, modification time, size) of each existing file, a change stamp of file based data"""
+    stamp = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stamp.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp) or None
+
+
+def _quote_identifier(name):
+    """SQL delimited identifier of a table or field name, each part of a qualified name
+    (eg owner.table) quoted separately
+    """
+    return ".".join('"{}"'.format(part.replace('"', '""')) for part in name.split("."))
+
+
+def _where_conditions(where_clause):
+    """(field name, operator, value) of each comparison of a where clause of comparisons joined by AND,
+    the where clauses supported by backends which do not use a database
+    """
+    if not where_clause or not where_clause.strip():
+        return []
+    conditions = []
+    for part in _AND.split(where_clause.strip()):
+        match = _CONDITION.match(part)
+        if match is None:
+            raise ValueError("where clause {!r} is not supported without arcpy, "
+                             "only comparisons of a field with a value joined by AND".format(where_clause))
+        name, comparison, literal, negate = match.groups()
+        if comparison is None:
+            conditions.append((name, "IS NOT NULL" if negate else "IS NULL", None))
+        elif literal.startswith("'"):
+            conditions.append((name, "<>" if comparison == "!=" else comparison, literal[1:-1].replace("''", "'")))
+        else:
+            value = float(literal) if any(c in literal for c in ".eE") else int(literal)
+            conditions.append((name, "<>" if comparison == "!=" else comparison, value))
+    return conditions
+
+
+def _matches(value, comparison, literal):
+    """True if a value satisfies a where clause comparison (comparisons with NULL are false, as in SQL)"""
+    if comparison == "IS NULL":
+        return value is None
+    if comparison == "IS NOT NULL":
+        return value is not None
+    if value is None:
+        return False
+    try:
+        return _OPERATORS[comparison](value, literal)
+    except TypeError:
+        return False
+
+
+def _descending_oid_order(sql_clause, oid_field):
+    """True for an ORDER BY <OID field> DESC sql clause, False for no or ascending order,
+    other sql clauses are not supported without arcpy
+    """
+    prefix, postfix = sql_clause or (None, None)
+    if prefix:
+        raise ValueError("sql prefix {!r} is not supported without arcpy".format(prefix))
+    if not postfix:
+        return False
+    order = _ORDER_BY.match(postfix)
+    if order is None or not oid_field or order.group(1).lower() != oid_field.lower():
+        raise ValueError("sql postfix {!r} is not supported without arcpy, only ORDER BY the OID field".format(postfix))
+    return (order.group(2) or "ASC").upper() == "DESC"
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""Geodatabase catalogs read without arcpy.
+
+Mobile and file geodatabases both describe their tables, feature datasets and
+domains in a GDB_Items system table, with an xml definition per item. The
+GeodatabaseCatalog data backend parses those items, the mobile (sqlite3) and
+file geodatabase (mmap) readers supply the item rows, fields and table rows.
+"""
+import os
+import xml.etree.ElementTree as ElementTree
+from functools import cached_property
+from ._backend import DataBackend
+from ._backend import _file_stamp
+from ._backend import _table_description
+from ._backend import _workspace_description
+
+# GDB_ItemTypes names of the catalog items used, and the arcpy data type of each
+_ITEM_TYPES = {"Feature Class": "FeatureClass", "Table": "Table", "Feature Dataset": "FeatureDataset",
+               "Coded Value Domain": "CodedValue", "Range Domain": "Range"}
+
+_SHAPE_TYPES = {"esriGeometryPoint": "Point", "esriGeometryMultipoint": "Multipoint",
+                "esriGeometryPolyline": "Polyline", "esriGeometryPolygon": "Polygon",
+                "esriGeometryMultiPatch": "MultiPatch"}
+
+_XSD_CONVERTERS = {"xs:short": int, "xs:int": int, "xs:long": int, "xs:double": float, "xs:float": float}
+
+_XSI_TYPE = "{http://www.w3.org/2001/XMLSchema-instance}type"
+
+# (catalog file stamp, catalog) keyed by (catalog class, normalized geodatabase path), see _cached_catalog
+_catalogs = {}
+
+
+def _cached_catalog(catalog_class, path):
+    """catalog_class(path), reused while its catalog files are unchanged so that
+    GDB_Items is parsed once per geodatabase rather than once per table
+    """
+    path = os.path.abspath(path)
+    key = (catalog_class, os.path.normcase(path))
+    stamp = _file_stamp(catalog_class._catalog_files(path))
+    cached = _catalogs.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = _catalogs[key] = (stamp, catalog_class(path))
+    return cached[1]
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element, name, default=None):
+    for child in element:
+        if _local_name(child.tag) == name:
+            return child.text if child.text is not None else default
+    return default
+
+
+def _unqualified(name):
+    """Item name without the main. schema prefix used by mobile geodatabases"""
+    return name.split(".")[-1]
+
+
+def _path_key(path):
+    """Comparable form of a catalog path within a geodatabase"""
+    parts = [p for p in os.path.normcase(path).replace("\\", "/").split("/") if p]
+    return tuple(_unqualified(p) for p in parts)
+
+
+def _bool_text(text, default=False):
+    if text is None:
+        return default
+    return text.strip().lower() == "true"
+
+
+def _xsd_value(element):
+    """Python value of an xsi typed element (eg <Code xsi:type="xs:int">3</Code>)"""
+    text = element.text
+    converter = _XSD_CONVERTERS.get(element.get(_XSI_TYPE))
+    if text is None or converter is None:
+        return text
+    return converter(text)
+
+
+class GeodatabaseCatalog(DataBackend):
+    """ read only data backend of a geodatabase, with the catalog read from its GDB_Items table
+    Subclasses read the item rows (_item_rows), fields and table rows.
+    :param
+        path: path to the geodatabase
+    """
+    workspace_factory = None
+    # errors meaning a catalog item cannot be read, so exists() is False
+    _read_errors = (ValueError,)
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+    @staticmethod
+    def _catalog_files(path):
+        """files of the geodatabase at path which change when its catalog changes"""
+        raise NotImplementedError
+
+    def _item_rows(self):
+        """(name, catalog path, GDB_ItemTypes name, xml definition) of each catalog item of the types used"""
+        raise NotImplementedError
+
+    @cached_property
+    def items(self):
+        """catalog items (tables, featureclasses, feature datasets and domains) from GDB_Items,
+        as dictionaries of name, datatype, path (catalog path), dataset and definition (xml element)
+        """
+        items = []
+        for name, item_path, type_name, definition in self._item_rows():
+            parts = [p for p in (item_path or name).replace("/", "\\").split("\\") if p]
+            items.append({
+                "name": name,
+                "datatype": _ITEM_TYPES[type_name],
+                "path": os.path.join(self.path, *parts),
+                "dataset": parts[-2] if len(parts) > 1 else '',
+                "definition": ElementTree.fromstring(definition) if definition else None,
+            })
+        return items
+
+    def _item(self, path):
+        key = _path_key(os.path.relpath(path, self.path))
+        for item in self.items:
+            if item["datatype"] in ("FeatureClass", "Table", "FeatureDataset") and \
+                    _path_key(os.path.relpath(item["path"], self.path)) == key:
+                return item
+        # table names are unique in a geodatabase, so a path without the feature dataset is also found
+        for item in self.items:
+            if item["datatype"] in ("FeatureClass", "Table") and key and \
+                    _unqualified(os.path.normcase(item["name"])) == key[-1]:
+                return item
+        raise ValueError("invalid path")
+
+    def _field_definitions(self, item):
+        """GPFieldInfoEx elements of an item definition keyed by lower case field name"""
+        definitions = {}
+        if item["definition"] is not None:
+            for element in item["definition"].iter():
+                if _local_name(element.tag) == "GPFieldInfoEx":
+                    definitions[(_child_text(element, "Name") or '').lower()] = element
+        return definitions
+
+    def exists(self, path):
+        """True if path is the geodatabase or a table, featureclass or feature dataset in it"""
+        if not os.path.exists(self.path):
+            return False
+        if os.path.normcase(os.path.abspath(path)) == os.path.normcase(self.path):
+            return True
+        try:
+            self._item(path)
+        except self._read_errors:
+            return False
+        return True
+
+    def describe(self, path):
+        """arcpy.Describe like object of the geodatabase or a table in it"""
+        if os.path.normcase(os.path.abspath(path)) == os.path.normcase(self.path):
+            return _workspace_description(self.path, self.workspace_factory)
+        item = self._item(path)
+        if item["datatype"] == "FeatureDataset":
+            return _table_description(item["name"], item["path"], item["datatype"], {})
+        definition = item["definition"]
+        shape_type = _child_text(definition, "ShapeType") if definition is not None else None
+        return _table_description(item["name"], item["path"], item["datatype"], self.fields(path),
+                                  oid_field=_child_text(definition, "OIDFieldName") if definition is not None else None,
+                                  shape_type=_SHAPE_TYPES.get(shape_type, shape_type))
+
+    def domains(self, workspace):
+        domain_index = {}
+        for item in self.items:
+            if item["datatype"] not in ("CodedValue", "Range") or item["definition"] is None:
+                continue
+            definition = item["definition"]
+            name = _child_text(definition, "DomainName") or item["name"]
+            coded_values = {}
+            value_range = None
+            if item["datatype"] == "CodedValue":
+                for element in definition.iter():
+                    if _local_name(element.tag) == "CodedValue":
+                        code = next(c for c in element if _local_name(c.tag) == "Code")
+                        coded_values[_xsd_value(code)] = _child_text(element, "Name")
+            else:
+                bounds = {_local_name(c.tag): _xsd_value(c) for c in definition
+                          if _local_name(c.tag) in ("MinValue", "MaxValue")}
+                value_range = (bounds.get("MinValue"), bounds.get("MaxValue"))
+            domain_index[name] = {
+                "name": name,
+                "domainType": item["datatype"],
+                "type": (_child_text(definition, "FieldType") or '').replace("esriFieldType", ""),
+                "codedValues": coded_values,
+                "range": value_range,
+            }
+        return domain_index
+
+    def walk(self, workspace, datatype):
+        for item in self.items:
+            if item["datatype"] == datatype:
+                yield item["path"], item["name"], item["dataset"]
+
+    def workspace(self, path):
+        return self.path
@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+"""Read only access to file geodatabases (.gdb folders) without arcpy.
+
+Each table is a .gdbtable file (field descriptors and rows) with a .gdbtablx
+file of row offsets by OID. Both are memory mapped and read in place: fixed
+width values are unpacked straight from the map, and only the requested
+fields of each row are decoded. Catalog items and domains come from the
+GDB_Items system table, as for mobile geodatabases.
+
+Geometry and raster values are not decoded, cursor tokens other than OID@
+are not supported, and where clauses are limited to comparisons of a field
+with a value joined by AND (eg the OID ranges of partitioned scans).
+Tables written by ArcGIS Pro 3.2 and later with 64 bit OIDs are not supported.
+"""
+import mmap
+import os
+import struct
+import sys
+from collections import namedtuple
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from functools import cached_property
+from ._backend import _descending_oid_order
+from ._backend import _file_stamp
+from ._backend import _matches
+from ._backend import _where_conditions
+from ._catalog import GeodatabaseCatalog
+from ._catalog import _cached_catalog
+from ._catalog import _ITEM_TYPES
+from ._catalog import _child_text
+
+FILEGDB_EXTENSION = ".gdb"
+# readers of file geodatabase paths: 'auto' uses python only when arcpy is not installed
+FILEGDB_READERS = ("auto", "python", "arcpy")
+_filegdb_reader = "auto"
+
+# GDB_SystemCatalog table, listing the table name of each aNNNNNNNN.gdbtable file
+_SYSTEM_CATALOG = "a00000001"
+
+# .gdbtable field type codes, as arcpy field types
+_FIELD_TYPES = {0: "SmallInteger", 1: "Integer", 2: "Single", 3: "Double", 4: "String", 5: "Date",
+                6: "OID", 7: "Geometry", 8: "Blob", 9: "Raster", 10: "GUID", 11: "GlobalID", 12: "XML",
+                13: "BigInteger", 14: "DateOnly", 15: "TimeOnly", 16: "TimestampOffset"}
+
+# fixed width field types and their struct formats
+_FIXED_FORMATS = {"SmallInteger": struct.Struct("<h"), "Integer": struct.Struct("<i"),
+                  "Single": struct.Struct("<f"), "Double": struct.Struct("<d"), "Date": struct.Struct("<d"),
+                  "BigInteger": struct.Struct("<q"), "DateOnly": struct.Struct("<d"),
+                  "TimeOnly": struct.Struct("<d"), "TimestampOffset": struct.Struct("<dh")}
+# field types stored as a variable length byte count followed by the bytes
+_VARIABLE_TYPES = ("String", "XML", "Blob", "Geometry", "Raster")
+_UNREADABLE_TYPES = ("Geometry", "Raster")
+# raster field storage: managed rasters are stored as a 4 byte raster id, external
+# (a path) and inline rasters as a variable length value
+_MANAGED_RASTER = 1
+
+# dates are stored as days since 1899-12-30
+_EPOCH = datetime(1899, 12, 30)
+
+_FieldDescriptor = namedtuple("_FieldDescriptor",
+                              "name alias type length nullable required editable default raster_type")
+
+
+
+def set_filegdb_reader(reader):
+    """Choose how file geodatabases (.gdb) are read.
+        :param reader {String}:
+            'auto' (default) reads them with the python reader when arcpy is not installed,
+            'python' always uses the python reader, 'arcpy' always uses arcpy
+    """
+    global _filegdb_reader
+    if reader not in FILEGDB_READERS:
+        raise ValueError("reader must be one of {}".format(", ".join(FILEGDB_READERS)))
+    _filegdb_reader = reader
+
+
+def get_filegdb_reader():
+    """Return the file geodatabase reader setting"""
+    return _filegdb_reader
+
+
+def _file_geodatabase_path(path):
+    """The .gdb folder part of a catalog path (the first path component ending in .gdb),
+    or None for other paths
+    """
+    if not isinstance(path, str):
+        return None
+    lower_path = path.lower()
+    index = lower_path.find(FILEGDB_EXTENSION)
+    while index != -1:
+        end = index + len(FILEGDB_EXTENSION)
+        if end == len(path) or path[end] in "\\/":
+            return path[:end]
+        index = lower_path.find(FILEGDB_EXTENSION, end)
+    return None
+
+
+def _use_python(path):
+    """True if path is in a file geodatabase which should be read with the python reader"""
+    if _filegdb_reader == "arcpy" or _file_geodatabase_path(path) is None:
+        return False
+    if _filegdb_reader == "python":
+        return True
+    from ._lazy import arcpy
+    return not arcpy._available()
+
+
+def _file_geodatabase(path):
+    """FileGeodatabase for the geodatabase containing path, if it should be read with the python reader"""
+    if not _use_python(path):
+        return None
+    return _cached_catalog(FileGeodatabase, _file_geodatabase_path(path))
+
+
+def _varuint(buffer, pos):
+    """(value, next position) of a variable length unsigned integer, 7 bits per byte, low bits first"""
+    value = shift = 0
+    while True:
+        byte = buffer[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _utf16(buffer, pos):
+    """(string, next position) of a utf-16 string prefixed by its length in characters"""
+    end = pos + 1 + buffer[pos] * 2
+    return str(buffer[pos + 1:end], "utf-16-le"), end
+
+
+def _guid(buffer):
+    """GUID text as returned by arcpy ({XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX}) of 16 bytes"""
+    import uuid
+    return "{" + str(uuid.UUID(bytes_le=bytes(buffer))).upper() + "}"
+
+
+def _date(days):
+    return _EPOCH + timedelta(milliseconds=round(days * 86400000))
+
+
+def _date_only(days):
+    return _date(days).date()
+
+
+def _time_only(days):
+    return _date(days).time()
+
+
+def _timestamp_offset(days, offset):
+    return _date(days).replace(tzinfo=timezone(timedelta(minutes=offset)))
+
+
+# converters of values unpacked from fixed width fields, None returns the first value unchanged
+_FIXED_CONVERTERS = {"Date": _date, "DateOnly": _date_only, "TimeOnly": _time_only,
+                     "TimestampOffset": _timestamp_offset}
+
+
+def _read_field_descriptors(buffer, pos):
+    """list of _FieldDescriptor of the field description section of a .gdbtable"""
+    field_count = struct.unpack_from("<H", buffer, pos + 12)[0]
+    pos += 14
+    fields = []
+    for _ in range(field_count):
+        name, pos = _utf16(buffer, pos)
+        alias, pos = _utf16(buffer, pos)
+        field_type = _FIELD_TYPES.get(buffer[pos])
+        if field_type is None:
+            raise ValueError("unsupported field type {} of field {}".format(buffer[pos], name))
+        pos += 1
+        length, default, raster_type = 0, None, None
+        if field_type == "String":
+            length, flags = struct.unpack_from("<IB", buffer, pos)
+            default_length, pos = _varuint(buffer, pos + 5)
+            if default_length:
+                default = str(buffer[pos:pos + default_length], "utf-8")
+            pos += default_length
+        elif field_type == "Geometry":
+            flags = buffer[pos + 1]
+            wkt_length = struct.unpack_from("<H", buffer, pos + 2)[0]
+            pos += 4 + wkt_length
+            geometry_flags = buffer[pos]
+            has_m, has_z = bool(geometry_flags & 2), bool(geometry_flags & 4)
+            # origins and scales, tolerances and the xy extent
+            pos += 1 + 8 * (3 + 2 * has_m + 2 * has_z + 1 + has_m + has_z + 4)
+            # optional z and m extents precede the count (1 to 3) of spatial index grid sizes
+            while not (buffer[pos] == 0 and 1 <= buffer[pos + 1] <= 3 and
+                       bytes(buffer[pos + 2:pos + 5]) == b"\0\0\0"):
+                pos += 8
+            pos += 5 + 8 * buffer[pos + 1]
+        elif field_type == "Raster":
+            flags = buffer[pos + 1]
+            pos = _utf16(buffer, pos + 2)[1]  # raster column name
+            wkt_length = struct.unpack_from("<H", buffer, pos)[0]
+            pos += 2 + wkt_length
+            raster_flags = buffer[pos]
+            has_m, has_z = bool(raster_flags & 2), bool(raster_flags & 4)
+            pos += 1
+            if raster_flags:
+                # origins and scales, tolerances
+                pos += 8 * (3 + 2 * has_m + 2 * has_z + 1 + has_m + has_z)
+            raster_type = buffer[pos]
+            pos += 1
+        elif field_type in ("OID", "GUID", "GlobalID", "Blob", "XML"):
+            length, flags = buffer[pos], buffer[pos + 1]
+            pos += 2
+        else:
+            length, flags, default_length = buffer[pos], buffer[pos + 1], buffer[pos + 2]
+            pos += 3
+            if default_length == _FIXED_FORMATS[field_type].size:
+                default = _FIXED_FORMATS[field_type].unpack_from(buffer, pos)
+                converter = _FIXED_CONVERTERS.get(field_type)
+                default = converter(*default) if converter else default[0]
+            pos += default_length
+        fields.append(_FieldDescriptor(name, alias, field_type, length, bool(flags & 1), bool(flags & 2),
+                                       bool(flags & 4), default, raster_type))
+    return fields
+
+
+class _GDBTable(object):
+    """ memory mapped .gdbtable and .gdbtablx files of a table
+    Usage: with _GDBTable(path) as table: rows = list(table.rows([0, 1]))
+    :param
+        path: path of the table files without extension, eg data.gdb/a00000009
+    """
+    def __init__(self, path):
+        self.path = path
+        self._maps = []
+        self._views = []
+        try:
+            self._data = self._map(path + ".gdbtable")
+            self._index = self._map(path + ".gdbtablx")
+            self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _map(self, file_name):
+        with open(file_name, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return self._view(memoryview(mapped))
+
+    def _view(self, view):
+        self._views.append(view)
+        return view
+
+    def _read_header(self):
+        version, self.row_count = struct.unpack_from("<iI", self._data, 0)
+        if version != 3:
+            raise ValueError("unsupported file geodatabase table version {} of {}".format(version, self.path))
+        self.fields = _read_field_descriptors(self._data, struct.unpack_from("<Q", self._data, 32)[0])
+        self._null_bytes = (sum(f.nullable for f in self.fields) + 7) // 8
+        blocks, self.max_oid, self._offset_size = struct.unpack_from("<III", self._index, 4)
+        # index of each 1024 row block of offsets, None if all blocks are present
+        self._blocks = None
+        self._offsets = None
+        if not blocks:
+            self.max_oid = 0
+            return
+        trailer = 16 + blocks * 1024 * self._offset_size
+        bitmap_words, total_blocks = struct.unpack_from("<II", self._index, trailer)
+        if bitmap_words:
+            bitmap = bytes(self._index[trailer + 16:trailer + 16 + bitmap_words * 4])
+            self._blocks = []
+            present = 0
+            for block in range(total_blocks):
+                if block >> 3 < len(bitmap) and bitmap[block >> 3] >> (block & 7) & 1:
+                    self._blocks.append(present)
+                    present += 1
+                else:
+                    self._blocks.append(None)
+        elif self._offset_size == 4 and sys.byteorder == "little":
+            # zero copy array of the row offsets
+            self._offsets = self._view(self._index[16:16 + self.max_oid * 4].cast("I"))
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._views, self._maps = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+    def field_index(self, name):
+        """Position of a field in the table, by case insensitive name"""
+        for index, field in enumerate(self.fields):
+            if field.name.lower() == name.lower():
+                return index
+        raise ValueError("Cannot find field '{}'".format(name))
+
+    def _row_offset(self, oid):
+        """Position of the row in the .gdbtable, 0 for deleted rows"""
+        index = oid - 1
+        if self._offsets is not None:
+            return self._offsets[index]
+        if self._blocks is not None:
+            block = self._blocks[index >> 10] if index >> 10 < len(self._blocks) else None
+            if block is None:
+                return 0
+            index = (block << 10) | (index & 1023)
+        pos = 16 + index * self._offset_size
+        return int.from_bytes(self._index[pos:pos + self._offset_size], "little")
+
+    def rows(self, columns, first=1, last=None, reverse=False):
+        """Yield tuples of the values of the fields at the columns positions,
+        for the rows with first <= OID <= last, in OID order
+        """
+        data = self._data
+        count = len(columns)
+        oid_outputs = [i for i, c in enumerate(columns) if self.fields[c].type == "OID"]
+        stop = max([c for c in columns if self.fields[c].type != "OID"] or [-1])
+        # (kind, struct or None, null bit or -1, output positions, converter) of each stored field to read
+        steps = []
+        null_bit = 0
+        for index, field in enumerate(self.fields):
+            if index > stop:
+                break
+            if field.type == "OID":
+                continue
+            bit = -1
+            if field.nullable:
+                bit = null_bit
+                null_bit += 1
+            outputs = [i for i, c in enumerate(columns) if c == index]
+            if field.type in _FIXED_FORMATS:
+                steps.append((0, _FIXED_FORMATS[field.type], bit, outputs, _FIXED_CONVERTERS.get(field.type)))
+            elif field.raster_type == _MANAGED_RASTER:
+                steps.append((0, _FIXED_FORMATS["Integer"], bit, outputs, None))
+            elif field.type in _VARIABLE_TYPES:
+                steps.append((1, None, bit, outputs, bytes if field.type == "Blob" else None))
+            else:
+                steps.append((2, None, bit, outputs, _guid))
+        null_bytes = self._null_bytes
+        last = self.max_oid if last is None else min(last, self.max_oid)
+        oids = range(max(first, 1), last + 1)
+        for oid in (reversed(oids) if reverse else oids):
+            offset = self._row_offset(oid)
+            if not offset:
+                continue
+            pos = offset + 4
+            nulls = int.from_bytes(data[pos:pos + null_bytes], "little")
+            pos += null_bytes
+            row = [None] * count
+            for i in oid_outputs:
+                row[i] = oid
+            for kind, fixed, bit, outputs, convert in steps:
+                if bit >= 0 and nulls >> bit & 1:
+                    continue
+                if kind == 0:
+                    if outputs:
+                        value = fixed.unpack_from(data, pos)
+                        value = convert(*value) if convert else value[0]
+                        for i in outputs:
+                            row[i] = value
+                    pos += fixed.size
+                elif kind == 1:
+                    length, pos = _varuint(data, pos)
+                    if outputs:
+                        value = convert(data[pos:pos + length]) if convert else str(data[pos:pos + length], "utf-8")
+                        for i in outputs:
+                            row[i] = value
+                    pos += length
+                else:
+                    if outputs:
+                        value = convert(data[pos:pos + 16])
+                        for i in outputs:
+                            row[i] = value
+                    pos += 16
+            yield tuple(row)
+
+
+def _oid_bounds(conditions, oid_index, table):
+    """(first, last) OIDs which can satisfy the OID comparisons of a where clause"""
+    first, last = 1, table.max_oid
+    for index, comparison, value in conditions:
+        if index != oid_index or isinstance(value, str) or value is None:
+            continue
+        if comparison in (">=", "="):
+            first = max(first, int(-(-value // 1)))
+        if comparison == ">":
+            first = max(first, int(value // 1) + 1)
+        if comparison in ("<=", "="):
+            last = min(last, int(value // 1))
+        if comparison == "<":
+            last = min(last, int(-(-value // 1)) - 1)
+    return first, last
+
+
+class FileGeodatabase(GeodatabaseCatalog):
+    """ read only view of a file geodatabase
+    Usage: fgdb = FileGeodatabase(path)
+    :param
+        path: path to the .gdb folder
+    """
+    workspace_factory = "esriDataSourcesGDB.FileGDBWorkspaceFactory"
+    _read_errors = (ValueError, OSError, struct.error)
+
+    @staticmethod
+    def _catalog_files(path):
+        # GDB_SystemCatalog lists the table files, GDB_Items holds the item definitions
+        return [os.path.join(path, name + ".gdbtable") for name in (_SYSTEM_CATALOG, "a00000004")]
+
+    @cached_property
+    def _table_files(self):
+        """table file paths (without extension) keyed by lower case table name, from GDB_SystemCatalog"""
+        with _GDBTable(os.path.join(self.path, _SYSTEM_CATALOG)) as catalog:
+            columns = [catalog.field_index(f.name) for f in catalog.fields if f.type == "OID"]
+            columns.append(catalog.field_index("Name"))
+            return {name.lower(): os.path.join(self.path, "a{:08x}".format(oid))
+                    for oid, name in catalog.rows(columns)}
+
+    def _table(self, name):
+        """open _GDBTable of a table by name"""
+        file_path = self._table_files.get(name.lower())
+        if file_path is None:
+            raise ValueError("Cannot find table {}".format(name))
+        return _GDBTable(file_path)
+
+    def _item_rows(self):
+        with self._table("GDB_ItemTypes") as item_types:
+            type_names = dict(item_types.rows([item_types.field_index("UUID"), item_types.field_index("Name")]))
+        rows = []
+        with self._table("GDB_Items") as items:
+            columns = [items.field_index(f) for f in ("Name", "Path", "Type", "Definition")]
+            for name, item_path, item_type, definition in items.rows(columns):
+                if type_names.get(item_type) in _ITEM_TYPES:
+                    rows.append((name, item_path, type_names[item_type], definition))
+        return rows
+
+    def fields(self, path):
+        item = self._item(path)
+        definitions = self._field_definitions(item)
+        with self._table(item["name"]) as table:
+            descriptors = table.fields
+        field_dict = {}
+        for field in descriptors:
+            element = definitions.get(field.name.lower())
+            field_dict[field.name] = {
+                "name": field.name,
+                "baseName": field.name,
+                "aliasName": field.alias or field.name,
+                "type": field.type,
+                "length": field.length,
+                "required": field.required,
+                "domain": (_child_text(element, "DomainName") if element is not None else None) or '',
+                "defaultValue": field.default,
+                "precision": 0,
+                "scale": 0,
+                "isNullable": field.nullable,
+                "editable": field.editable,
+            }
+        return field_dict
+
+    def iter_row_chunks(self, path, fields, batch_size, where_clause=None, sql_clause=(None, None)):
+        import itertools
+
+        item = self._item(path)
+        with self._table(item["name"]) as table:
+            oid_index = next((i for i, f in enumerate(table.fields) if f.type == "OID"), None)
+            columns = []
+            for field in fields:
+                if field.upper() == "OID@" and oid_index is not None:
+                    columns.append(oid_index)
+                    continue
+                if "@" in field:
+                    raise ValueError("cursor token {} is not supported by the file geodatabase reader".format(field))
+                index = table.field_index(field)
+                if table.fields[index].type in _UNREADABLE_TYPES:
+                    raise ValueError("{} field {} is not supported by the file geodatabase reader".format(
+                        table.fields[index].type, field))
+                columns.append(index)
+            conditions = [(table.field_index(name), comparison, value)
+                          for name, comparison, value in _where_conditions(where_clause)]
+            reverse = _descending_oid_order(sql_clause, table.fields[oid_index].name if oid_index is not None else None)
+            first, last = _oid_bounds(conditions, oid_index, table)
+            count = len(columns)
+            rows = table.rows(columns + [index for index, comparison, value in conditions], first, last, reverse)
+            if conditions:
+                tests = [(count + i, comparison, value) for i, (index, comparison, value) in enumerate(conditions)]
+                rows = (row[:count] for row in rows
+                        if all(_matches(row[i], comparison, value) for i, comparison, value in tests))
+            while True:
+                chunk = list(itertools.islice(rows, batch_size))
+                if not chunk:
+                    return
+                yield chunk
+
+    def change_stamp(self, path, describe_obj):
+        # the .gdbtable and .gdbtablx files of the table are rewritten by every edit
+        file_path = self._table_files.get(describe_obj.name.lower())
+        if file_path is None:
+            return None
+        return _file_stamp((file_path + ".gdbtable", file_path + ".gdbtablx"))
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 """Shared input coercion helpers for arc_utils."""
 import os
-import arcpy
+from ._lazy import arcpy
+from .backends import ArcpyBackend
+from .backends import get_data_backend
 
 
 def _normalize_to_sequence(values):
@@ -36,15 +38,30 @@ def _resolve_dataset_path(value, arg_name="value"):
     - objects exposing .path (wrapper objects)
     - ArcGIS Pro map/layer objects exposing .catalogPath or .dataSource
     """
+    return _resolve_dataset(value, arg_name)[0]
+
+
+def _resolve_dataset(value, arg_name="value"):
+    """Resolve supported dataset inputs (see _resolve_dataset_path) to a tuple of
+    path string and the arcpy Describe object of the path, or None if the input
+    was not described as itself (a layer, or a workspace read without arcpy).
+    A Describe object also means the path exists.
+    """
     def _resolve_candidate(candidate):
         """Resolve map layer names and object references to catalog paths."""
+        if not isinstance(get_data_backend(candidate), ArcpyBackend):
+            # workspace read without arcpy, there are no layers to resolve
+            return os.path.abspath(candidate), None
         try:
             desc = arcpy.Describe(candidate)
             if hasattr(desc, "catalogPath") and desc.catalogPath:
-                return os.path.abspath(desc.catalogPath)
+                path = os.path.abspath(desc.catalogPath)
+                if os.path.normcase(path) == os.path.normcase(os.path.abspath(candidate)):
+                    return path, desc
+                return path, None
         except Exception:
             pass
-        return os.path.abspath(candidate)
+        return os.path.abspath(candidate), None
 
     for attr in ("path", "catalogPath", "dataSource"):
         if hasattr(value, attr):
@@ -79,9 +96,9 @@ def _resolve_aprx_path(value, arg_name="value"):
     raise TypeError("{} must be a path-like string or object with a valid path".format(arg_name))
 
 
-def _ensure_valid_path(path):
+def _ensure_valid_path(path, data_backend=None):
     """Validate ArcGIS path-like input and raise a consistent error."""
-    if not arcpy.Exists(path):
+    if not (data_backend or get_data_backend(path)).exists(path):
         raise ValueError("invalid path")
     return path
 
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Deferred import of arcpy.
+
+Importing arcpy takes several seconds and checks out a licence, so arc_utils
+modules use this proxy instead and arcpy is only imported on first use.
+"""
+import importlib
+import types
+
+# set by arc_utils.instrument while instrumenting, called as hook(module name, attribute, value)
+_instrument_hook = None
+
+
+class _LazyModule(types.ModuleType):
+    """Module proxy which imports the real module on first attribute access"""
+    def __init__(self, name):
+        super(_LazyModule, self).__init__(name)
+        self.__dict__["_module"] = None
+        self.__dict__["_import_error"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            # a failed import is not retried, so code paths which work without
+            # the module (eg the mobile geodatabase reader) do not search for it on every call
+            if self.__dict__["_import_error"] is not None:
+                raise self.__dict__["_import_error"]
+            try:
+                module = importlib.import_module(self.__name__)
+            except ImportError as e:
+                self.__dict__["_import_error"] = e
+                raise
+            self.__dict__["_module"] = module
+        return module
+
+    def _available(self):
+        """True if the module can be imported"""
+        try:
+            self._load()
+        except ImportError:
+            return False
+        return True
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        if _instrument_hook is not None:
+            value = _instrument_hook(self.__name__, attr, value)
+        return value
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+arcpy = _LazyModule("arcpy")
+
+
+class _MissingExecuteError(Exception):
+    """Stands in for arcpy.ExecuteError when arcpy is not installed, never raised"""
+
+
+def _execute_error():
+    """arcpy.ExecuteError, for except clauses which also run without arcpy"""
+    if arcpy._available():
+        return arcpy.ExecuteError
+    return _MissingExecuteError
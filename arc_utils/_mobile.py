@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""Read only access to mobile geodatabases (.geodatabase SQLite files) with sqlite3.
+
+Tables, fields and domains are read from the GDB_Items catalog table, and rows
+are read with SQL, so mobile geodatabases can be profiled without arcpy (eg on
+Linux workers). Geometry fields are listed but cannot be read, and cursor
+tokens other than OID@ are not supported.
+"""
+import os
+import sqlite3
+from ._backend import _file_stamp
+from ._backend import _quote_identifier
+from ._catalog import GeodatabaseCatalog
+from ._catalog import _cached_catalog
+from ._catalog import _ITEM_TYPES
+from ._catalog import _bool_text
+from ._catalog import _child_text
+from ._catalog import _unqualified
+
+MOBILE_EXTENSION = ".geodatabase"
+# readers of mobile geodatabase paths: 'auto' uses sqlite only when arcpy is not installed
+MOBILE_READERS = ("auto", "sqlite", "arcpy")
+_mobile_reader = "auto"
+
+# field types by declared SQLite column type, for columns missing from the item definition
+_DECLARED_TYPES = (("INT", "Integer"), ("REAL", "Double"), ("FLOA", "Double"), ("DOUB", "Double"),
+                   ("CHAR", "String"), ("TEXT", "String"), ("CLOB", "String"), ("BLOB", "Blob"),
+                   ("DATE", "Date"), ("TIME", "Date"), ("GEOM", "Geometry"), ("UUID", "GUID"))
+
+
+def set_mobile_reader(reader):
+    """Choose how mobile geodatabases (.geodatabase) are read.
+        :param reader {String}:
+            'auto' (default) reads them with sqlite3 when arcpy is not installed,
+            'sqlite' always uses sqlite3, 'arcpy' always uses arcpy
+    """
+    global _mobile_reader
+    if reader not in MOBILE_READERS:
+        raise ValueError("reader must be one of {}".format(", ".join(MOBILE_READERS)))
+    _mobile_reader = reader
+
+
+def get_mobile_reader():
+    """Return the mobile geodatabase reader setting"""
+    return _mobile_reader
+
+
+def _mobile_geodatabase_path(path):
+    """The .geodatabase file part of a catalog path, or None for other paths"""
+    if not isinstance(path, str):
+        return None
+    index = path.lower().find(MOBILE_EXTENSION)
+    if index == -1:
+        return None
+    end = index + len(MOBILE_EXTENSION)
+    if end < len(path) and path[end] not in "\\/":
+        return None
+    return path[:end]
+
+
+def _use_sqlite(path):
+    """True if path is in a mobile geodatabase which should be read with sqlite3"""
+    if _mobile_reader == "arcpy" or _mobile_geodatabase_path(path) is None:
+        return False
+    if _mobile_reader == "sqlite":
+        return True
+    from ._lazy import arcpy
+    return not arcpy._available()
+
+
+def _mobile_geodatabase(path):
+    """MobileGeodatabase for the geodatabase containing path, if it should be read with sqlite3"""
+    if not _use_sqlite(path):
+        return None
+    return _cached_catalog(MobileGeodatabase, _mobile_geodatabase_path(path))
+
+
+class MobileGeodatabase(GeodatabaseCatalog):
+    """ read only view of a mobile geodatabase
+    Usage: mgdb = MobileGeodatabase(path)
+    :param
+        path: path to the .geodatabase file
+    """
+    workspace_factory = "esriDataSourcesGDB.SqliteWorkspaceFactory"
+    _read_errors = (ValueError, sqlite3.Error)
+
+    @staticmethod
+    def _catalog_files(path):
+        return [path, path + "-wal"]
+
+    def _connect(self):
+        from urllib.request import pathname2url
+
+        return sqlite3.connect("file:{}?mode=ro".format(pathname2url(self.path)), uri=True)
+
+    def execute(self, sql, parameters=()):
+        """Run a query and return the list of row tuples"""
+        connection = self._connect()
+        try:
+            return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+    def _item_rows(self):
+        return self.execute(
+            "SELECT i.Name, i.Path, t.Name, i.Definition FROM GDB_Items i "
+            "JOIN GDB_ItemTypes t ON i.Type = t.UUID WHERE t.Name IN ({})".format(
+                ", ".join("?" * len(_ITEM_TYPES))), tuple(_ITEM_TYPES))
+
+    def table_name(self, path):
+        """SQLite table name of a table or featureclass"""
+        return _unqualified(self._item(path)["name"])
+
+    def fields(self, path):
+        definitions = self._field_definitions(self._item(path))
+        field_dict = {}
+        columns = self.execute("PRAGMA table_info('{}')".format(self.table_name(path).replace("'", "''")))
+        for cid, name, declared_type, notnull, default, primary_key in columns:
+            element = definitions.get(name.lower())
+            field_type = None
+            if element is not None:
+                field_type = (_child_text(element, "FieldType") or '').replace("esriFieldType", "") or None
+            if field_type is None:
+                field_type = "OID" if primary_key and "INT" in (declared_type or '').upper() else \
+                    next((t for key, t in _DECLARED_TYPES if key in (declared_type or '').upper()), "String")
+            length = _child_text(element, "Length") if element is not None else None
+            if length is None and "(" in (declared_type or ''):
+                length = declared_type[declared_type.index("(") + 1:].rstrip(")").split(",")[0]
+            required = field_type in ("OID", "Geometry") or (
+                element is not None and _bool_text(_child_text(element, "Required")))
+            field_dict[name] = {
+                "name": name,
+                "baseName": name,
+                "aliasName": (_child_text(element, "AliasName") if element is not None else None) or name,
+                "type": field_type,
+                "length": int(length) if length and str(length).strip().isdigit() else 0,
+                "required": required,
+                "domain": (_child_text(element, "DomainName") if element is not None else None) or '',
+                "defaultValue": default,
+                "precision": int(_child_text(element, "Precision", 0)) if element is not None else 0,
+                "scale": int(_child_text(element, "Scale", 0)) if element is not None else 0,
+                "isNullable": _bool_text(_child_text(element, "IsNullable"), not notnull)
+                if element is not None else not notnull,
+                "editable": field_type != "OID",
+            }
+        return field_dict
+
+    def iter_row_chunks(self, path, fields, batch_size, where_clause=None, sql_clause=(None, None)):
+        from datetime import datetime
+
+        field_dict = self.fields(path)
+        names = {name.lower(): name for name in field_dict}
+        columns = []
+        for field in fields:
+            if field.upper() == "OID@":
+                field = self.describe(path).OIDFieldName
+            elif "@" in field:
+                raise ValueError("cursor token {} is not supported for mobile geodatabases "
+                                 "read without arcpy".format(field))
+            if field.lower() not in names:
+                raise ValueError("Cannot find field '{}'".format(field))
+            columns.append(names[field.lower()])
+        dates = [i for i, column in enumerate(columns) if field_dict[column]["type"] == "Date"]
+        prefix, postfix = sql_clause or (None, None)
+        sql = "SELECT {}{} FROM {}".format(prefix + " " if prefix else '', ", ".join(map(_quote_identifier, columns)),
+                                           _quote_identifier(self.table_name(path)))
+        if where_clause:
+            sql += " WHERE " + where_clause
+        if postfix:
+            sql += " " + postfix
+        connection = self._connect()
+        try:
+            cursor = connection.execute(sql)
+            while True:
+                chunk = cursor.fetchmany(batch_size)
+                if not chunk:
+                    return
+                if dates:
+                    chunk = [tuple(datetime.fromisoformat(v) if i in dates and isinstance(v, str) else v
+                                   for i, v in enumerate(row)) for row in chunk]
+                yield chunk
+        finally:
+            connection.close()
+
+    def sql_pushdown(self, path, describe_obj):
+        from ._pushdown import _table_pushdown
+        return _table_pushdown(describe_obj, self.path)
+
+    def change_stamp(self, path, describe_obj):
+        # edits are written to the write ahead log before the database file
+        return _file_stamp((self.path, self.path + "-wal"))
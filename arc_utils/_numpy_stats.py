@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Vectorized column statistics using arcpy.da.TableToNumPyArray.
+
+Columns are read in OID range chunks so memory use is bounded by chunk_size.
+Null values are skipped (skip_nulls) rather than read as a sentinel value, which
+could equal a real value (eg '' or -32768), and are counted from the OIDs of a chunk.
+"""
+from ._lazy import arcpy
+
+# rows read per TableToNumPyArray call
+DEFAULT_CHUNK_SIZE = 500000
+
+# field types supported by the numpy backend
+_NUMPY_FIELD_TYPES = ("OID", "SmallInteger", "Integer", "BigInteger", "Single", "Double", "String")
+
+
+def _supports_field_type(field_type):
+    """True if the numpy backend can process a field of this type"""
+    return field_type in _NUMPY_FIELD_TYPES
+
+
+def _iter_column_chunks(table_path, field, where_clauses, count_nulls=False):
+    """Yield (non null values, null count) numpy chunks of a single column, one chunk per where clause
+    (see TableObj._oid_chunks). The null count is None unless count_nulls is True.
+    """
+    for where_clause in where_clauses:
+        values = arcpy.da.TableToNumPyArray(table_path, [field], where_clause=where_clause, skip_nulls=True)[field]
+        null_count = None
+        if count_nulls:
+            rows = len(arcpy.da.TableToNumPyArray(table_path, ["OID@"], where_clause=where_clause))
+            null_count = rows - len(values)
+        yield values, null_count
+
+
+def _value_set(table_path, field, field_type, where_clauses):
+    """numpy equivalent of TableObj.get_field_value_set"""
+    import numpy
+
+    value_set = set()
+    for values, null_count in _iter_column_chunks(table_path, field, where_clauses, count_nulls=True):
+        value_set.update(numpy.unique(values).tolist())
+        if null_count:
+            value_set.add("NULL")
+    return value_set
+
+
+def _max_value(table_path, field, field_type, where_clauses, lengthcomp=False):
+    """numpy equivalent of TableObj.get_max_field_value"""
+    import numpy
+
+    is_string = field_type == "String"
+    result = '' if is_string else 0
+    for values, null_count in _iter_column_chunks(table_path, field, where_clauses):
+        if len(values) == 0:
+            continue
+        if is_string and lengthcomp:
+            # argmax returns the first of equal lengths, as the cursor version keeps the first seen
+            candidate = values[numpy.argmax(numpy.char.str_len(values))].item()
+            if len(candidate) > len(result):
+                result = candidate
+        else:
+            # numpy.unique sorts, which also works for string arrays
+            candidate = numpy.unique(values)[-1].item()
+            if candidate > result:
+                result = candidate
+    return result
+
+
+def _max_value_length(table_path, field, field_type, where_clauses):
+    """numpy equivalent of TableObj.get_max_field_value_length"""
+    import numpy
+
+    length = 0
+    for values, null_count in _iter_column_chunks(table_path, field, where_clauses):
+        if len(values) == 0:
+            continue
+        if field_type == "String":
+            chunk_length = int(numpy.char.str_len(values).max())
+        elif values.dtype.kind in "iu":
+            # the longest integer as text is either the largest or the most negative
+            chunk_length = max(len(str(values.max().item())), len(str(values.min().item())))
+        else:
+            chunk_length = max(len(str(v)) for v in numpy.unique(values).tolist())
+        length = max(length, chunk_length)
+    return length
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Shared worker pool helpers for arc_utils."""
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _worker_count(workers):
+    """Return the number of pool workers to use, or 0 to run serially.
+
+    None, 0 and 1 run serially, -1 uses all available cpus.
+    """
+    if workers is None:
+        return 0
+    workers = int(workers)
+    if workers < 0:
+        workers = os.cpu_count() or 1
+    return workers if workers > 1 else 0
+
+
+def _worker_settings():
+    """Module settings of this process which worker processes start with:
+    registered data backends, geodatabase readers, stats backend, SQL pushdown,
+    schema and result caches and message level
+    """
+    from . import _filegdb
+    from . import _mobile
+    from . import backends
+    from . import output
+    from . import result_cache
+    from . import schema_cache
+    from . import table
+
+    schema = schema_cache.get_schema_cache()
+    results = result_cache.get_result_cache()
+    return {"data_backends": dict(backends._registered_backends),
+            "mobile_reader": _mobile.get_mobile_reader(),
+            "filegdb_reader": _filegdb.get_filegdb_reader(),
+            "stats_backend": table.get_stats_backend(),
+            "sql_pushdown": table.get_sql_pushdown(),
+            "schema_cache": (schema.path, schema.ttl) if schema is not None else None,
+            "result_cache": results.max_entries if results is not None else None,
+            "message_level": output._message_level}
+
+
+def _apply_worker_settings(settings):
+    """Pool initializer applying the settings of _worker_settings in a worker process"""
+    from . import _filegdb
+    from . import _mobile
+    from . import backends
+    from . import output
+    from . import result_cache
+    from . import schema_cache
+    from . import table
+
+    for workspace, backend in settings["data_backends"].items():
+        backends.register_data_backend(workspace, backend)
+    _mobile.set_mobile_reader(settings["mobile_reader"])
+    _filegdb.set_filegdb_reader(settings["filegdb_reader"])
+    table.set_stats_backend(settings["stats_backend"])
+    table.set_sql_pushdown(settings["sql_pushdown"])
+    if settings["schema_cache"] is not None:
+        schema_cache.enable_schema_cache(*settings["schema_cache"])
+    if settings["result_cache"] is not None:
+        result_cache.enable_result_cache(settings["result_cache"])
+    output.set_message_level(settings["message_level"])
+
+
+def _process_pool(workers):
+    """Create a ProcessPoolExecutor that also works inside ArcGIS Pro.
+
+    Inside the Pro application sys.executable is ArcGISPro.exe, so child
+    processes are pointed at the python interpreter of the active environment.
+    Workers start with the settings of this process (see _worker_settings).
+    """
+    context = multiprocessing.get_context("spawn")
+    executable = os.path.basename(sys.executable).lower()
+    if not executable.startswith("python"):
+        for name in ("pythonw.exe", "python.exe"):
+            candidate = os.path.join(sys.exec_prefix, name)
+            if os.path.exists(candidate):
+                context.set_executable(candidate)
+                break
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                               initializer=_apply_worker_settings, initargs=(_worker_settings(),))
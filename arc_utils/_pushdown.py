@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Aggregate SQL pushdown for tables in database workspaces.
+
+DISTINCT, GROUP BY ... HAVING COUNT(*) > 1 and MAX queries are run by the
+database, so only the results are transferred instead of every row.
+Enterprise geodatabases are queried through arcpy.ArcSDESQLExecute, mobile
+geodatabases (SQLite files) are opened read only with sqlite3.
+String comparisons follow the database collation, eg a case insensitive
+SQL Server collation treats 'A' and 'a' as the same value.
+Table and field names are quoted as SQL standard delimited identifiers ("name"),
+as used by SQLite, PostgreSQL, Oracle and SQL Server (QUOTED_IDENTIFIER ON, the
+default of ArcGIS connections), so names are matched exactly as stored.
+"""
+import os
+from ._backend import _quote_identifier
+from ._lazy import arcpy
+from ._mobile import MOBILE_EXTENSION
+
+# field types whose values are returned unchanged by SQL
+_PUSHDOWN_FIELD_TYPES = ("OID", "String", "SmallInteger", "Integer", "BigInteger", "Single", "Double")
+# field types whose MAX is the same in the database as in python (no collation)
+_PUSHDOWN_MAX_FIELD_TYPES = ("OID", "SmallInteger", "Integer", "BigInteger", "Single", "Double")
+
+
+class SQLPushdown(object):
+    """ run aggregate queries on a single table
+    :param
+        execute: callable taking a SQL statement and returning a list of row tuples
+        table_name: table name as stored in the database (eg owner.table or main.table)
+    """
+    def __init__(self, execute, table_name):
+        self.execute = execute
+        self.table_name = table_name
+
+    def value_set(self, field):
+        """set of distinct values, nulls represented as 'NULL' (as per TableObj.get_field_value_set)"""
+        sql = "SELECT DISTINCT {} FROM {}".format(_quote_identifier(field), _quote_identifier(self.table_name))
+        values = {row[0] for row in self.execute(sql)}
+        if None in values:
+            values.discard(None)
+            values.add("NULL")
+        return values
+
+    def duplicate_counts(self, fields):
+        """list of (value, ..., count) tuples of value combinations occurring more than once"""
+        columns = ", ".join(_quote_identifier(f) for f in fields)
+        sql = "SELECT {0}, COUNT(*) FROM {1} GROUP BY {0} HAVING COUNT(*) > 1".format(
+            columns, _quote_identifier(self.table_name))
+        return [tuple(row) for row in self.execute(sql)]
+
+    def max_value(self, field):
+        """largest non null value, or None if all values are null"""
+        rows = self.execute("SELECT MAX({}) FROM {}".format(_quote_identifier(field),
+                                                            _quote_identifier(self.table_name)))
+        return rows[0][0] if rows else None
+
+
+def _sqlite_executor(database_path):
+    """execute function running SQL on a read only sqlite3 connection"""
+    import sqlite3
+    from urllib.request import pathname2url
+
+    uri = "file:{}?mode=ro".format(pathname2url(os.path.abspath(database_path)))
+
+    def execute(sql):
+        connection = sqlite3.connect(uri, uri=True)
+        try:
+            return connection.execute(sql).fetchall()
+        finally:
+            connection.close()
+    return execute
+
+
+def _arcsde_executor(workspace):
+    """execute function running SQL through arcpy.ArcSDESQLExecute"""
+    connection = arcpy.ArcSDESQLExecute(workspace)
+
+    def execute(sql):
+        return _arcsde_rows(connection.execute(sql))
+    return execute
+
+
+def _arcsde_rows(result):
+    """Normalize an ArcSDESQLExecute result (True for no rows, a single value,
+    or a list of rows) to a list of row tuples
+    """
+    if result is True or result is None:
+        return []
+    if not isinstance(result, list):
+        return [(result,)]
+    if result and not isinstance(result[0], (list, tuple)):
+        return [tuple(result)]
+    return [tuple(row) for row in result]
+
+
+def _is_archived(describe_obj):
+    """True if archiving is enabled on the table, ie the describe object says so or
+    the table has the gdb_to_date field added to the base table by archiving
+    """
+    if getattr(describe_obj, "isArchived", False):
+        return True
+    return any(getattr(field, "name", '').lower() == "gdb_to_date" for field in getattr(describe_obj, "fields", ()))
+
+
+def _table_pushdown(describe_obj, workspace):
+    """SQLPushdown for a table in a database workspace, None if the workspace
+    does not support pushdown (file geodatabases, shapefiles etc.), the table
+    is versioned (edits are held outside the base table) or archived (the base
+    table also holds historical rows).
+    """
+    if getattr(describe_obj, "isVersioned", False) or _is_archived(describe_obj):
+        return None
+    extension = os.path.splitext(workspace)[1].lower()
+    if extension == MOBILE_EXTENSION:
+        return SQLPushdown(_sqlite_executor(workspace), describe_obj.name)
+    if extension == ".gdb":
+        return None
+    if getattr(arcpy.Describe(workspace), "workspaceType", None) == "RemoteDatabase":
+        return SQLPushdown(_arcsde_executor(workspace), describe_obj.name)
+    return None
@@ -2,7 +2,7 @@
 """ArcGIS Pro aprx related utilities
 """
 
-import arcpy
+from ._lazy import arcpy
 import os
 from ._inputs import _resolve_aprx_path
 
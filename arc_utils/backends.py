@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""Data access backends for TableObj and GDBObj.
+
+A data backend lists the schema, rows, domains and catalog of the workspaces
+routed to it. arcpy is the default. Mobile and file geodatabases are read
+without arcpy when it is not installed (see set_mobile_reader and
+set_filegdb_reader), and any workspace can be routed to another backend with
+register_data_backend, eg a MemoryBackend in tests:
+
+    backend = MemoryBackend(r"C:\\data\\test.gdb")
+    backend.add_table("parcels", [("OBJECTID", "OID"), ("zone", "String")], [(1, "R1"), (2, "C2")])
+    register_data_backend(backend.path, backend)
+    tbl = arc_utils.table.TableObj(r"C:\\data\\test.gdb\\parcels")
+"""
+import itertools
+import os
+from ._backend import DataBackend
+from ._backend import _descending_oid_order
+from ._backend import _file_stamp
+from ._backend import _matches
+from ._backend import _table_description
+from ._backend import _where_conditions
+from ._backend import _workspace_description
+from ._lazy import arcpy
+from ._filegdb import get_filegdb_reader
+from ._filegdb import set_filegdb_reader
+from ._mobile import get_mobile_reader
+from ._mobile import set_mobile_reader
+
+__all__ = ["DataBackend", "ArcpyBackend", "MemoryBackend", "register_data_backend", "get_data_backend",
+           "set_mobile_reader", "get_mobile_reader", "set_filegdb_reader", "get_filegdb_reader"]
+
+# backends routed to with register_data_backend, keyed by normalized workspace path
+_registered_backends = {}
+
+
+class ArcpyBackend(DataBackend):
+    """ default data backend, reading through arcpy """
+    def exists(self, path):
+        return arcpy.Exists(path)
+
+    def describe(self, path):
+        return arcpy.Describe(path)
+
+    def fields(self, path):
+        field_dict = dict()
+        for field in arcpy.ListFields(path):
+            field_dict[field.name] = {
+                "name": field.name,
+                "baseName": field.baseName,
+                "aliasName": field.aliasName,
+                "type": field.type,
+                "length": field.length,
+                "required": field.required,
+                "domain": field.domain,
+                "defaultValue": field.defaultValue,
+                "precision": field.precision,
+                "scale": field.scale,
+                "isNullable": field.isNullable,
+                "editable": field.editable
+            }
+        return field_dict
+
+    def iter_row_chunks(self, path, fields, batch_size, where_clause=None, sql_clause=(None, None)):
+        with arcpy.da.SearchCursor(path, fields, where_clause=where_clause, sql_clause=sql_clause) as cursor:
+            rows = iter(cursor)
+            while True:
+                chunk = list(itertools.islice(rows, batch_size))
+                if not chunk:
+                    return
+                yield chunk
+
+    def domains(self, workspace):
+        domain_index = {}
+        for domain in arcpy.da.ListDomains(workspace):
+            coded_values = dict(domain.codedValues) if domain.domainType == 'CodedValue' and domain.codedValues else {}
+            domain_index[domain.name] = {
+                "name": domain.name,
+                "domainType": domain.domainType,
+                "type": domain.type,
+                "codedValues": coded_values,
+                "range": tuple(domain.range) if domain.domainType == 'Range' else None
+            }
+        return domain_index
+
+    def walk(self, workspace, datatype):
+        # arcpy.da.Walk does not change arcpy.env.workspace, so this is safe to call from multiple threads
+        for dirpath, dirnames, filenames in arcpy.da.Walk(workspace, datatype=datatype):
+            dataset = '' if os.path.normcase(dirpath) == os.path.normcase(workspace) else os.path.basename(dirpath)
+            for filename in filenames:
+                yield os.path.join(dirpath, filename), filename, dataset
+
+    def workspace(self, path):
+        workspace = arcpy.Describe(path).path
+        if arcpy.Describe(workspace).dataType == "FeatureDataset":
+            workspace = os.path.dirname(workspace)
+        return workspace
+
+    def delimit_field(self, path, field):
+        return arcpy.AddFieldDelimiters(path, field)
+
+    def sql_pushdown(self, path, describe_obj):
+        from ._pushdown import _table_pushdown
+        return _table_pushdown(describe_obj, self.workspace(path))
+
+    def change_stamp(self, path, describe_obj):
+        """modification time of the table files of file geodatabases and shapefiles,
+        otherwise the row count and latest editor tracking date (if enabled)
+        """
+        from ._catalog import _cached_catalog
+        from ._filegdb import FileGeodatabase
+        from ._filegdb import _file_geodatabase_path
+
+        gdb_path = _file_geodatabase_path(path)
+        if gdb_path is not None:
+            return _cached_catalog(FileGeodatabase, gdb_path).change_stamp(path, describe_obj)
+        if os.path.isfile(path):
+            # a shapefile is edited through its .shp, .shx and .dbf files
+            return _file_stamp(dict.fromkeys([path] + [os.path.splitext(path)[0] + ext for ext in (".shx", ".dbf")]))
+        edited = None
+        edit_field = getattr(describe_obj, "editedAtFieldName", None)
+        if getattr(describe_obj, "editorTrackingEnabled", False) and edit_field:
+            sql_clause = (None, "ORDER BY {} DESC".format(edit_field))
+            where_clause = "{} IS NOT NULL".format(self.delimit_field(path, edit_field))
+            with arcpy.da.SearchCursor(path, [edit_field], where_clause=where_clause, sql_clause=sql_clause) as cursor:
+                edited = next(iter(cursor), (None,))[0]
+        return int(arcpy.management.GetCount(path)[0]), edited
+
+
+_ARCPY_BACKEND = ArcpyBackend()
+
+
+# field properties of MemoryBackend fields given as (name, type) pairs
+_MEMORY_FIELD_DEFAULTS = {"length": 0, "required": False, "domain": '', "defaultValue": None,
+                          "precision": 0, "scale": 0, "isNullable": True, "editable": True}
+
+
+class MemoryBackend(DataBackend):
+    """ tables held in memory, eg to test code using TableObj and GDBObj without arcpy
+    Usage: backend = MemoryBackend(path); backend.add_table(...); register_data_backend(path, backend)
+    Where clauses are limited to comparisons of a field with a value joined by AND.
+    :param
+        path: workspace path the tables are listed under (need not exist)
+        domains: domain index as per gdb.build_domain_index
+    """
+    workspace_factory = "arc_utils.MemoryBackend"
+
+    def __init__(self, path, domains=None):
+        self.path = os.path.abspath(path)
+        self.domain_index = dict(domains or {})
+        self.tables = {}
+
+    def add_table(self, name, fields, rows, dataset='', shape_type=None):
+        """Add a table, or a featureclass if shape_type is given (geometry is not held).
+            :param name {String}:
+                table name
+            :param fields {[(String, String)]|[dict]}:
+                (field name, field type) pairs, or dictionaries of field properties as per TableObj.field_dict
+            :param rows {[tuple]}:
+                row values in field order, an OID field holds the row OID
+            :param dataset {String}:
+                feature dataset name, '' for the workspace root
+            :return catalog path of the table
+        """
+        field_dict = {}
+        for field in fields:
+            if not isinstance(field, dict):
+                field = {"name": field[0], "type": field[1]}
+            properties = dict(_MEMORY_FIELD_DEFAULTS, baseName=field["name"], aliasName=field["name"])
+            if field["type"] == "OID":
+                properties.update(required=True, isNullable=False, editable=False)
+            properties.update(field)
+            field_dict[field["name"]] = properties
+        path = os.path.join(self.path, dataset, name) if dataset else os.path.join(self.path, name)
+        self.tables[os.path.normcase(path)] = {
+            "name": name, "path": path, "dataset": dataset, "shape_type": shape_type,
+            "datatype": "FeatureClass" if shape_type else "Table",
+            "fields": field_dict, "rows": [tuple(row) for row in rows]}
+        return path
+
+    def _table(self, path):
+        table = self.tables.get(os.path.normcase(os.path.abspath(path)))
+        if table is None:
+            raise ValueError("invalid path")
+        return table
+
+    def exists(self, path):
+        key = os.path.normcase(os.path.abspath(path))
+        return key == os.path.normcase(self.path) or key in self.tables
+
+    def describe(self, path):
+        if os.path.normcase(os.path.abspath(path)) == os.path.normcase(self.path):
+            return _workspace_description(self.path, self.workspace_factory)
+        table = self._table(path)
+        return _table_description(table["name"], table["path"], table["datatype"], table["fields"],
+                                  shape_type=table["shape_type"])
+
+    def fields(self, path):
+        return {name: dict(field) for name, field in self._table(path)["fields"].items()}
+
+    def iter_row_chunks(self, path, fields, batch_size, where_clause=None, sql_clause=(None, None)):
+        table = self._table(path)
+        names = {name.lower(): i for i, name in enumerate(table["fields"])}
+        oid_field = next((f["name"] for f in table["fields"].values() if f["type"] == "OID"), None)
+
+        def column(field):
+            if field.upper() == "OID@" and oid_field is not None:
+                field = oid_field
+            elif "@" in field:
+                raise ValueError("cursor token {} is not supported by MemoryBackend".format(field))
+            if field.lower() not in names:
+                raise ValueError("Cannot find field '{}'".format(field))
+            return names[field.lower()]
+
+        columns = [column(f) for f in fields]
+        tests = [(column(name), comparison, value) for name, comparison, value in _where_conditions(where_clause)]
+        rows = table["rows"]
+        if _descending_oid_order(sql_clause, oid_field):
+            rows = sorted(rows, key=lambda row: row[names[oid_field.lower()]], reverse=True)
+        elif sql_clause and sql_clause[1]:
+            rows = sorted(rows, key=lambda row: row[names[oid_field.lower()]])
+        rows = (tuple(row[i] for i in columns) for row in rows
+                if all(_matches(row[i], comparison, value) for i, comparison, value in tests))
+        while True:
+            chunk = list(itertools.islice(rows, batch_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def domains(self, workspace):
+        return {name: dict(domain) for name, domain in self.domain_index.items()}
+
+    def walk(self, workspace, datatype):
+        for table in self.tables.values():
+            if table["datatype"] == datatype:
+                yield table["path"], table["name"], table["dataset"]
+
+    def workspace(self, path):
+        return self.path
+
+    def change_stamp(self, path, describe_obj):
+        # add_table replaces the row list, appending to it changes the count
+        rows = self._table(path)["rows"]
+        return id(rows), len(rows)
+
+
+def register_data_backend(workspace, backend):
+    """Route a workspace, and every table in it, to a data backend.
+        :param workspace {String|pathlike}:
+            workspace (geodatabase) path
+        :param backend {DataBackend}:
+            backend reading the workspace, None removes the route
+    """
+    key = os.path.normcase(os.path.abspath(os.fspath(workspace)))
+    if backend is None:
+        _registered_backends.pop(key, None)
+    else:
+        _registered_backends[key] = backend
+
+
+def get_data_backend(path):
+    """Return the DataBackend reading a table or workspace path: a backend registered for
+    the workspace, the sqlite3 or python reader of mobile and file geodatabases read
+    without arcpy, otherwise the arcpy backend
+    """
+    from ._filegdb import _file_geodatabase
+    from ._mobile import _mobile_geodatabase
+
+    if _registered_backends and isinstance(path, str):
+        key = os.path.normcase(os.path.abspath(path))
+        while True:
+            if key in _registered_backends:
+                return _registered_backends[key]
+            parent = os.path.dirname(key)
+            if parent == key:
+                break
+            key = parent
+    backend = _mobile_geodatabase(path)
+    if backend is None:
+        backend = _file_geodatabase(path)
+    return backend if backend is not None else _ARCPY_BACKEND
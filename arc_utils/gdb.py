@@ -1,13 +1,27 @@
 # -*- coding: utf-8 -*-
 """utilities for working with geodatabases and reporting on geodatabase contents
 """
+import csv
 import os
-import arcpy
+from collections import deque
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from ._lazy import arcpy
+from .backends import get_data_backend
+from ._filegdb import get_filegdb_reader
+from ._filegdb import set_filegdb_reader
+from ._mobile import get_mobile_reader
+from ._mobile import set_mobile_reader
 from .output import get_valid_output_path
+from .output import Progressor
+from .output import buffered_messages
 from .output import output_msg
 from ._inputs import _ensure_valid_path
 from ._inputs import _normalize_to_sequence
 from ._inputs import _resolve_dataset_path
+from ._pool import _worker_count
+from .schema_cache import _cached
 
 class GDBObj(object):
     """ provide properties for working with a GDB
@@ -24,64 +38,206 @@ class GDBObj(object):
         adds properties and methods
         """
         self.path = _ensure_valid_path(_resolve_dataset_path(gdb_path, arg_name="gdb_path"))
-        self.describe_obj = self._describe_object()
-        self.feature_classes = self.get_feature_class_names()
-        self.tables = self.get_table_names()
-        self.domain_names = self.get_all_domain_names()
+        catalog = _cached(self.path, "gdb_catalog", self._load_catalog)
+        self.feature_classes = catalog["feature_classes"]
+        self.tables = catalog["tables"]
+        self.domain_names = catalog["domain_names"]
+
+    @cached_property
+    def describe_obj(self):
+        """arcpy Describe object of the geodatabase"""
+        return self._describe_object()
 
     def _describe_object(self):
         """ returns describe object"""
-        return arcpy.Describe(self.path)
+        return get_data_backend(self.path).describe(self.path)
+
+    def _load_catalog(self):
+        """Lists of featureclass, table and domain names, as cached by the schema cache"""
+        return {"feature_classes": self.get_feature_class_names(),
+                "tables": self.get_table_names(),
+                "domain_names": self.get_all_domain_names()}
         
     def get_feature_class_names(self):
         """ get a list of all the featureclass names"""
-        fc_list = []
-        temp_ws = arcpy.env.workspace
-        arcpy.env.workspace = self.path
-        datasets = arcpy.ListDatasets(feature_type='feature')
-        datasets = [''] + datasets if datasets is not None else []
-        for dataset in datasets:
-            for fc in arcpy.ListFeatureClasses(feature_dataset=dataset):
-                fc_list.append(fc)
-        arcpy.env.workspace = temp_ws
-        return fc_list
-        
+        return [item.name for item in walk_catalog(self.path, datatype="FeatureClass")]
+
     def get_table_names(self):
         """ get a list of all the table names"""
-        tbl_list = []
-        temp_ws = arcpy.env.workspace
-        arcpy.env.workspace = self.path
-        tbls = arcpy.ListTables()
-        for tbl in tbls:
-            tbl_list.append(tbl)
-        arcpy.env.workspace = temp_ws
-        return tbl_list
+        return [item.name for item in walk_catalog(self.path, datatype="Table")]
+
+    def get_feature_class_paths(self):
+        """ get a list of the full paths of all featureclasses, including those in feature datasets"""
+        return [item.path for item in walk_catalog(self.path, datatype="FeatureClass")]
+
+    def get_table_paths(self):
+        """ get a list of the full paths of all tables"""
+        return [item.path for item in walk_catalog(self.path, datatype="Table")]
+
+    @cached_property
+    def domain_index(self):
+        """dictionary of all domains keyed by domain name, see build_domain_index"""
+        return build_domain_index(self.path)
+
+    @cached_property
+    def domain_usage(self):
+        """dictionary keyed by domain name of the (table path, field name) pairs using the domain,
+        collected in one pass over the catalog. Unused domains have an empty list.
+        """
+        usage = {name: [] for name in self.domain_index}
+        for item in walk_catalog(self.path):
+            for field in get_data_backend(item.path).fields(item.path).values():
+                if field["domain"]:
+                    usage.setdefault(field["domain"], []).append((item.path, field["name"]))
+        return usage
 
     def get_all_domain_names(self):
-        domain_names = []
-        domains = arcpy.da.ListDomains(self.path)
-        for domain in domains:
-            domain_names.append(domain.name)
-        return domain_names
+        return list(self.domain_index)
+
+    def get_domain_fields(self, domain_name):
+        """ get a list of (table path, field name) pairs which use a domain"""
+        return list(self.domain_usage.get(domain_name, []))
+
+    def get_unused_domain_names(self):
+        """ get a list of the names of domains not used by any field"""
+        return [name for name, fields in self.domain_usage.items() if not fields]
 
     def OID_check(self):
-        for fc in self.feature_classes:
-            oidfield = ''
-            tmp = arcpy.Describe(fc)
-            if tmp.hasOID:
-                oidfield = tmp.OIDFieldName
-            print('featureclass', tmp.name, tmp.hasOID, oidfield)
-        for tb in self.tables:
+        for item in walk_catalog(self.path, datatype=("FeatureClass", "Table")):
             oidfield = ''
-            tmp = arcpy.Describe(tb)
+            tmp = get_data_backend(item.path).describe(item.path)
             if tmp.hasOID:
                 oidfield = tmp.OIDFieldName
-            print('table', tmp.name, tmp.hasOID, oidfield)
+            print('featureclass' if item.datatype == 'FeatureClass' else 'table', tmp.name, tmp.hasOID, oidfield)
+
+
+CatalogItem = namedtuple('CatalogItem', 'path name dataset datatype')
+
+
+def build_domain_index(geodatabase):
+    """Load every domain in a geodatabase with a single arcpy.da.ListDomains call
+    (or read of its data backend, see arc_utils.backends) into hashed lookup structures.
+
+    :param geodatabase {String|pathlike|object}
+        Geodatabase path or object reference.
+
+    :return dictionary keyed by domain name, each value a dictionary of
+        name, domainType ('CodedValue' or 'Range'), type (field type), codedValues
+        (code: description dictionary, coded value domains) and range ((min, max), range domains)
+    """
+    geodatabase = _resolve_dataset_path(geodatabase, arg_name="geodatabase")
+    return get_data_backend(geodatabase).domains(geodatabase)
+
+
+def _get_domain_index(geodatabase):
+    """Return the domain index of a GDBObj, or build one for a geodatabase path"""
+    if isinstance(geodatabase, GDBObj):
+        return geodatabase.domain_index
+    return build_domain_index(geodatabase)
+
+
+def _value_in_domain(value, domain):
+    """True if a (non null) value is valid for a domain from build_domain_index"""
+    if domain["domainType"] == 'Range':
+        low, high = domain["range"]
+        try:
+            return low <= value <= high
+        except TypeError:
+            return False
+    if isinstance(value, bytes):  # domain codes are strings
+        value = value.decode()
+    return value in domain["codedValues"]
+
 
-#TODO split into 3 - get all FC, create formatted string output, write to file. use io
-def report_all_fc_as_text(geodatabase, output_file=None, sep='\t'):
+def walk_catalog(workspace, datatype=("Table", "FeatureClass")):
+    """Lazily yield the tables and featureclasses in a workspace using arcpy.da.Walk
+    (or the data backend of the workspace, see arc_utils.backends).
+    arcpy.env.workspace is never changed, so this is safe to call from multiple threads.
+
+    :param workspace {String|pathlike|object}
+        Geodatabase (or folder) path or object reference.
+
+    :param datatype {String|[String]}
+        arcpy.da.Walk data type(s) to list, eg 'FeatureClass' or 'Table'.
+        Each data type is listed in turn, in the order given.
+
+    :return generator of CatalogItem(path, name, dataset, datatype) named tuples,
+        dataset is the feature dataset name, or '' for items in the workspace root
+    """
+    workspace = _resolve_dataset_path(workspace, arg_name="workspace")
+    backend = get_data_backend(workspace)
+    for item_type in _normalize_to_sequence(datatype):
+        for path, name, dataset in backend.walk(workspace, item_type):
+            yield CatalogItem(path, name, dataset, item_type)
+
+
+# field properties written by report_all_fc_as_text
+_REPORT_FIELD_ATTRIBUTES = ['name', 'baseName', 'aliasName', 'type', 'length', 'precision', 'scale',
+                            'domain', 'defaultValue', 'editable', 'isNullable', 'required']
+
+
+def _catalog_item_field_rows(item):
+    """Return report rows (dataset, name, field properties...) for each field of a catalog item"""
+    return [[item.dataset, item.name] + ["{}".format(field[att]) for att in _REPORT_FIELD_ATTRIBUTES]
+            for field in get_data_backend(item.path).fields(item.path).values()]
+
+
+def iter_catalog_field_rows(geodatabase, workers=None):
+    """Lazily yield (catalog item, field rows, error) for every table and featureclass
+    in a geodatabase, in catalog order.
+
+    :param geodatabase {String|pathlike|object}
+        Geodatabase path or object reference.
+
+    :param workers {Integer}
+        Number of threads used to list fields. Default None lists fields one table at a time.
+        Only a small window of tables is in progress at once, so memory use stays constant.
+    """
+    items = walk_catalog(geodatabase)
+    workers = _worker_count(workers)
+    if not workers:
+        for item in items:
+            try:
+                yield item, _catalog_item_field_rows(item), None
+            except Exception as e:
+                yield item, [], e
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append((item, pool.submit(_catalog_item_field_rows, item)))
+            if len(pending) >= workers * 2:
+                yield _completed_field_rows(*pending.popleft())
+        while pending:
+            yield _completed_field_rows(*pending.popleft())
+
+
+def _completed_field_rows(item, future):
+    """Wait for a field row future and return (catalog item, field rows, error)"""
+    try:
+        return item, future.result(), None
+    except Exception as e:
+        return item, [], e
+
+
+class _SeparatorWriter(object):
+    """csv.writer like writer joining values with a separator of any length, without quoting"""
+    def __init__(self, file, sep):
+        self.file = file
+        self.sep = sep
+
+    def writerow(self, row):
+        self.file.write(self.sep.join(row) + "\n")
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+
+def report_all_fc_as_text(geodatabase, output_file=None, sep='\t', workers=None):
     """Create a text report of all fields in all featureclasses/tables from a geodatabase
-    to specified output file.
+    to specified output file. Rows are streamed to the file as each table is processed.
 
     :param geodatabase {String|pathlike|object}
         Geodatabase path or object reference.
@@ -90,13 +246,20 @@ def report_all_fc_as_text(geodatabase, output_file=None, sep='\t'):
         Path or reference to a text file. If not supplied defaults to gdb directory.
     
     :param sep {String}
-        seperator value (eg ',' or r'\t'
+        seperator value (eg ',' or '\\t'). Single character separators are written with csv quoting,
+        longer separators join the values as they are
+
+    :param workers {Integer}
+        Number of threads used to list fields in parallel. Default None processes tables in turn.
+        Output order is the same either way.
+
+    :return output file path
     """
-    default_env = arcpy.env.workspace
     try:
         geodatabase = _ensure_valid_path(_resolve_dataset_path(geodatabase, arg_name="geodatabase"))
-        desc = arcpy.Describe(geodatabase)
-        arcpy.env.workspace = geodatabase
+        if sep == r'\t':
+            sep = '\t'
+        desc = get_data_backend(geodatabase).describe(geodatabase)
         if not output_file:
             path = get_valid_output_path(desc.Path)
             if not path:
@@ -104,55 +267,34 @@ def report_all_fc_as_text(geodatabase, output_file=None, sep='\t'):
             output_file = os.path.join(path, desc.name.split(".")[0] + ".txt")
 
         output_msg("Writing to: {0}".format(output_file))
-        # list all datasets
-        datasets = arcpy.ListDatasets(feature_type='feature')
-        datasets = [''] + datasets if datasets is not None else []
         # write out gdb info, fields etc
-        with open(output_file, "w") as logFile:
-            header = ["FCDataset","Feature"]
-            atts = ['name', 'baseName', 'aliasName', 'type', 'length', 'precision', 'scale',
-                    'domain', 'defaultValue', 'editable', 'isNullable', 'required']
-            header.extend(atts)
-            header_output = sep.join(["{}".format(i) for i in header])
-            logFile.write(header_output + "\n")
-            for tbl in arcpy.ListTables():
-                output_msg("Processing Table: {0}".format(tbl))
-                try:
-                    fields = arcpy.ListFields(tbl)
-                    str_output = ""
-                    line_start = "{0}{1}{2}{1}".format("", sep, tbl)
-                    for field in fields:
-                        str_output += line_start + sep.join(["{}".format(getattr(field, i)) for i in atts])
-                        str_output += "\n"
-                    logFile.write(str_output)
-
-                except Exception as e:
-                    output_msg(str(e.args[0]))
-                    output_msg(arcpy.GetMessages())
-                    continue
-
-            for dataset in datasets:
-                for fc in arcpy.ListFeatureClasses(feature_dataset=dataset):
-                    output_msg("Processing Dataset: {0} \\ FeatureClass: {1}".format(dataset, fc))
-                    try:
-                        fields = arcpy.ListFields(fc)
-                        str_output = ""
-                        line_start = "{0}{1}{2}{1}".format(dataset, sep, fc)
-                        for field in fields:
-                            str_output += line_start + sep.join(["{}".format(getattr(field, i)) for i in atts])
-                            str_output += "\n"
-                        logFile.write(str_output)
-
-                    except Exception as e:
-                        output_msg(str(e.args[0]))
-                        output_msg(arcpy.GetMessages())
+        with open(output_file, "w", newline="", buffering=1024 * 1024) as logFile:
+            if len(sep) == 1:
+                writer = csv.writer(logFile, delimiter=sep, lineterminator="\n")
+            else:
+                writer = _SeparatorWriter(logFile, sep)
+            writer.writerow(["FCDataset", "Feature"] + _REPORT_FIELD_ATTRIBUTES)
+            with buffered_messages(), Progressor("Reporting fields") as progress:
+                for item, rows, error in iter_catalog_field_rows(geodatabase, workers=workers):
+                    if item.datatype == "Table":
+                        msg = "Processing Table: {0}".format(item.name)
+                    else:
+                        msg = "Processing Dataset: {0} \\ FeatureClass: {1}".format(item.dataset, item.name)
+                    output_msg(msg, progress=True)
+                    progress.step(label=msg)
+                    if error is not None:
+                        output_msg(str(error))
+                        if arcpy._available():
+                            output_msg(arcpy.GetMessages())
                         continue
+                    writer.writerows(rows)
+        return output_file
 
     except Exception as e:
-        output_msg(str(e.args[0]))
-        output_msg(arcpy.GetMessages())
+        output_msg(str(e))
+        if arcpy._available():
+            output_msg(arcpy.GetMessages())
     finally:
-        arcpy.env.workspace = default_env
         output_msg("Completed")
 
 
@@ -172,18 +314,18 @@ def export_all_domains(geodatabase, workspace=None):
             workspace = geodatabase
         else:
             workspace = _resolve_dataset_path(workspace, arg_name="workspace")
-        domains = arcpy.da.ListDomains(geodatabase)
-        for domain in domains:
-            dname = arcpy.ValidateTableName(domain.name + '_domain', workspace)
+        for name in build_domain_index(geodatabase):
+            dname = arcpy.ValidateTableName(name + '_domain', workspace)
             output = os.path.join(workspace, dname)
             if workspace != geodatabase:
                 output += '.txt'
-            output_msg('Exporting {0} domain to {1}'.format(domain.name, dname))
-            arcpy.DomainToTable_management(geodatabase, domain.name, output, "codedValues", 'description')
+            output_msg('Exporting {0} domain to {1}'.format(name, dname))
+            arcpy.DomainToTable_management(geodatabase, name, output, "codedValues", 'description')
 
     except Exception as e:
-        output_msg(str(e.args[0]))
-        output_msg(arcpy.GetMessages())
+        output_msg(str(e))
+        if arcpy._available():
+            output_msg(arcpy.GetMessages())
     finally:
         output_msg("Completed")
 
@@ -209,7 +351,8 @@ def import_tables_as_domains(tables, geodatabase):
             dname = desc.name.replace("_domain", "")
             arcpy.TableToDomain_management(table, "codedValues", "description", geodatabase, dname)
     except Exception as e:
-        output_msg(str(e.args[0]))
-        output_msg(arcpy.GetMessages())
+        output_msg(str(e))
+        if arcpy._available():
+            output_msg(arcpy.GetMessages())
     finally:
         output_msg("Completed")
\ No newline at end of file
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""opt-in accounting of arcpy calls made by arc_utils
+
+Counts and times SearchCursor opens and rows read, Describe, ListFields,
+ListDomains, Exists and Walk calls, and geoprocessing tool runs, attributed to
+the public arc_utils function that made them (the outermost arc_utils call
+on the stack). The openpyxl worksheet writes and workbook saves of exports
+are timed too. Only calls made in this process are recorded, work done in
+worker processes (eg export_field_sets(workers=4)) is not.
+
+Usage:
+    import arc_utils as au
+    with au.instrument.instrument() as report:
+        au.table.export_field_sets(layers, out_xlsx)
+    print(report.summary())
+    report.to_json(r"C:\\temp\\export_timings.json")
+
+    # also collect a cProfile profile of the block
+    with au.instrument.instrument(profile=True) as report:
+        ...
+    report.dump_stats(r"C:\\temp\\export.prof")
+"""
+import contextlib
+import json
+import sys
+import threading
+import time
+
+from . import _lazy
+
+# arcpy functions which are counted
+_ARCPY_CALLS = {"Describe", "Exists", "ListFields", "ListDomains", "ListFeatureClasses",
+                "ListTables", "ListDatasets"}
+# arcpy.da functions which are counted
+_DA_CALLS = {"SearchCursor", "ListDomains", "Walk", "TableToNumPyArray"}
+# arcpy toolbox modules, every function in them is a geoprocessing tool
+_TOOLBOXES = {"management", "conversion", "analysis", "da_tools"}
+# suffixes of geoprocessing tool functions, eg AddField_management
+_TOOL_SUFFIXES = tuple("_" + name for name in _TOOLBOXES)
+
+_active = []
+_lock = threading.Lock()
+
+
+class InstrumentationReport(object):
+    """ Counts and timings collected by instrument()
+    calls: {entry point: {arcpy call: {'count', 'seconds', 'rows'}}}
+    """
+    def __init__(self, profiler=None):
+        self.calls = {}
+        self.wall_seconds = 0.0
+        self.profiler = profiler
+
+    def _record(self, entry_point, name, seconds, count=1, rows=0):
+        with _lock:
+            stats = self.calls.setdefault(entry_point, {}).setdefault(
+                name, {"count": 0, "seconds": 0.0, "rows": 0})
+            stats["count"] += count
+            stats["seconds"] += seconds
+            stats["rows"] += rows
+
+    def totals(self):
+        """Return {arcpy call: {'count', 'seconds', 'rows'}} summed over all entry points"""
+        totals = {}
+        for calls in self.calls.values():
+            for name, stats in calls.items():
+                total = totals.setdefault(name, {"count": 0, "seconds": 0.0, "rows": 0})
+                for key in total:
+                    total[key] += stats[key]
+        return totals
+
+    def to_dict(self):
+        """Return the report as a JSON serializable dictionary"""
+        return {"wall_seconds": self.wall_seconds, "calls": self.calls, "totals": self.totals()}
+
+    def to_json(self, path=None, indent=2):
+        """Return the report as JSON text, and write it to path if given"""
+        text = json.dumps(self.to_dict(), indent=indent)
+        if path:
+            with open(path, "w") as output:
+                output.write(text)
+        return text
+
+    def summary(self):
+        """Return a text table of calls per entry point"""
+        lines = ["{:<60}{:>8}{:>12}{:>12}".format("entry point / call", "count", "seconds", "rows")]
+        for entry_point, calls in sorted(self.calls.items()):
+            lines.append(entry_point)
+            for name, stats in sorted(calls.items(), key=lambda item: -item[1]["seconds"]):
+                lines.append("    {:<56}{:>8}{:>12.3f}{:>12}".format(
+                    name, stats["count"], stats["seconds"], stats["rows"]))
+        lines.append("wall time {:.3f}s".format(self.wall_seconds))
+        return "\n".join(lines)
+
+    def stats(self):
+        """Return a pstats.Stats of the block, if instrument(profile=True) was used"""
+        import pstats
+
+        if self.profiler is None:
+            raise ValueError("no profile was collected, use instrument(profile=True)")
+        return pstats.Stats(self.profiler)
+
+    def dump_stats(self, path):
+        """Write the cProfile profile of the block to path (view with pstats, snakeviz etc)"""
+        self.stats().dump_stats(path)
+
+
+@contextlib.contextmanager
+def instrument(profile=False):
+    """Record arcpy calls made by arc_utils inside the with block.
+        :param profile {Boolean}:
+            also run cProfile for the block, see InstrumentationReport.stats
+        :return InstrumentationReport (as the with target)
+    """
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    report = InstrumentationReport(profiler)
+    with _lock:
+        _active.append(report)
+        _lazy._instrument_hook = _wrap_attribute
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield report
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        report.wall_seconds = time.perf_counter() - start
+        with _lock:
+            _active.remove(report)
+            if not _active:
+                _lazy._instrument_hook = None
+
+
+def _entry_point():
+    """Name of the outermost arc_utils function on the calling stack"""
+    entry = "<unknown>"
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("arc_utils.") and module not in ("arc_utils._lazy", "arc_utils.instrument"):
+            entry = "{}.{}".format(module, frame.f_code.co_qualname)
+        frame = frame.f_back
+    return entry
+
+
+def _record(entry_point, name, seconds, count=1, rows=0):
+    for report in list(_active):
+        report._record(entry_point, name, seconds, count=count, rows=rows)
+
+
+@contextlib.contextmanager
+def _timed(name):
+    """Record the time of a block of non arcpy work (eg writing a workbook) when instrumenting"""
+    if not _active:
+        yield
+        return
+    entry_point = _entry_point()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(entry_point, name, time.perf_counter() - start)
+
+
+def _wrap_attribute(module_name, attr, value):
+    """Hook called by the lazy arcpy module for each attribute accessed"""
+    if module_name == "arcpy":
+        if attr == "da":
+            return _Namespace(value, "da", _DA_CALLS)
+        if attr in _TOOLBOXES:
+            return _Namespace(value, attr, None)
+        if attr in _ARCPY_CALLS or attr.endswith(_TOOL_SUFFIXES):
+            return _timed_call(value, attr)
+    return value
+
+
+class _Namespace(object):
+    """Proxy of an arcpy submodule which times the named functions (or all functions if names is None)"""
+    def __init__(self, module, prefix, names):
+        self._module = module
+        self._prefix = prefix
+        self._names = names
+
+    def __getattr__(self, attr):
+        value = getattr(self._module, attr)
+        if not callable(value) or (self._names is not None and attr not in self._names):
+            return value
+        name = "{}.{}".format(self._prefix, attr)
+        if attr == "SearchCursor":
+            return _cursor_factory(value, name)
+        if attr == "Walk":
+            return _timed_generator(value, name)
+        return _timed_call(value, name)
+
+
+def _timed_call(func, name):
+    def wrapper(*args, **kwargs):
+        entry_point = _entry_point()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(entry_point, name, time.perf_counter() - start)
+    return wrapper
+
+
+def _timed_generator(func, name):
+    def wrapper(*args, **kwargs):
+        entry_point = _entry_point()
+        start = time.perf_counter()
+        iterator = iter(func(*args, **kwargs))
+        seconds = time.perf_counter() - start
+        items = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - start
+                items += 1
+                yield item
+        finally:
+            _record(entry_point, name, seconds, rows=items)
+    return wrapper
+
+
+def _cursor_factory(cursor_class, name):
+    def wrapper(*args, **kwargs):
+        entry_point = _entry_point()
+        start = time.perf_counter()
+        cursor = cursor_class(*args, **kwargs)
+        _record(entry_point, name + " open", time.perf_counter() - start)
+        return _InstrumentedCursor(cursor, entry_point, name)
+    return wrapper
+
+
+class _InstrumentedCursor(object):
+    """SearchCursor proxy which counts and times the rows read"""
+    def __init__(self, cursor, entry_point, name):
+        self._cursor = cursor
+        self._entry_point = entry_point
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._cursor, attr)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        return self._cursor.__exit__(*args)
+
+    def __iter__(self):
+        iterator = iter(self._cursor)
+        rows = 0
+        seconds = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    row = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - start
+                rows += 1
+                yield row
+        finally:
+            _record(self._entry_point, self._name + " rows", seconds, count=0, rows=rows)
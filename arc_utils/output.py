@@ -1,10 +1,20 @@
 # -*- coding: utf-8 -*-
 """output related utilities
 """
-import arcpy
+from ._lazy import arcpy
+import contextlib
 import os
+import threading
+import time
 
-def output_msg(msg, severity=0):
+# messages with a lower severity than this are not output, see set_message_level
+_message_level = 0
+# active _MessageBuffer of each thread (the buffer attribute), see buffered_messages,
+# so messages of other threads (eg catalog and profiling workers) are not added to it
+_message_buffers = threading.local()
+
+
+def output_msg(msg, severity=0, progress=False):
     """Output msg to print and/or to Arc. Useful to include in a tool
     that can be run in Python or in ArcGIS
 
@@ -13,12 +23,26 @@ def output_msg(msg, severity=0):
 
     severity(integer):
         severity = 0 (none), 1 (warning), 2 (error)
+
+    progress(Boolean):
+        True for repetitive progress messages (eg "Processing <table>"). Inside
+        buffered_messages consecutive progress messages are coalesced into one.
     usage:
         output_msg("message")
 
     function from http://help.arcgis.com/en/arcgisdesktop/10.0/help/index.html#//00150000000p000000.htm
     """
+    if severity < _message_level:
+        return
+    buffer = getattr(_message_buffers, "buffer", None)
+    if buffer is not None:
+        buffer.add(msg, severity, progress)
+        return
+    _emit_msg(msg, severity)
+
 
+def _emit_msg(msg, severity, split_lines=True):
+    """print msg and add it as a geoprocessing message"""
     # Adds a Message (in case this is run as a tool)
     # and also prints the message to the screen (standard output)
     #
@@ -27,7 +51,7 @@ def output_msg(msg, severity=0):
     # Split the message on \n first, so that if it's multiple lines,
     #  a GPMessage will be added for each line
     try:
-        for string in msg.split('\n'):
+        for string in (msg.split('\n') if split_lines else [msg]):
             # Add appropriate geoprocessing message
             #
             if severity == 0:
@@ -40,6 +64,124 @@ def output_msg(msg, severity=0):
         pass
 
 
+def set_message_level(level=0):
+    """Only output messages with severity >= level
+    (0 = all messages, 1 = warnings and errors, 2 = errors only)"""
+    global _message_level
+    _message_level = level
+
+
+class _MessageBuffer(object):
+    """Collect messages and output them in batches at most every min_interval seconds"""
+    def __init__(self, min_interval=1.0, coalesce=True):
+        self.min_interval = min_interval
+        self.coalesce = coalesce
+        self._pending = []  # [msg, severity, progress, number of coalesced messages]
+        self._last_flush = time.monotonic()
+
+    def add(self, msg, severity=0, progress=False):
+        pending = self._pending
+        if progress and self.coalesce and pending and pending[-1][2]:
+            # keep only the latest of consecutive progress messages
+            pending[-1] = [msg, severity, True, pending[-1][3] + 1]
+        else:
+            pending.append([msg, severity, progress, 0])
+        if severity > 0 or time.monotonic() - self._last_flush >= self.min_interval:
+            self.flush()
+
+    def flush(self):
+        """Output pending messages, one geoprocessing message per run of equal severity"""
+        lines, line_severity = [], 0
+        for msg, severity, progress, coalesced in self._pending:
+            if coalesced:
+                msg = "{} (+{} similar messages)".format(msg, coalesced)
+            if lines and severity != line_severity:
+                _emit_msg("\n".join(lines), line_severity, split_lines=False)
+                lines = []
+            lines.append(msg)
+            line_severity = severity
+        if lines:
+            _emit_msg("\n".join(lines), line_severity, split_lines=False)
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+
+@contextlib.contextmanager
+def buffered_messages(min_interval=1.0, coalesce=True):
+    """Batch output_msg messages inside the with block, so loops do not
+    make a print and geoprocessing message round trip per message.
+    Warnings and errors are output immediately (with any pending messages).
+    Only messages of the calling thread are buffered, other threads output theirs directly.
+
+    min_interval{Number}:
+        minimum seconds between outputs of pending messages
+    coalesce{Boolean}:
+        replace consecutive progress messages with the latest one
+    usage:
+        with buffered_messages():
+            report_all_fc_as_text(gdb)
+    """
+    previous = getattr(_message_buffers, "buffer", None)
+    buffer = _MessageBuffer(min_interval, coalesce)
+    _message_buffers.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        buffer.flush()
+        _message_buffers.buffer = previous
+
+
+class Progressor(object):
+    """ geoprocessing progressor (arcpy.SetProgressor) with rate limited updates
+    Usage:
+        with Progressor("Exporting fields", total=len(fields)) as progress:
+            for field in fields:
+                progress.step(label=field)
+    :param
+        label: progressor label
+        total: number of steps, None for a default (no position) progressor
+        min_interval: minimum seconds between progressor updates
+    """
+    def __init__(self, label, total=None, min_interval=0.25):
+        self.label = label
+        self.total = total
+        self.min_interval = min_interval
+        self.position = 0
+        self._last_update = 0.0
+
+    def __enter__(self):
+        try:
+            if self.total:
+                arcpy.SetProgressor("step", self.label, 0, self.total, 1)
+            else:
+                arcpy.SetProgressor("default", self.label)
+        except:
+            pass
+        return self
+
+    def step(self, count=1, label=None):
+        """Advance the progressor, updating it if min_interval has passed (or on the last step)"""
+        self.position += count
+        now = time.monotonic()
+        if now - self._last_update < self.min_interval and self.position != self.total:
+            return
+        self._last_update = now
+        try:
+            if label is not None:
+                arcpy.SetProgressorLabel(label)
+            if self.total:
+                arcpy.SetProgressorPosition(min(self.position, self.total))
+        except:
+            pass
+
+    def __exit__(self, *args):
+        try:
+            arcpy.ResetProgressor()
+        except:
+            pass
+        return False
+
+
 def get_valid_output_path(path, return_folder_only=True, make_dir=True, fallback_to_user_folder=True):
     """ return a valid path or empty string if not valid.
     If return_folder_only is True (default) and a gdb is passed as path,
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""optional in process cache of TableObj value set results
+
+get_field_value_set, get_multiple_field_value_set and get_field_value_rows (and so
+compare_field_values_to_domain and export_fields_to_worksheet) results are kept
+in a size bounded least recently used cache keyed by (path, fields, where clause),
+so repeated calls in a session (eg in the Pro Python window) do not rescan the table.
+Each entry holds a change stamp of the table, checked on every lookup: the
+modification time of the table files for file geodatabases, mobile geodatabases
+and shapefiles, otherwise the row count and latest editor tracking date.
+Tables without editor tracking in enterprise geodatabases are only checked by row
+count, call TableObj.refresh() or invalidate() after edits which keep the count.
+
+Usage:
+    import arc_utils as au
+    au.result_cache.enable_result_cache()
+    tbl = au.table.TableObj(path)
+    tbl.get_field_value_set("zone")  # scans the table
+    tbl.get_field_value_set("zone")  # returned from the cache
+    au.result_cache.get_result_cache().stats()
+"""
+import copy
+import os
+import threading
+from collections import OrderedDict
+
+_result_cache = None
+
+
+class ResultCache(object):
+    """ least recently used cache of table results
+    Usage: cache = arc_utils.result_cache.ResultCache()
+    :param
+        max_entries: number of results kept, the least recently used result is dropped first
+    """
+    def __init__(self, max_entries=128):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(catalog_path, kind, fields, where_clause, options):
+        return (os.path.normcase(os.path.abspath(catalog_path)), kind, tuple(fields), where_clause, options)
+
+    def get_or_load(self, catalog_path, kind, fields, where_clause, stamp, loader, options=()):
+        """Return the cached result, calling loader() and storing the result on a miss.
+        A copy is returned, so callers may change it. None results are not stored.
+            :param catalog_path {String}: table path
+            :param kind {String}: type of result (eg 'value_set')
+            :param fields {[String]}: fields the result is of
+            :param where_clause {String}: SQL expression selecting the rows, None for all rows
+            :param stamp: change stamp of the table, entries with another stamp are stale
+            :param options {tuple}: other arguments changing the result
+        """
+        key = self._key(catalog_path, kind, fields, where_clause, options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+        value = loader()
+        if value is not None:
+            with self._lock:
+                self._entries[key] = (stamp, copy.deepcopy(value))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, catalog_path=None):
+        """Remove entries for a table path, or all entries if no path is given"""
+        with self._lock:
+            if catalog_path is None:
+                self._entries.clear()
+                return
+            path = os.path.normcase(os.path.abspath(catalog_path))
+            for key in [k for k in self._entries if k[0] == path]:
+                del self._entries[key]
+
+    def stats(self):
+        """Return a dictionary of hits, misses, hit ratio and entries for this session"""
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0, "entries": len(self._entries)}
+
+
+def enable_result_cache(max_entries=128):
+    """Turn on the result cache for TableObj value set methods.
+        :param max_entries {Integer}: number of results kept
+        :return the ResultCache in use
+    """
+    global _result_cache
+    _result_cache = ResultCache(max_entries)
+    return _result_cache
+
+
+def disable_result_cache():
+    """Turn off the result cache and discard its entries"""
+    global _result_cache
+    _result_cache = None
+
+
+def get_result_cache():
+    """Return the active ResultCache, or None if caching is not enabled"""
+    return _result_cache
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""optional persistent cache of table and geodatabase schema metadata
+
+Field and describe metadata are stored in a SQLite file keyed by catalog path,
+and are reused until the dataset changes. For file geodatabases (and other file
+based data) the change stamp is the modification time of the .gdb folder and its
+catalog table, for enterprise geodatabases and other sources without a local file
+entries expire after a configurable time to live.
+
+Usage:
+    import arc_utils as au
+    au.schema_cache.enable_schema_cache()
+    tbl = au.table.TableObj(path)  # field_dict is read from the cache on repeat runs
+    au.schema_cache.get_schema_cache().stats()
+"""
+import contextlib
+import datetime
+import json
+import os
+import sqlite3
+import time
+from ._filegdb import _file_geodatabase_path
+
+# file geodatabase system table which is rewritten whenever the schema changes
+_GDB_ITEMS_TABLE = "a00000004.gdbtable"
+
+_schema_cache = None
+
+# date and time values (eg field default values) are stored as {tag: isoformat text}
+_TAGGED_TYPES = (("__datetime__", datetime.datetime), ("__date__", datetime.date), ("__time__", datetime.time))
+
+
+def _default_cache_dir():
+    """Return the per user cache folder for arc_utils"""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "arc_utils")
+
+
+def _change_stamp(path):
+    """Return a modification stamp for a catalog path, or None if there is no
+    local file to check (eg enterprise geodatabase connections).
+    """
+    gdb_path = _file_geodatabase_path(path)
+    if gdb_path is not None:
+        stamps = [os.path.getmtime(p) for p in (gdb_path, os.path.join(gdb_path, _GDB_ITEMS_TABLE))
+                  if os.path.exists(p)]
+        return max(stamps) if stamps else None
+    if ".sde" in path.lower():
+        return None
+    if os.path.exists(path):
+        return os.path.getmtime(path)
+    return None
+
+
+def _encode_value(value):
+    """json.dumps default, tagging date and time values so they are decoded to the same type.
+    Other values which are not JSON types raise TypeError, and are not cached.
+    """
+    # datetime is a subclass of date, so it is checked first
+    for tag, value_type in _TAGGED_TYPES:
+        if isinstance(value, value_type):
+            return {tag: value.isoformat()}
+    raise TypeError("{} is not cached".format(type(value).__name__))
+
+
+def _decode_value(obj):
+    """json.loads object_hook restoring the values tagged by _encode_value"""
+    if len(obj) == 1:
+        for tag, value_type in _TAGGED_TYPES:
+            if tag in obj:
+                return value_type.fromisoformat(obj[tag])
+    return obj
+
+
+class SchemaCache(object):
+    """ SQLite backed cache of schema metadata
+    Usage: cache = arc_utils.schema_cache.SchemaCache()
+    :param
+        cache_path: path to the SQLite cache file.
+            Defaults to schema_cache.sqlite in the user cache folder
+        ttl: seconds an entry without a change stamp (eg enterprise geodatabase) remains valid
+    """
+    def __init__(self, cache_path=None, ttl=3600):
+        if cache_path is None:
+            cache_path = os.path.join(_default_cache_dir(), "schema_cache.sqlite")
+        self.path = os.fspath(cache_path)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS schema_cache ("
+                         "catalog_path TEXT NOT NULL, kind TEXT NOT NULL, stamp REAL, "
+                         "created REAL NOT NULL, payload TEXT NOT NULL, "
+                         "PRIMARY KEY (catalog_path, kind))")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # a short lived connection per call keeps the cache safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _key(catalog_path):
+        return os.path.normcase(os.path.abspath(catalog_path))
+
+    def get(self, catalog_path, kind):
+        """Return the cached value for a catalog path, or None if missing or stale
+            :param catalog_path {String}: dataset path
+            :param kind {String}: type of metadata (eg 'field_dict')
+        """
+        key = self._key(catalog_path)
+        with self._connect() as conn:
+            row = conn.execute("SELECT stamp, created, payload FROM schema_cache "
+                               "WHERE catalog_path = ? AND kind = ?", (key, kind)).fetchone()
+        if row is not None:
+            stamp, created, payload = row
+            current = _change_stamp(key)
+            if current is None:
+                fresh = stamp is None and self.ttl is not None and time.time() - created <= self.ttl
+            else:
+                fresh = stamp == current
+            if fresh:
+                self.hits += 1
+                return json.loads(payload, object_hook=_decode_value)
+        self.misses += 1
+        return None
+
+    def set(self, catalog_path, kind, value):
+        """Store a JSON serializable value (dates and times included) for a catalog path.
+        Values holding other types are returned without being stored.
+        """
+        key = self._key(catalog_path)
+        try:
+            payload = json.dumps(value, default=_encode_value)
+        except TypeError:
+            return value
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO schema_cache VALUES (?, ?, ?, ?, ?)",
+                         (key, kind, _change_stamp(key), time.time(), payload))
+        return value
+
+    def get_or_load(self, catalog_path, kind, loader):
+        """Return the cached value, calling loader() and storing the result on a miss"""
+        value = self.get(catalog_path, kind)
+        if value is None:
+            value = self.set(catalog_path, kind, loader())
+        return value
+
+    def invalidate(self, catalog_path=None):
+        """Remove entries for a catalog path, or all entries if no path is given"""
+        with self._connect() as conn:
+            if catalog_path is None:
+                conn.execute("DELETE FROM schema_cache")
+            else:
+                conn.execute("DELETE FROM schema_cache WHERE catalog_path = ?", (self._key(catalog_path),))
+
+    def stats(self):
+        """Return a dictionary of hits, misses and hit ratio for this session"""
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0}
+
+
+def enable_schema_cache(cache_path=None, ttl=3600):
+    """Turn on the persistent schema cache for TableObj, GDBObj and compare_schema.
+        :param cache_path {String}: path to the SQLite file (defaults to the user cache folder)
+        :param ttl {Number}: seconds before entries without a change stamp expire
+        :return the SchemaCache in use
+    """
+    global _schema_cache
+    _schema_cache = SchemaCache(cache_path, ttl=ttl)
+    return _schema_cache
+
+
+def disable_schema_cache():
+    """Turn off the persistent schema cache (the cache file is kept)"""
+    global _schema_cache
+    _schema_cache = None
+
+
+def get_schema_cache():
+    """Return the active SchemaCache, or None if caching is not enabled"""
+    return _schema_cache
+
+
+def _cached(catalog_path, kind, loader):
+    """Return loader() through the active schema cache, if any"""
+    if _schema_cache is None:
+        return loader()
+    return _schema_cache.get_or_load(catalog_path, kind, loader)
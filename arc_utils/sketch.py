@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""fixed memory approximate counting sketches for profiling high cardinality fields
+
+Both sketches can be merged, so results from separate tables, partitions or
+worker processes can be combined. Values are hashed from their repr, so
+sketches built in different processes are compatible.
+
+Usage:
+    hll = arc_utils.sketch.HyperLogLog(error=0.01)
+    top = arc_utils.sketch.SpaceSaving(error=0.001)
+    for value in values:
+        hll.add(value)
+        top.add(value)
+    hll.count(), top.top(20)
+"""
+import hashlib
+import math
+
+
+def _hash64(value):
+    """Stable 64 bit hash of a value (python's hash() is salted per process)"""
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+    elif isinstance(value, bytes):
+        data = value
+    else:
+        data = repr(value).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class HyperLogLog(object):
+    """ HyperLogLog distinct value counter
+    Usage: hll = arc_utils.sketch.HyperLogLog(error=0.01)
+    :param
+        error: target relative standard error of count() (default 0.01 = 1%).
+            Memory use is about 1.04^2 / error^2 bytes (0.01 -> 16KB)
+    """
+    def __init__(self, error=0.01):
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        self.error = error
+        self.precision = min(18, max(4, int(math.ceil(math.log2((1.04 / error) ** 2)))))
+        self._size = 1 << self.precision
+        self._registers = bytearray(self._size)
+
+    def add(self, value):
+        """Add a value to the sketch"""
+        hashed = _hash64(value)
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, values):
+        """Add each value of an iterable to the sketch"""
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        """Combine another HyperLogLog of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLog sketches with different precision")
+        self._registers = bytearray(max(a, b) for a, b in zip(self._registers, other._registers))
+        return self
+
+    def count(self):
+        """Return the estimated number of distinct values added"""
+        size = self._size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # small range correction (linear counting)
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+
+class SpaceSaving(object):
+    """ Space-Saving frequent value (heavy hitter) counter
+    Usage: top = arc_utils.sketch.SpaceSaving(error=0.001)
+    :param
+        error: fraction of the number of values added by which counts may be
+            overestimated (default 0.001). Up to 2 / error values are tracked at a time,
+            max_error() returns the actual bound for the values added so far
+    """
+    def __init__(self, error=0.001):
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        self.error = error
+        self.capacity = int(math.ceil(1 / error))
+        self.total = 0
+        # largest count discarded so far, an untracked value may have occurred up to this often
+        self.floor = 0
+        self._counts = {}
+
+    def add(self, value, count=1):
+        """Add a value to the sketch"""
+        self.total += count
+        counts = self._counts
+        if value in counts:
+            counts[value] += count
+        else:
+            counts[value] = self.floor + count
+            if len(counts) >= 2 * self.capacity:
+                self._truncate()
+
+    def update(self, values):
+        """Add each value of an iterable to the sketch"""
+        for value in values:
+            self.add(value)
+        return self
+
+    def _truncate(self):
+        """Keep the capacity most frequent values, raising the floor to the largest discarded count"""
+        ranked = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        kept, dropped = ranked[:self.capacity], ranked[self.capacity:]
+        if dropped:
+            self.floor = max(self.floor, dropped[0][1])
+        self._counts = dict(kept)
+
+    def merge(self, other):
+        """Combine another SpaceSaving sketch into this one"""
+        merged = {}
+        for value in set(self._counts) | set(other._counts):
+            merged[value] = self._counts.get(value, self.floor) + other._counts.get(value, other.floor)
+        self.total += other.total
+        self.floor += other.floor
+        self.capacity = max(self.capacity, other.capacity)
+        self._counts = merged
+        self._truncate()
+        return self
+
+    def top(self, k=20):
+        """Return up to k (value, estimated count) tuples, most frequent first"""
+        ranked = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
+
+    def max_error(self):
+        """Return the largest amount a reported count may exceed the true count"""
+        return self.floor
@@ -1,13 +1,315 @@
 # -*- coding: utf-8 -*-
 """utilities for working with tables, featureclasses and fields
 """
-import arcpy
+import os
+from collections import deque
+from functools import cached_property
+from ._lazy import arcpy
+from ._lazy import _execute_error
+from .backends import ArcpyBackend
+from .backends import get_data_backend
 from .output import get_valid_output_path
+from .output import Progressor
+from .output import buffered_messages
 from .output import output_msg
 from ._inputs import _ensure_valid_path
 from ._inputs import _input_display_name
 from ._inputs import _normalize_to_sequence
+from ._inputs import _resolve_dataset
 from ._inputs import _resolve_dataset_path
+from .instrument import _timed
+from .schema_cache import _cached
+from .schema_cache import get_schema_cache
+from .result_cache import get_result_cache
+from ._pool import _worker_count
+
+# field types which cannot be meaningfully profiled (value sets, max values)
+_UNPROFILED_FIELD_TYPES = ("Geometry", "Blob", "Raster")
+
+# rows per chunk read by TableObj.iter_batches
+DEFAULT_BATCH_SIZE = 50000
+BATCH_OUTPUTS = ("numpy", "arrow")
+# numpy types of fields in iter_batches arrays, other field types are held as python objects
+_BATCH_NUMPY_TYPES = {"OID": "i8", "SmallInteger": "i2", "Integer": "i4", "BigInteger": "i8",
+                      "Single": "f4", "Double": "f8"}
+# pyarrow type names of fields in iter_batches record batches, other field types are inferred
+_BATCH_ARROW_TYPES = {"OID": "int64", "SmallInteger": "int16", "Integer": "int32", "BigInteger": "int64",
+                      "Single": "float32", "Double": "float64", "String": "string", "GUID": "string",
+                      "GlobalID": "string"}
+
+# OID range partitions per worker process in parallel scans, more partitions than
+# workers keeps all workers busy when rows are unevenly spread over the OID range
+_PARTITIONS_PER_WORKER = 4
+
+# convert reported field types to types accepted by the add field tools
+_FIELD_TYPE_CONVERSIONS = {"String": "TEXT", "Float": "FLOAT", "Single": "FLOAT", "Double": "DOUBLE",
+                           "SmallInteger": "SHORT", "Integer": "LONG", "BigInteger": "BIGINTEGER",
+                           "Date": "DATE", "DateOnly": "DATEONLY", "TimeOnly": "TIMEONLY",
+                           "TimestampOffset": "TIMESTAMPOFFSET", "Blob": "BLOB", "Raster": "RASTER",
+                           "GUID": "GUID", "TRUE": "True", "FALSE": "False", "Geometry": "GEOMETRY", "OID": "OID"}
+
+# backends for get_field_value_set, get_max_field_value and get_max_field_value_length
+# 'cursor' iterates arcpy.da.SearchCursor rows, 'numpy' reads columns with arcpy.da.TableToNumPyArray
+STATS_BACKENDS = ("cursor", "numpy")
+_stats_backend = "cursor"
+
+
+def set_stats_backend(backend):
+    """Set the default backend used for column statistics.
+        :param backend {String}:
+            'cursor' (default) or 'numpy'. The numpy backend reads columns in OID range chunks
+            and is much faster for large tables. Fields of types it cannot read (eg Date, GUID)
+            always use the cursor backend.
+    """
+    global _stats_backend
+    if backend not in STATS_BACKENDS:
+        raise ValueError("backend must be one of {}".format(", ".join(STATS_BACKENDS)))
+    _stats_backend = backend
+
+
+def get_stats_backend():
+    """Return the default backend used for column statistics"""
+    return _stats_backend
+
+
+# run distinct, duplicate and max queries in the database for enterprise and mobile geodatabases
+_sql_pushdown_enabled = False
+
+
+def set_sql_pushdown(enabled):
+    """Enable or disable (default) SQL pushdown. For tables in enterprise (unversioned,
+    not archived) and mobile geodatabases, get_field_value_set, find_duplicate_field_values
+    and get_max_field_value (numeric fields) run DISTINCT, GROUP BY and MAX queries in the
+    database, falling back to reading rows if the query fails.
+    String values are compared using the database collation, and find_duplicate_field_values
+    output='df' is sorted by value (as per streaming=True) rather than in row order.
+        :param enabled {Boolean}:
+    """
+    global _sql_pushdown_enabled
+    _sql_pushdown_enabled = bool(enabled)
+
+
+def get_sql_pushdown():
+    """Return True if SQL pushdown is enabled"""
+    return _sql_pushdown_enabled
+
+
+class _FieldProfile(object):
+    """Accumulate the statistics of a single field from a stream of values.
+    Mirrors the results of get_field_value_set, get_max_field_value and
+    get_max_field_value_length so that all of them can come from one scan.
+    """
+    def __init__(self, name, field_type=None):
+        self.name = name
+        self.type = field_type
+        self.values = set()
+        self.null_count = 0
+        self.count = 0
+        self.max_value = None
+        self.max_length_value = None
+        self.max_length = 0
+
+    def add(self, value):
+        """Add a single value read from a cursor"""
+        self.count += 1
+        if value is None:
+            self.null_count += 1
+            self.values.add("NULL")
+            return
+        self.values.add(value)
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+        if isinstance(value, str):
+            if self.max_length_value is None or len(value) > len(self.max_length_value):
+                self.max_length_value = value
+        length = len(str(value))
+        if length > self.max_length:
+            self.max_length = length
+
+    def merge(self, other):
+        """Combine the results of another profile of the same field into this one"""
+        self.count += other.count
+        self.null_count += other.null_count
+        self.values |= other.values
+        if other.max_value is not None and (self.max_value is None or other.max_value > self.max_value):
+            self.max_value = other.max_value
+        if other.max_length_value is not None and (
+                self.max_length_value is None or len(other.max_length_value) > len(self.max_length_value)):
+            self.max_length_value = other.max_length_value
+        self.max_length = max(self.max_length, other.max_length)
+        return self
+
+    def as_dict(self):
+        """Return the profile as a plain dictionary"""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "values": self.values,
+            "count": self.count,
+            "null_count": self.null_count,
+            "max_value": self.max_value,
+            # non string fields have no length comparison, as per get_max_field_value
+            "max_length_value": self.max_length_value if self.max_length_value is not None else self.max_value,
+            "max_length": self.max_length
+        }
+
+
+class _ApproximateFieldProfile(object):
+    """Accumulate the approximate distinct count and frequent values of a single field"""
+    def __init__(self, name, field_type=None, error=0.01, top_k=20):
+        from .sketch import HyperLogLog
+        from .sketch import SpaceSaving
+
+        self.name = name
+        self.type = field_type
+        self.top_k = top_k
+        self.count = 0
+        self.null_count = 0
+        self.distinct_sketch = HyperLogLog(error=error)
+        self.top_sketch = SpaceSaving(error=error / 10)
+
+    def add(self, value):
+        """Add a single value read from a cursor"""
+        self.count += 1
+        if value is None:
+            self.null_count += 1
+            return
+        self.distinct_sketch.add(value)
+        self.top_sketch.add(value)
+
+    def merge(self, other):
+        """Combine the results of another approximate profile of the same field into this one"""
+        self.count += other.count
+        self.null_count += other.null_count
+        self.distinct_sketch.merge(other.distinct_sketch)
+        self.top_sketch.merge(other.top_sketch)
+        return self
+
+    def as_dict(self):
+        """Return the profile as a plain dictionary"""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "count": self.count,
+            "null_count": self.null_count,
+            "distinct_count": self.distinct_sketch.count(),
+            "top_values": self.top_sketch.top(self.top_k),
+            "distinct_sketch": self.distinct_sketch,
+            "top_sketch": self.top_sketch
+        }
+
+
+def _format_count(count):
+    """Abbreviate a count for display, eg 12300000 -> '12.3M'"""
+    for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if count >= threshold:
+            return "{:.1f}{}".format(count / threshold, suffix)
+    return str(count)
+
+
+def _approximate_values_text(field_profile):
+    """Summary text of an approximate field profile, eg '~12.3M distinct, top 20: A (51), B (40)'"""
+    top_values = field_profile["top_values"]
+    text = "~{} distinct".format(_format_count(field_profile["distinct_count"]))
+    if field_profile["null_count"]:
+        text += " + NULL ({})".format(field_profile["null_count"])
+    if top_values:
+        text += ", top {}: ".format(len(top_values))
+        text += ", ".join("{} ({})".format(value, count) for value, count in top_values)
+    return text
+
+
+# distinct keys counted in memory by find_duplicate_field_values(streaming=True) before spilling to disk
+_DUPLICATE_MAX_KEYS = 1000000
+_DUPLICATE_PARTITIONS = 16
+# times a spilled partition is split again, keys with equal hashes cannot be split
+_DUPLICATE_MAX_LEVELS = 8
+
+
+def _duplicate_key_counts(rows, max_keys=_DUPLICATE_MAX_KEYS, partitions=_DUPLICATE_PARTITIONS):
+    """Count row tuples and yield (key, count) for keys seen more than once.
+    Once more than max_keys distinct keys are held, the counts are written to
+    temporary files partitioned by key hash, and each partition is then counted separately.
+    A partition with more than max_keys distinct keys is split again by more bits of the hash,
+    so at most about max_keys keys are in memory at a time.
+    """
+    import collections
+    import tempfile
+
+    counts = collections.Counter()
+    spill_dir = None
+    try:
+        for row in rows:
+            counts[tuple(row)] += 1
+            if len(counts) > max_keys:
+                if spill_dir is None:
+                    spill_dir = tempfile.TemporaryDirectory(prefix="arc_utils_dups_")
+                _spill_key_counts(counts, spill_dir.name, partitions, 0)
+                counts.clear()
+
+        if spill_dir is None:
+            for key, count in counts.items():
+                if count > 1:
+                    yield key, count
+            return
+
+        _spill_key_counts(counts, spill_dir.name, partitions, 0)
+        counts.clear()
+        yield from _spilled_duplicate_counts(spill_dir.name, max_keys, partitions, 0)
+    finally:
+        if spill_dir is not None:
+            spill_dir.cleanup()
+
+
+def _spilled_duplicate_counts(spill_dir, max_keys, partitions, level):
+    """Yield (key, count) for keys seen more than once in the partition files of spill_dir,
+    splitting partitions of more than max_keys distinct keys into a sub folder
+    """
+    import collections
+    import pickle
+
+    for partition in range(partitions):
+        partition_path = os.path.join(spill_dir, "{}.pkl".format(partition))
+        if not os.path.exists(partition_path):
+            continue
+        partition_counts = collections.Counter()
+        split_dir = None
+        with open(partition_path, "rb") as partition_file:
+            while True:
+                try:
+                    partition_counts.update(dict(pickle.load(partition_file)))
+                except EOFError:
+                    break
+                if len(partition_counts) > max_keys and level < _DUPLICATE_MAX_LEVELS:
+                    if split_dir is None:
+                        split_dir = os.path.join(spill_dir, str(partition))
+                        os.mkdir(split_dir)
+                    _spill_key_counts(partition_counts, split_dir, partitions, level + 1)
+                    partition_counts.clear()
+        os.remove(partition_path)
+        if split_dir is not None:
+            _spill_key_counts(partition_counts, split_dir, partitions, level + 1)
+            partition_counts.clear()
+            yield from _spilled_duplicate_counts(split_dir, max_keys, partitions, level + 1)
+            continue
+        for key, count in partition_counts.items():
+            if count > 1:
+                yield key, count
+
+
+def _spill_key_counts(counts, spill_dir, partitions, level):
+    """Append (key, count) pairs to partition files by key hash, using the next base partitions
+    digit of the hash at each level, so a split partition is spread over every sub partition
+    """
+    import pickle
+
+    batches = [[] for _ in range(partitions)]
+    for key, count in counts.items():
+        batches[hash(key) // partitions ** level % partitions].append((key, count))
+    for partition, batch in enumerate(batches):
+        if batch:
+            with open(os.path.join(spill_dir, "{}.pkl".format(partition)), "ab") as partition_file:
+                pickle.dump(batch, partition_file, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 class TableObj(object):
@@ -20,26 +322,111 @@ class TableObj(object):
             - wrapper object exposing .path
             - ArcGIS layer/table object exposing .catalogPath or .dataSource
     """
-    def __init__(self, table_path):
-        """Set up table reference and load schema metadata.
+    # metadata properties which are loaded on first use, see refresh()
+    _cached_properties = ("describe_obj", "_describe_properties", "name", "type", "field_dict", "fields", "fields2",
+                          "fieldaliases", "_sql_pushdown")
+
+    def __init__(self, table_path, data_backend=None):
+        """Set up table reference. Schema metadata (describe_obj, field_dict,
+        fields etc.) is loaded on first access and cached, see refresh().
+            :param data_backend {DataBackend}:
+                backend reading the table, defaults to the backend of its workspace
+                (see arc_utils.backends.get_data_backend)
 
         Raises:
             ValueError: invalid path
         """
-        self.path = _ensure_valid_path(_resolve_dataset_path(table_path, arg_name="table_path"))
-        self.describe_obj = self._describe_object()
-        self.name = self._get_fc_name()
-        self.type = self._get_fc_type()
-        self.field_dict = self._make_field_dict()
-        self.fields = self._list_field_names()
-        self.fields2 = self._list_field_names(required=False)
-        self.fieldaliases = self._list_field_names(aliases=True)
+        path, desc = _resolve_dataset(table_path, arg_name="table_path")
+        self._data_backend = data_backend or get_data_backend(path)
+        if desc is not None and isinstance(self._data_backend, ArcpyBackend):
+            # the Describe of path resolution also validates the path, and seeds describe_obj
+            self.path = path
+            self.__dict__["describe_obj"] = desc
+        else:
+            self.path = _ensure_valid_path(path, self._data_backend)
         self.ignore_fields = ["objectid", "globalid","fid", "shape", "shape_area", "shape.area", "shape.starea()", "shape_length", "shape.len", "shape.stlength()"]
-        
+
+    @cached_property
+    def describe_obj(self):
+        """arcpy Describe object of the table"""
+        return self._describe_object()
+
+    @cached_property
+    def _describe_properties(self):
+        """describe derived properties, read through the schema cache when enabled"""
+        return _cached(self.path, "describe",
+                       lambda: {"name": self._get_fc_name(), "type": self._get_fc_type()})
+
+    @cached_property
+    def name(self):
+        """base name of the table"""
+        return self._describe_properties["name"]
+
+    @cached_property
+    def type(self):
+        """shape type of a featureclass, or data type of a table"""
+        return self._describe_properties["type"]
+
+    @cached_property
+    def field_dict(self):
+        """dictionary of field properties keyed by field name"""
+        return _cached(self.path, "field_dict", self._make_field_dict)
+
+    @cached_property
+    def fields(self):
+        """list of all field names"""
+        return self._list_field_names()
+
+    @cached_property
+    def fields2(self):
+        """list of non-required field names"""
+        return self._list_field_names(required=False)
+
+    @cached_property
+    def fieldaliases(self):
+        """list of all field aliases"""
+        return self._list_field_names(aliases=True)
+
+    @cached_property
+    def _sql_pushdown(self):
+        """SQLPushdown of the table for database workspaces, otherwise None"""
+        try:
+            return self._data_backend.sql_pushdown(self.path, self.describe_obj)
+        except Exception:
+            return None
+
+    def refresh(self):
+        """Discard cached metadata (and cached results, see arc_utils.result_cache)
+        so it is reloaded on next access, eg after fields have been added or removed.
+        """
+        schema_cache = get_schema_cache()
+        if schema_cache is not None:
+            schema_cache.invalidate(self.path)
+        result_cache = get_result_cache()
+        if result_cache is not None:
+            result_cache.invalidate(self.path)
+        for attr in self._cached_properties:
+            self.__dict__.pop(attr, None)
+        return self
+
+    def _cached_result(self, kind, fields, loader, where_clause=None, options=()):
+        """Return loader() through the active result cache, if any.
+        Tables without a change stamp are read every time.
+        """
+        result_cache = get_result_cache()
+        if result_cache is None:
+            return loader()
+        try:
+            stamp = self._data_backend.change_stamp(self.path, self.describe_obj)
+        except Exception:
+            stamp = None
+        if stamp is None:
+            return loader()
+        return result_cache.get_or_load(self.path, kind, fields, where_clause, stamp, loader, options)
 
     def _describe_object(self):
         """ returns describe object"""
-        return arcpy.Describe(self.path)
+        return self._data_backend.describe(self.path)
 
     def _get_fc_name(self):
         return self.describe_obj.baseName
@@ -68,23 +455,7 @@ class TableObj(object):
         """Dictionary of fields containing
         all properties exposed by the arcpy.ListFields tool
         """
-        field_dict = dict()
-        for field in arcpy.ListFields(self.path):
-            field_dict[field.name] = {
-                "name": field.name,
-                "baseName": field.baseName,
-                "aliasName": field.aliasName,
-                "type": field.type,
-                "length": field.length,
-                "required": field.required,
-                "domain": field.domain,
-                "defaultValue": field.defaultValue,
-                "precision": field.precision,
-                "scale": field.scale,
-                "isNullable": field.isNullable,
-                "editable": field.editable
-            }
-        return field_dict
+        return self._data_backend.fields(self.path)
 
     def get_field_info_as_text(self, sep="\t"):
         """ Create a delimeter separated output of a table's fields and their properties
@@ -98,26 +469,120 @@ class TableObj(object):
         str_output += "\n"
         return str_output
 
-    def get_max_field_value(self, field, lengthcomp=False):
+    def _numpy_field_type(self, field, backend):
+        """Return the field type if the numpy backend should be used for the field, otherwise None"""
+        from ._numpy_stats import _supports_field_type
+
+        backend = backend or _stats_backend
+        if backend not in STATS_BACKENDS:
+            raise ValueError("backend must be one of {}".format(", ".join(STATS_BACKENDS)))
+        field_type = self.field_dict[field]['type']
+        if backend == "numpy" and _supports_field_type(field_type) and \
+                isinstance(self._data_backend, ArcpyBackend):
+            return field_type
+        return None
+
+    def _pushdown_for(self, fields, backend=None, parallel=None, field_types=None):
+        """Return the SQLPushdown to use for fields, or None to read rows.
+        Pushdown is used when enabled, no backend (or default numpy backend) or parallel
+        scan is requested, and every field is of a type in field_types.
+        """
+        from ._pushdown import _PUSHDOWN_FIELD_TYPES
+
+        if not _sql_pushdown_enabled or backend is not None or _stats_backend != "cursor" or _worker_count(parallel):
+            return None
+        field_types = field_types or _PUSHDOWN_FIELD_TYPES
+        if not all(self.field_dict.get(f, {}).get('type') in field_types for f in fields):
+            return None
+        return self._sql_pushdown
+
+    def iter_batches(self, fields, batch_size=DEFAULT_BATCH_SIZE, where_clause=None, output="numpy"):
+        """Yield the rows of the table in chunks of at most batch_size rows, in cursor (OID) order,
+        so large tables can be processed with numpy/pandas in bounded memory.
+            :param fields {String|[String]}:
+                field name or list of field names (cursor tokens such as OID@ are accepted)
+            :param batch_size {Integer}:
+                maximum rows per chunk
+            :param where_clause {String}:
+                optional SQL expression to select rows
+            :param output {String}:
+                'numpy' yields numpy masked structured arrays, with nulls masked.
+                Numeric fields use numpy types, other fields (text, dates etc.) are python objects.
+                'arrow' yields pyarrow RecordBatches (requires pyarrow), with nulls as arrow nulls.
+            :return generator of arrays or record batches
+        """
+        if output not in BATCH_OUTPUTS:
+            raise ValueError("output must be one of {}".format(", ".join(BATCH_OUTPUTS)))
+        fields = _normalize_to_sequence(fields)
+        field_types = [self._batch_field_type(f) for f in fields]
+        to_batch = _arrow_batch if output == "arrow" else _numpy_batch
+        for rows in self._iter_row_chunks(fields, batch_size, where_clause):
+            yield to_batch(rows, fields, field_types)
+
+    def _iter_row_chunks(self, fields, batch_size=DEFAULT_BATCH_SIZE, where_clause=None, sql_clause=(None, None)):
+        """Yield lists of at most batch_size row tuples from a single cursor.
+        This is the read path shared by iter_batches and the profile, value set,
+        max value and duplicate methods.
+        """
+        return self._data_backend.iter_row_chunks(self.path, fields, batch_size, where_clause, sql_clause)
+
+    def _batch_field_type(self, field):
+        """Field type of a field name or cursor token, used for iter_batches column types"""
+        if field.upper() == "OID@":
+            return "OID"
+        field_info = self.field_dict.get(field)
+        if field_info is None:
+            field_info = next((f for name, f in self.field_dict.items() if name.lower() == field.lower()), {})
+        return field_info.get("type")
+
+    def get_max_field_value(self, field, lengthcomp=False, backend=None, chunk_size=None, parallel=None):
         """Return the largest value (if numeric).
         lexicographic string comparison is used to determine largest value for strings by default.
             :param {String} field:
             name of the field to parse
             :param {Boolean} lengthcomp:
             If True will compare strings for length rather than lexicographically (ascii value of letters)
+            :param {String} backend:
+            'cursor' or 'numpy', defaults to the value of set_stats_backend
+            :param {Integer} chunk_size:
+            rows read at a time by the numpy backend
+            :param {Integer} parallel:
+            number of processes scanning OID ranges of the table (-1 uses all cpus),
+            default None reads the table in this process. Parallel scans use the cursor backend
         """
         field_type = self.field_dict[field]['type']
         if field_type in ["Geometry"]:
             print("Cannot process Geometry field")
             return None
+        numpy_type = None if _worker_count(parallel) else self._numpy_field_type(field, backend)
+        if numpy_type:
+            from ._numpy_stats import _max_value
+            return _max_value(self.path, field, numpy_type, self._oid_chunks(chunk_size), lengthcomp=lengthcomp)
         elif field_type in ["String"]:
             result = ''
         else:
             result = 0
-        with arcpy.da.SearchCursor(self.path, field) as values:
-            for value in values:
-                if value[0] is not None:
-                    val = value[0]
+        from ._pushdown import _PUSHDOWN_MAX_FIELD_TYPES
+        pushdown = self._pushdown_for([field], backend, parallel, field_types=_PUSHDOWN_MAX_FIELD_TYPES)
+        if pushdown is not None:
+            try:
+                value = pushdown.max_value(field)
+                return value if value is not None and value > result else result
+            except Exception as e:
+                output_msg("SQL pushdown failed, reading rows: {}".format(e), severity=1)
+        if _worker_count(parallel):
+            field_profile = self._scan_profiles([_FieldProfile(field, field_type)], parallel=parallel)[0]
+            if field_type in ["String"] and lengthcomp:
+                value = field_profile.max_length_value
+            else:
+                value = field_profile.max_value
+            if value is not None and (len(value) > len(result) if field_type in ["String"] and lengthcomp
+                                      else value > result):
+                result = value
+            return result
+        for rows in self._iter_row_chunks([field]):
+            for val, in rows:
+                if val is not None:
                     if field_type in ["String"] and lengthcomp:
                         if len(val) > len(result):
                             result = val
@@ -126,69 +591,263 @@ class TableObj(object):
                             result = val
         return result
 
-    def get_max_field_value_length(self, field):
+    def get_max_field_value_length(self, field, backend=None, chunk_size=None):
         """Return the length of the maximum value in the field.
             :param: field {String}:
             name of the field to parse
+            :param backend {String}:
+            'cursor' or 'numpy', defaults to the value of set_stats_backend
+            :param chunk_size {Integer}:
+            rows read at a time by the numpy backend
         """
+        numpy_type = self._numpy_field_type(field, backend)
+        if numpy_type:
+            from ._numpy_stats import _max_value_length
+            return _max_value_length(self.path, field, numpy_type, self._oid_chunks(chunk_size))
         length = 0
-        with arcpy.da.SearchCursor(self.path, field) as values:
-            for value in values:
-                if value[0] is not None:
-                    val = str(value[0])
+        for rows in self._iter_row_chunks([field]):
+            for val, in rows:
+                if val is not None:
+                    val = str(val)
                     if len(val) > length:
                         length = len(val)
         return length
 
-    def get_field_value_set(self, field):
+    def get_field_value_set(self, field, backend=None, chunk_size=None, parallel=None):
         """Return set of unique field values
             :param field {String}:
                 name of the field to parse
+            :param backend {String}:
+                'cursor' or 'numpy', defaults to the value of set_stats_backend
+            :param chunk_size {Integer}:
+                rows read at a time by the numpy backend
+            :param parallel {Integer}:
+                number of processes scanning OID ranges of the table (-1 uses all cpus),
+                default None reads the table in this process. Parallel scans use the cursor backend
             :return set of unique values. Null values are represented as 'NULL' string
            """
-        if not arcpy.Exists(self.path):
-            raise ValueError("invalid path")
+        _ensure_valid_path(self.path, self._data_backend)
+        # the numpy and cursor backends are cached apart, so a call returns what its backend reads
+        return self._cached_result("value_set", [field],
+                                   lambda: self._read_field_value_set(field, backend, chunk_size, parallel),
+                                   options=(backend or _stats_backend,))
+
+    def _read_field_value_set(self, field, backend, chunk_size, parallel):
+        """Read the set of unique field values, see get_field_value_set"""
+        numpy_type = None if _worker_count(parallel) else self._numpy_field_type(field, backend)
         try:
+            pushdown = self._pushdown_for([field], backend, parallel)
+            if pushdown is not None:
+                try:
+                    return pushdown.value_set(field)
+                except Exception as e:
+                    output_msg("SQL pushdown failed, reading rows: {}".format(e), severity=1)
+            if _worker_count(parallel):
+                field_type = self.field_dict.get(field, {}).get('type')
+                return self._scan_profiles([_FieldProfile(field, field_type)], parallel=parallel)[0].values
+            if numpy_type:
+                from ._numpy_stats import _value_set
+                return _value_set(self.path, field, numpy_type, self._oid_chunks(chunk_size))
             value_set = set()  # set to hold unique values
-            with arcpy.da.SearchCursor(self.path, field) as values:
-                for value in values:
-                    if value[0] is None:
-                        value_set.add("NULL")
-                    else:
-                        value_set.add(value[0])
+            for rows in self._iter_row_chunks([field]):
+                value_set.update(value for value, in rows)
+            if None in value_set:
+                value_set.discard(None)
+                value_set.add("NULL")
             return value_set
 
-        except arcpy.ExecuteError:
+        except _execute_error():
             output_msg(arcpy.GetMessages(2))
         except Exception as e:
-            output_msg(e.args[0])
+            output_msg(str(e))
 
-    def export_fields_to_worksheet(self, worksheet, ignore_fields=None):
-        """Write this table's field unique values to an openpyxl worksheet.
-        if ignore_fields is not provided, will use the default ignore_fields property of the object
-        if ignore_fields is provided, only those fields will be ignored
-        :param worksheet: an openpyxl worksheet object to write to
+    def profile(self, fields=None, ignore_fields=None, parallel=None):
+        """Profile one or more fields in a single pass over the table.
+        Produces the same information as get_field_value_set, get_max_field_value
+        and get_max_field_value_length, but reads the table only once.
+            :param fields {String|[String]}:
+                field name or list of field names. Defaults to all non-required fields
+                (fields2), excluding Geometry, Blob and Raster fields
+            :param ignore_fields [{String}]:
+                list of field names to skip (case insensitive)
+            :param parallel {Integer}:
+                number of processes scanning OID ranges of the table (-1 uses all cpus),
+                the partial profiles are merged. Default None reads the table in this process
+            :return dictionary keyed by field name, each value a dictionary of
+                values (set, nulls represented as 'NULL'), count, null_count, max_value,
+                max_length_value (longest string) and max_length (length of longest value as text)
+        """
+        fields = self._profile_fields(fields, ignore_fields)
+        profiles = [_FieldProfile(f, self.field_dict.get(f, {}).get('type')) for f in fields]
+        self._scan_profiles(profiles, parallel=parallel)
+        return {p.name: p.as_dict() for p in profiles}
+
+    def profile_approximate(self, fields=None, ignore_fields=None, error=0.01, top_k=20, parallel=None):
+        """Profile one or more fields in a single pass using fixed memory sketches,
+        for fields with too many distinct values to hold as a set (eg GUIDs, addresses).
+            :param fields {String|[String]}:
+                field name or list of field names, defaults as per profile()
+            :param ignore_fields [{String}]:
+                list of field names to skip (case insensitive)
+            :param error {Number}:
+                relative error of the distinct count (default 0.01). Frequent value counts
+                may be overestimated by about error / 10 of the number of rows
+            :param top_k {Integer}:
+                number of most frequent values to report
+            :param parallel {Integer}:
+                number of processes scanning OID ranges of the table (-1 uses all cpus),
+                the partial sketches are merged. Default None reads the table in this process
+            :return dictionary keyed by field name, each value a dictionary of
+                count, null_count, distinct_count (estimate, excluding NULL),
+                top_values (list of (value, estimated count)), and the mergeable
+                distinct_sketch (sketch.HyperLogLog) and top_sketch (sketch.SpaceSaving)
+        """
+        fields = self._profile_fields(fields, ignore_fields)
+        profiles = [_ApproximateFieldProfile(f, self.field_dict.get(f, {}).get('type'), error, top_k)
+                    for f in fields]
+        self._scan_profiles(profiles, parallel=parallel)
+        return {p.name: p.as_dict() for p in profiles}
+
+    def _profile_fields(self, fields, ignore_fields):
+        """Resolve the field list used by profile and profile_approximate"""
+        if fields is None:
+            fields = [f for f in self.fields2 if self.field_dict[f]['type'] not in _UNPROFILED_FIELD_TYPES]
+        fields = _normalize_to_sequence(fields)
+        if ignore_fields:
+            ignore_set = {v.lower() for v in ignore_fields}
+            fields = [f for f in fields if f.lower() not in ignore_set]
+        return fields
+
+    def _scan_profiles(self, profiles, where_clause=None, parallel=None):
+        """Add every row of the table (or those selected by where_clause)
+        to a list of field profiles in one cursor pass, or with parallel
+        merge the profiles of OID range partitions scanned in worker processes
+        """
+        if not profiles:
+            return profiles
+        import copy
+
+        # workers get empty copies, as the pool may send arguments after merging has begun
+        partials = self._partitioned_scan(parallel, _scan_partition_profiles, copy.deepcopy(profiles))
+        if partials is not None:
+            for partial in partials:
+                for field_profile, partial_profile in zip(profiles, partial):
+                    field_profile.merge(partial_profile)
+            return profiles
+        for rows in self._iter_row_chunks([p.name for p in profiles], where_clause=where_clause):
+            for field_profile, column in zip(profiles, zip(*rows)):
+                for value in column:
+                    field_profile.add(value)
+        return profiles
+
+    def _partitioned_scan(self, parallel, scan, *args):
+        """Run scan(table path, data backend, *args, where_clause) on OID range partitions of the
+        table in worker processes, and return an iterator of the partial results
+        in OID order. Returns None when the scan should run serially (parallel is
+        None, 0 or 1, or the table has no OID field).
+        """
+        workers = _worker_count(parallel)
+        if not workers:
+            return None
+        where_clauses = self._oid_partitions(workers * _PARTITIONS_PER_WORKER)
+        if where_clauses is None:
+            return None
+        return _iter_partition_results(self.path, self._data_backend, workers, where_clauses, scan, args)
+
+    def _oid_chunks(self, chunk_size=None):
+        """Where clauses splitting the OID range of the table into ranges of chunk_size OIDs
+        (so at most chunk_size rows), as read by the numpy backend. [None] reads a table
+        without an OID field in one chunk.
+        """
+        from ._numpy_stats import DEFAULT_CHUNK_SIZE
+
+        where_clauses = self._oid_partitions(step=chunk_size or DEFAULT_CHUNK_SIZE)
+        return [None] if where_clauses is None else where_clauses
+
+    def _oid_partitions(self, partitions=None, step=None):
+        """Where clauses splitting the OID range of the table into up to
+        partitions equal ranges (or ranges of step OIDs), None if the table has no OID field
+        """
+        if not getattr(self.describe_obj, "hasOID", False):
+            return None
+        extent = self._oid_extent()
+        if extent is None:
+            return []
+        low, high = extent
+        oid_field = self._data_backend.delimit_field(self.path, self.describe_obj.OIDFieldName)
+        if step is None:
+            step = -(-(high - low + 1) // partitions)
+        step = max(1, step)
+        return ["{0} >= {1} AND {0} <= {2}".format(oid_field, start, min(start + step - 1, high))
+                for start in range(low, high + 1, step)]
+
+    def _oid_extent(self):
+        """(lowest, highest) OID of the table, None if the table is empty.
+        Geodatabases return the first row of an ordered cursor each way,
+        other sources (eg shapefiles) do not support ORDER BY so every OID is read.
+        """
+        oid_field = self.describe_obj.OIDFieldName
+        if os.path.splitext(self._workspace_path())[1].lower() in (".gdb", ".sde", ".geodatabase"):
+            extent = []
+            for order in ("ASC", "DESC"):
+                sql_clause = (None, "ORDER BY {} {}".format(oid_field, order))
+                rows = next(self._iter_row_chunks(["OID@"], 1, sql_clause=sql_clause), None)
+                if not rows:
+                    return None
+                extent.append(rows[0][0])
+            return tuple(extent)
+        low = high = None
+        for rows in self._iter_row_chunks(["OID@"]):
+            oids = [oid for oid, in rows]
+            low = min(oids) if low is None else min(low, min(oids))
+            high = max(oids) if high is None else max(high, max(oids))
+        return None if low is None else (low, high)
+
+    def get_field_value_rows(self, ignore_fields=None, approximate=False):
+        """Return (alias, values text) pairs for this table's fields, as written
+        by export_fields_to_worksheet. All fields are profiled in one table scan.
         :param ignore_fields: a list of field names to ignore
+            (defaults to the ignore_fields property of the object)
+        :param approximate: if True, report the approximate distinct count and
+            most frequent values of each field (see profile_approximate)
+        :return list of (field alias, comma separated sorted unique values)
         """
         if ignore_fields is None:
             ignore_fields = self.ignore_fields
         ignore_set = {v.lower() for v in ignore_fields}
 
-        worksheet["A1"] = "Field"
-        worksheet["B1"] = "Values"
+        fields = [f for f in self.fields2 if f.lower() not in ignore_set]
 
-        row = 2
-        for field_name in self.fields2:
-            if field_name.lower() in ignore_set:
-                continue
-            alias = self.field_dict.get(field_name, {}).get("aliasName") or field_name
-            values = self.get_field_value_set(field_name)
-            values_text = ", ".join(sorted(str(v) for v in values))
-            worksheet.cell(row=row, column=1, value=alias)
-            worksheet.cell(row=row, column=2, value=values_text)
-            row += 1
+        def read_rows():
+            if approximate:
+                profiles = self.profile_approximate(fields)
+            else:
+                profiles = self.profile(fields)
+            rows = []
+            for field_name in fields:
+                alias = self.field_dict.get(field_name, {}).get("aliasName") or field_name
+                if approximate:
+                    values_text = _approximate_values_text(profiles[field_name])
+                else:
+                    values = profiles[field_name]["values"]
+                    values_text = ", ".join(sorted(str(v) for v in values))
+                rows.append((alias, values_text))
+            return rows
+        return self._cached_result("field_value_rows", fields, read_rows, options=(approximate,))
 
-        return row
+    def export_fields_to_worksheet(self, worksheet, ignore_fields=None, approximate=False, overflow="rows"):
+        """Write this table's field unique values to an openpyxl worksheet.
+        if ignore_fields is not provided, will use the default ignore_fields property of the object
+        if ignore_fields is provided, only those fields will be ignored
+        :param worksheet: an openpyxl worksheet, written from cell A1,
+            or a write only worksheet, which the rows are appended to
+        :param ignore_fields: a list of field names to ignore
+        :param approximate: if True, write approximate distinct counts and most frequent values
+        :param overflow: 'rows', 'sheet' or 'truncate', how value lists longer than
+            an Excel cell (32,767 characters) are written, see export_field_sets
+        """
+        return _write_field_value_rows(worksheet, self.get_field_value_rows(ignore_fields, approximate=approximate),
+                                       overflow=overflow)
 
     def get_multiple_field_value_set(self, fields, sep=':'):
         """return a set of unique field values for an input table
@@ -203,16 +862,17 @@ class TableObj(object):
         else:
             fieldslist = fields
 
-        result = set()
-        
-        with arcpy.da.SearchCursor(self.path, fieldslist) as cursor:
-            for row in cursor:
-                parts = [('NULL' if v is None else str(v)) for v in row]
-                result.add(sep.join(parts))
+        def read_value_set():
+            result = set()
+            for rows in self._iter_row_chunks(fieldslist):
+                for row in rows:
+                    parts = [('NULL' if v is None else str(v)) for v in row]
+                    result.add(sep.join(parts))
+            return result
+        return self._cached_result("multiple_value_set", fieldslist, read_value_set, options=(sep,))
 
-        return set(result)
-
-    def find_duplicate_field_values(self, field, charset='ascii', output='set'):
+    def find_duplicate_field_values(self, field, charset='ascii', output='set', streaming=False, max_keys=None,
+                                    parallel=None):
         """Return duplicate values from one or more fields.
             :param field {String|[String]}:
                 field name (or list of field names when output='df')
@@ -222,7 +882,20 @@ class TableObj(object):
             :param output {String}:
                 'set' returns duplicate values for one field,
                 'df' returns a Pandas DataFrame with duplicate rows and counts.
+            :param streaming {Boolean}:
+                output='df' only. If True, value combinations are counted as rows are read
+                instead of loading the whole table into a DataFrame first.
+            :param max_keys {Integer}:
+                streaming only. Number of distinct value combinations held in memory
+                before counts are spilled to temporary files (default 1,000,000).
+            :param parallel {Integer}:
+                number of processes counting values in OID ranges of the table (-1 uses all cpus).
+                The partial counts are summed in memory, so max_keys does not apply.
+                output='df' returns the same sorted rows and counts as streaming=True.
             :return set or DataFrame.
+            With SQL pushdown enabled (see set_sql_pushdown), for enterprise and mobile geodatabases
+            the counts are computed by the database with GROUP BY, output='df' is then sorted as per
+            streaming=True.
            """
         if not isinstance(field, list):
             fieldslist = [field]
@@ -235,29 +908,64 @@ class TableObj(object):
         if output not in ['set', 'df']:
             raise ValueError("output must be either 'set' or 'df'")
 
+        if output == 'set' and len(fieldslist) != 1:
+            raise ValueError("field must be a single field when output='set'")
+
         try:
+            pushdown = self._pushdown_for(fieldslist, parallel=parallel)
+            if pushdown is not None:
+                try:
+                    dups = pushdown.duplicate_counts(fieldslist)
+                    if output == 'set':
+                        return {row[0] for row in dups}
+                    import pandas
+                    count = pandas.DataFrame(dups, columns=fieldslist + ['count'])
+                    return count.sort_values(fieldslist, na_position='last', kind='stable').reset_index(drop=True)
+                except Exception as e:
+                    output_msg("SQL pushdown failed, reading rows: {}".format(e), severity=1)
+
+            partials = self._partitioned_scan(parallel, _count_partition_keys, fieldslist)
+            if partials is not None:
+                import collections
+                counts = collections.Counter()
+                for partial in partials:
+                    counts.update(partial)
+                if output == 'set':
+                    return {key[0] for key, count in counts.items() if count > 1}
+                import pandas
+                dups = [key + (count,) for key, count in counts.items() if count > 1]
+                count = pandas.DataFrame(dups, columns=fieldslist + ['count'])
+                return count.sort_values(fieldslist, na_position='last', kind='stable').reset_index(drop=True)
+
+            if output == 'df' and streaming:
+                import itertools
+                import pandas
+                rows = itertools.chain.from_iterable(self._iter_row_chunks(fieldslist))
+                dups = [key + (count,) for key, count in
+                        _duplicate_key_counts(rows, max_keys=max_keys or _DUPLICATE_MAX_KEYS)]
+                count = pandas.DataFrame(dups, columns=fieldslist + ['count'])
+                return count.sort_values(fieldslist, na_position='last', kind='stable').reset_index(drop=True)
+
             if output == 'df':
                 import pandas
-                rows = list(arcpy.da.SearchCursor(self.path, fieldslist))
-                df = pandas.DataFrame(rows, columns=fieldslist)
+                df = pandas.concat([pandas.DataFrame(rows, columns=fieldslist)
+                                    for rows in self._iter_row_chunks(fieldslist)] or
+                                   [pandas.DataFrame([], columns=fieldslist)], ignore_index=True)
                 # Keep null combinations in duplicate grouping across mixed field types.
                 count = df.groupby(fieldslist, dropna=False).size().reset_index(name='count')
                 return count[count['count'] > 1]
 
-            if len(fieldslist) != 1:
-                raise ValueError("field must be a single field when output='set'")
-
             dup_set = set()  # set to hold duplicate values
             value_set = set()  # set to hold unique values
-            with arcpy.da.SearchCursor(self.path, fieldslist[0]) as values:
-                for value in values:
-                    if value[0] in value_set:
-                        dup_set.add(value[0])
+            for rows in self._iter_row_chunks(fieldslist):
+                for value, in rows:
+                    if value in value_set:
+                        dup_set.add(value)
                     else:
-                        value_set.add(value[0])
+                        value_set.add(value)
             return dup_set
 
-        except arcpy.ExecuteError:
+        except _execute_error():
             arc_msg = arcpy.GetMessages(2)
             output_msg(arc_msg)
             raise RuntimeError(arc_msg)
@@ -282,55 +990,48 @@ class TableObj(object):
         import datetime
         import os
         import csv
-        # TODO convert to use csv
         start_time = datetime.datetime.today()
         start_date_string = start_time.strftime('%Y%m%d')
-        default_env = arcpy.env.workspace
-        fc = self.path
-        delimiter = ','
-        # nice to convert reported types to types accepted by add field tool
-        type_conversions = {"String": "TEXT", "Float": "FLOAT", "Double": "DOUBLE", "SmallInteger": "SHORT",
-                            "Integer": "LONG", "Date": "DATE", "Blob": "BLOB", "Raster": "RASTER", "GUID": "GUID",
-                            "TRUE": "True", "FALSE": "False", "Geometry": "GEOMETRY", "OID": "OID"}
 
         output_msg("Processing: {}".format(self.path))
 
         try:
-            fc_type = self.type
-
             report_dir = get_valid_output_path(path)
             if not report_dir:
                 raise ValueError("invalid output path")
             out_file_name = self.name + "_Field_Report " + start_date_string + ".csv"
             out_file_path = os.path.join(report_dir, out_file_name)
             output_msg("Report file: {0}".format(out_file_path))
-            with open(out_file_path, "w") as logFile:
-                #logFile.write("Type,{}\n".format(fc_type))
-                logFile.write(
-                    "FieldName,FieldType,FieldPrecision,FieldScale,FieldLength,FieldAlias,isNullable,Required,"
-                    "FieldDomain,DefaultValue,Editable,BaseName\n")
-
-                for field in self.field_dict:
-                    output_msg("Writing {}".format(field))
-                    logFile.write("{0},{1},{2},{3},{4},{5},{6},{7},{8},{9},{10},{11}\n".format(
-                        self.field_dict[field]['name'],
-                        type_conversions[self.field_dict[field]['type']],
-                        self.field_dict[field]['precision'],
-                        self.field_dict[field]['scale'],
-                        self.field_dict[field]['length'],
-                        self.field_dict[field]['aliasName'],
-                        self.field_dict[field]['isNullable'],
-                        self.field_dict[field]['required'],
-                        self.field_dict[field]['domain'],
-                        self.field_dict[field]['defaultValue'],
-                        self.field_dict[field]['editable'],
-                        self.field_dict[field]['baseName'])
-                    )
+            with open(out_file_path, "w", newline="") as logFile:
+                # quoted as needed, so aliases, defaults and domains may hold commas and quotes
+                writer = csv.writer(logFile)
+                writer.writerow(["FieldName", "FieldType", "FieldPrecision", "FieldScale", "FieldLength",
+                                 "FieldAlias", "isNullable", "Required", "FieldDomain", "DefaultValue",
+                                 "Editable", "BaseName"])
+
+                with buffered_messages(), Progressor("Writing fields", total=len(self.field_dict)) as progress:
+                    for field in self.field_dict:
+                        output_msg("Writing {}".format(field), progress=True)
+                        progress.step()
+                        writer.writerow([
+                            self.field_dict[field]['name'],
+                            _FIELD_TYPE_CONVERSIONS.get(self.field_dict[field]['type'], self.field_dict[field]['type']),
+                            self.field_dict[field]['precision'],
+                            self.field_dict[field]['scale'],
+                            self.field_dict[field]['length'],
+                            self.field_dict[field]['aliasName'],
+                            self.field_dict[field]['isNullable'],
+                            self.field_dict[field]['required'],
+                            self.field_dict[field]['domain'],
+                            self.field_dict[field]['defaultValue'],
+                            self.field_dict[field]['editable'],
+                            self.field_dict[field]['baseName']])
 
             return out_file_path
         except Exception as e:
-            output_msg("error: " + str(e.args[0]))
-            output_msg(arcpy.GetMessages())
+            output_msg("error: " + str(e))
+            if arcpy._available():
+                output_msg(arcpy.GetMessages())
 
     def compare_field_values_to_domain(self, field, gdb, domain_name):
         """compare field values with domain values
@@ -340,31 +1041,26 @@ class TableObj(object):
 
             :param field {string}
                 Field name
-            :param gdb {string}
-                Geodatabase path
+            :param gdb {string|GDBObj}
+                Geodatabase path, or a GDBObj to reuse its domain index across calls
             :param domain_name {string}
                 Domain name in gdb
         """
         from collections import namedtuple
+        from .gdb import _get_domain_index
         nt = namedtuple('Result', 'match unmatched')
         field_values = self.get_field_value_set(field)
         domain_values = []
         domain_type = None
         field_in_domain = []
         field_out_domain = []
-        domains = arcpy.da.ListDomains(gdb)
-        for domain in domains:
-            if domain.name == domain_name:
-                if domain.domainType == 'CodedValue':
-                    domain_type = 'CodedValue'
-                    coded_values = domain.codedValues
-                    for code, descr in coded_values.items():
-                        domain_values.append(code)
-                elif domain.domainType == 'Range':
-                    domain_type = 'Range'
-                    domain_values.append(domain.range[0])
-                    domain_values.append(domain.range[1])
-                break
+        domain = _get_domain_index(gdb).get(domain_name)
+        if domain is not None:
+            domain_type = domain['domainType']
+            if domain_type == 'CodedValue':
+                domain_values = domain['codedValues']
+            elif domain_type == 'Range':
+                domain_values = list(domain['range'])
         if domain_type == 'Range':
             # compare upper and lower bounds
             for fv in field_values:
@@ -385,6 +1081,58 @@ class TableObj(object):
 
         return nt(field_in_domain, field_out_domain)
 
+    def validate_domains(self, gdb=None, fields=None):
+        """Validate the values of all domain bound fields against their domains,
+        reading the table once and listing the geodatabase domains once.
+        NULL values are counted separately and not validated.
+
+            :param gdb {string|GDBObj}
+                Geodatabase path or GDBObj. Defaults to the geodatabase containing the table
+            :param fields {string|[string]}
+                Field names to validate. Defaults to all fields with a domain
+            :return dictionary keyed by field name of named tuples
+                (domain = domain name, match = {value: count} of values in the domain,
+                unmatched = {value: count} of values outside the domain, null_count)
+        """
+        import collections
+        from .gdb import _get_domain_index
+        from .gdb import _value_in_domain
+
+        if gdb is None:
+            gdb = self._workspace_path()
+        if fields is None:
+            fields = [f for f in self.fields if self.field_dict[f]['domain']]
+        fields = _normalize_to_sequence(fields)
+        domain_index = _get_domain_index(gdb)
+
+        value_counts = {f: collections.Counter() for f in fields}
+        if fields:
+            counters = [value_counts[f] for f in fields]
+            for rows in self._iter_row_chunks(fields):
+                for row in rows:
+                    for counter, value in zip(counters, row):
+                        counter[value] += 1
+
+        nt = collections.namedtuple('DomainValidation', 'domain match unmatched null_count')
+        results = {}
+        for field in fields:
+            domain_name = self.field_dict[field]['domain']
+            domain = domain_index.get(domain_name)
+            match, unmatched = {}, {}
+            for value, count in value_counts[field].items():
+                if value is None:
+                    continue
+                if domain is not None and _value_in_domain(value, domain):
+                    match[value] = count
+                else:
+                    unmatched[value] = count
+            results[field] = nt(domain_name, match, unmatched, value_counts[field][None])
+        return results
+
+    def _workspace_path(self):
+        """Return the geodatabase (workspace) containing the table"""
+        return self._data_backend.workspace(self.path)
+
     def pretty_print(self):
         """ pretty print a table's fields and their properties
         """
@@ -396,13 +1144,209 @@ class TableObj(object):
                 'required', 'scale', ]
         _print(atts)
 
-        for f in arcpy.ListFields(self.path):
-            _print(["{:>12}".format(getattr(f, i)) for i in atts])
+        for f in self.field_dict.values():
+            _print(["{:>12}".format(f[i]) for i in atts])
+
+
+
+
+def _numpy_batch(rows, fields, field_types):
+    """numpy masked structured array of row tuples, with None values masked"""
+    import numpy
+
+    count = len(rows)
+    dtype = numpy.dtype([(name, _BATCH_NUMPY_TYPES.get(field_type, "O"))
+                         for name, field_type in zip(fields, field_types)])
+    data = numpy.empty(count, dtype=dtype)
+    mask = numpy.zeros(count, dtype=[(name, bool) for name in fields])
+    for name, column in zip(fields, zip(*rows)):
+        nulls = numpy.fromiter((value is None for value in column), dtype=bool, count=count)
+        if dtype[name].kind == "O":
+            data[name] = numpy.fromiter(column, dtype=object, count=count)
+        elif nulls.any():
+            data[name] = [0 if value is None else value for value in column]
+        else:
+            data[name] = column
+        mask[name] = nulls
+    return numpy.ma.MaskedArray(data, mask=mask)
+
+
+def _arrow_batch(rows, fields, field_types):
+    """pyarrow RecordBatch of row tuples, with None values as nulls"""
+    import pyarrow
 
+    arrays = []
+    for field_type, column in zip(field_types, zip(*rows)):
+        arrow_type = _BATCH_ARROW_TYPES.get(field_type)
+        arrays.append(pyarrow.array(column, type=pyarrow.type_for_alias(arrow_type) if arrow_type else None))
+    return pyarrow.RecordBatch.from_arrays(arrays, names=list(fields))
+
+
+def _iter_partition_results(table_path, data_backend, workers, where_clauses, scan, args):
+    """Yield scan(table_path, data_backend, *args, where_clause) for each where clause, run in a process pool"""
+    from ._pool import _process_pool
+
+    with _process_pool(workers) as pool:
+        futures = [pool.submit(scan, table_path, data_backend, *args, where_clause)
+                   for where_clause in where_clauses]
+        for future in futures:
+            yield future.result()
+
+
+def _scan_partition_profiles(table_path, data_backend, profiles, where_clause):
+    """Profile the rows of an OID range partition, run in a worker process"""
+    return TableObj(table_path, data_backend)._scan_profiles(profiles, where_clause)
+
+
+def _count_partition_keys(table_path, data_backend, fields, where_clause):
+    """Count the value combinations of an OID range partition, run in a worker process"""
+    import collections
+
+    counts = collections.Counter()
+    for rows in TableObj(table_path, data_backend)._iter_row_chunks(fields, where_clause=where_clause):
+        counts.update(rows)
+    return counts
+
+
+# maximum number of characters Excel allows in a cell
+_EXCEL_CELL_LIMIT = 32767
+# ways of writing value lists longer than a cell, see _write_field_value_rows
+OVERFLOW_MODES = ("rows", "sheet", "truncate")
+
+
+def _split_values_text(values_text, limit=_EXCEL_CELL_LIMIT, sep=", "):
+    """Split a comma separated values text into pieces of at most limit characters,
+    breaking at a separator where possible.
+    """
+    pieces = []
+    while len(values_text) > limit:
+        cut = values_text.rfind(sep, 0, limit + len(sep))
+        if cut <= 0:
+            pieces.append(values_text[:limit])
+            values_text = values_text[limit:]
+        else:
+            pieces.append(values_text[:cut])
+            values_text = values_text[cut + len(sep):]
+    pieces.append(values_text)
+    return pieces
+
+
+def _write_field_value_rows(worksheet, rows, overflow="rows", cell_limit=_EXCEL_CELL_LIMIT):
+    """Write Field/Values header and (alias, values text) rows to a worksheet, from A1 for
+    normal worksheets (as cells, over any existing values) and appended to write only
+    (streaming) worksheets, which only support appending rows.
+    :param overflow: how values text longer than cell_limit is written
+        'rows' - split over continuation rows, with the field written as "<alias> (continued)"
+        'sheet' - split over the rows of a separate sheet for the field, referenced from the cell
+        'truncate' - cut to the cell limit, with the number of characters left off
+    :return the next empty row number (after the rows written)
+    """
+    if overflow not in OVERFLOW_MODES:
+        raise ValueError("overflow must be one of {}".format(", ".join(OVERFLOW_MODES)))
+    # write only worksheets serialise the rows as they are appended
+    with _timed("openpyxl worksheet writes"):
+        return _put_field_value_rows(worksheet, rows, overflow, cell_limit)
+
+
+def _put_field_value_rows(worksheet, rows, overflow, cell_limit):
+    """Write the rows of _write_field_value_rows"""
+    row = 1
+
+    def put(values):
+        nonlocal row
+        if hasattr(worksheet, "cell"):
+            for column, value in enumerate(values, 1):
+                worksheet.cell(row=row, column=column, value=value)
+        else:
+            worksheet.append(values)
+        row += 1
+
+    put(["Field", "Values"])
+    for alias, values_text in rows:
+        if values_text is None or len(values_text) <= cell_limit:
+            put([alias, values_text])
+        elif overflow == "truncate":
+            suffix = " ... (+{} characters)".format(len(values_text))
+            text = _split_values_text(values_text, cell_limit - len(suffix))[0]
+            put([alias, text + " ... (+{} characters)".format(len(values_text) - len(text))])
+        elif overflow == "rows":
+            pieces = _split_values_text(values_text, cell_limit)
+            put([alias, pieces[0]])
+            for piece in pieces[1:]:
+                put(["{} (continued)".format(alias), piece])
+        else:
+            overflow_sheet = worksheet.parent.create_sheet(
+                title=_safe_sheet_name("{}~{}".format(worksheet.title[:15], alias)))
+            overflow_sheet.append([alias])
+            for piece in _split_values_text(values_text, cell_limit):
+                overflow_sheet.append([piece])
+            put([alias, "{} characters, see sheet {}".format(len(values_text), overflow_sheet.title)])
+    return row
+
+
+def _safe_sheet_name(raw_name):
+    """Excel sheet name must be <= 31 chars and cannot contain: : \\ / ? * [ ]"""
+    safe_name = "".join(ch for ch in raw_name if ch not in r':\/?*[]')
+    safe_name = safe_name[:31] if len(safe_name) > 31 else safe_name
+    if not safe_name:
+        safe_name = "Sheet"
+    return safe_name
+
+
+def _profile_table_for_export(table_path, ignore_fields, approximate=False):
+    """Profile a single table for export_field_sets.
+    Module level so it can be sent to a worker process.
+    :return dictionary of table name, path and field value rows
+    """
+    tbl = TableObj(table_path)
+    return {"name": tbl.name, "path": tbl.path,
+            "rows": tbl.get_field_value_rows(ignore_fields, approximate=approximate)}
 
 
+def _export_error(error):
+    """Error entry used in place of a table profile when profiling fails"""
+    return {"name": None, "path": None, "rows": [("ERROR", str(error))], "error": str(error)}
 
-def export_field_sets(fc_list, out_xlsx, ignore_fields=None, use_lyr_alias=True):
+
+def _iter_export_profiles(fc_list, workers, profile_table, *args):
+    """Yield profile_table(table, *args) for each table in input order.
+    In parallel mode only a small window of tables is in progress at once,
+    and a table that fails is yielded as an error profile.
+    """
+    from ._pool import _process_pool
+
+    if not workers:
+        for lyr in fc_list:
+            yield profile_table(lyr, *args)
+        return
+
+    # layer objects cannot be sent to other processes, so resolve them here
+    with _process_pool(workers) as pool:
+        pending = deque()
+        for lyr in fc_list:
+            try:
+                lyr_path = _resolve_dataset_path(lyr, arg_name="fc_list")
+                pending.append(pool.submit(profile_table, lyr_path, *args))
+            except Exception as e:
+                pending.append(_export_error(e))
+            if len(pending) >= workers * 2:
+                yield _completed_export_profile(pending.popleft())
+        while pending:
+            yield _completed_export_profile(pending.popleft())
+
+
+def _completed_export_profile(future):
+    """Wait for an export profile future (or error profile) and return the profile"""
+    if isinstance(future, dict):
+        return future
+    try:
+        return future.result()
+    except Exception as e:
+        return _export_error(e)
+
+
+def export_field_sets(fc_list, out_xlsx, ignore_fields=None, use_lyr_alias=True, workers=None, approximate=False,
+                      streaming=False, overflow="rows"):
     """Export unique field values for each layer in a list to an Excel file with one sheet per layer.
     :param fc_list: list (or single input) of feature class/table paths, path-like values, or objects with .path/.catalogPath/.dataSource
     :param out_xlsx: path to output Excel file
@@ -410,41 +1354,183 @@ def export_field_sets(fc_list, out_xlsx, ignore_fields=None, use_lyr_alias=True)
     :param use_lyr_alias:
         If True, worksheet names prefer object name/alias (human-readable).
         If False, worksheet names use table path (traceable/debug-friendly).
+    :param workers:
+        Number of processes used to profile tables in parallel (-1 uses all cpus).
+        Default None profiles tables one after another.
+        The workbook is always written by the calling process, in input order.
+        In parallel mode a table that fails is written as a sheet with an ERROR row
+        instead of stopping the export.
+    :param approximate:
+        If True, write approximate distinct counts and most frequent values
+        instead of full value lists (fixed memory, for high cardinality fields).
+    :param streaming:
+        If True, use a write only workbook. Each sheet is streamed to disk as its
+        table finishes, so memory use does not grow with the number of layers.
+    :param overflow:
+        How value lists longer than an Excel cell (32,767 characters) are written:
+        'rows' (default) splits them over continuation rows, 'sheet' splits them over
+        the rows of a separate sheet per field, 'truncate' cuts them to fit the cell.
+    :return list of dictionaries (input, path, sheet, error) in input order
     """
     from openpyxl import Workbook
 
+    if overflow not in OVERFLOW_MODES:
+        raise ValueError("overflow must be one of {}".format(", ".join(OVERFLOW_MODES)))
     if ignore_fields is None:
         ignore_fields = ["objectid", "globalid"]
     ignore_fields = {v.lower() for v in ignore_fields}
 
     fc_list = _normalize_to_sequence(fc_list)
+    profiles = _iter_export_profiles(fc_list, _worker_count(workers), _profile_table_for_export,
+                                     ignore_fields, approximate)
 
-    wb = Workbook()
-    # Remove the default sheet that openpyxl creates
-    default_sheet = wb.active
-    wb.remove(default_sheet)
+    wb = Workbook(write_only=streaming)
+    if not streaming:
+        # Remove the default sheet that openpyxl creates
+        default_sheet = wb.active
+        wb.remove(default_sheet)
 
     # Loop through layers and create a sheet per layer
-    for lyr in fc_list:
-        tbl = TableObj(lyr)
-        alias = _input_display_name(lyr, default_name=tbl.name)
-        print(f'Processing name: {tbl.name}, alias: {alias}')
+    results = []
+    for lyr, profile in zip(fc_list, profiles):
+        alias = _input_display_name(lyr, default_name=profile["name"])
+        if profile.get("error"):
+            output_msg("Error processing {}: {}".format(alias, profile["error"]), severity=1)
+        else:
+            print(f'Processing name: {profile["name"]}, alias: {alias}')
 
-        # Excel sheet name must be <= 31 chars and cannot contain: : \ / ? * [ ]
         if use_lyr_alias:
             raw_name = alias
         else:
-            raw_name = str(tbl.path)
-        safe_name = "".join(ch for ch in raw_name if ch not in r':\/?*[]')
-        safe_name = safe_name[:31] if len(safe_name) > 31 else safe_name
-        if not safe_name:
-            safe_name = "Sheet"
-
-        ws = wb.create_sheet(title=safe_name)
-        tbl.export_fields_to_worksheet(ws, ignore_fields=ignore_fields)
+            raw_name = str(profile["path"] or alias)
+
+        ws = wb.create_sheet(title=_safe_sheet_name(raw_name))
+        _write_field_value_rows(ws, profile["rows"], overflow=overflow)
+        results.append({"input": alias, "path": profile["path"], "sheet": ws.title,
+                        "error": profile.get("error")})
     # Save workbook
-    wb.save(out_xlsx)
+    with _timed("openpyxl Workbook.save"):
+        wb.save(out_xlsx)
     print(f"\nExcel file written to: {out_xlsx}")
+    return results
+
+
+# columns of the profile files written by export_profiles_to_parquet, one row per field
+_PROFILE_COLUMNS = (("table", "string"), ("path", "string"), ("field", "string"), ("alias", "string"),
+                    ("type", "string"), ("count", "int64"), ("null_count", "int64"),
+                    ("distinct_count", "int64"), ("max_length", "int64"), ("max_value", "string"),
+                    ("values", "list<string>"))
+PROFILE_FORMATS = ("parquet", "arrow")
+
+
+def _profile_schema():
+    """pyarrow schema of the profile files"""
+    import pyarrow
+
+    types = {"string": pyarrow.string(), "int64": pyarrow.int64(), "list<string>": pyarrow.list_(pyarrow.string())}
+    return pyarrow.schema([(name, types[column_type]) for name, column_type in _PROFILE_COLUMNS])
+
+
+def _profile_table_for_columnar(table_path, ignore_fields):
+    """Profile a single table for export_profiles_to_parquet.
+    Module level so it can be sent to a worker process.
+    :return dictionary of table name, path and a list of field profile records
+    """
+    tbl = TableObj(table_path)
+    fields = [f for f in tbl._profile_fields(None, None) if f.lower() not in ignore_fields]
+    records = []
+    for field_name, field_profile in tbl.profile(fields).items():
+        values = sorted(str(v) for v in field_profile["values"] if v != "NULL")
+        max_value = field_profile["max_value"]
+        records.append({
+            "table": tbl.name, "path": tbl.path, "field": field_name,
+            "alias": tbl.field_dict.get(field_name, {}).get("aliasName") or field_name,
+            "type": field_profile["type"], "count": field_profile["count"],
+            "null_count": field_profile["null_count"], "distinct_count": len(values),
+            "max_length": field_profile["max_length"],
+            "max_value": str(max_value) if max_value is not None else None,
+            "values": values})
+    return {"name": tbl.name, "path": tbl.path, "records": records}
+
+
+def _write_profile_records(out_file, records, file_format, batch_size):
+    """Write field profile records to a parquet or arrow file, batch_size records per record batch"""
+    import pyarrow
+
+    schema = _profile_schema()
+    if file_format == "parquet":
+        import pyarrow.parquet
+        writer = pyarrow.parquet.ParquetWriter(out_file, schema)
+    else:
+        import pyarrow.ipc
+        writer = pyarrow.ipc.new_file(out_file, schema)
+    with writer:
+        for start in range(0, len(records), batch_size):
+            writer.write_batch(pyarrow.RecordBatch.from_pylist(records[start:start + batch_size], schema=schema))
+
+
+def export_profiles_to_parquet(fc_list, out_dir, ignore_fields=None, workers=None, file_format="parquet",
+                               batch_size=64):
+    """Export field profiles (distinct values, counts, nulls, max length) of each
+    table in a list to columnar files, partitioned by table:
+    <out_dir>/<table name>/<table name>.parquet (or .arrow), one row per field.
+    Tables are profiled and written one at a time, and each file is written in
+    record batches, so the export is never held in memory as a whole.
+    Query the output with pyarrow, pandas or DuckDB, eg
+    duckdb.sql("SELECT * FROM read_parquet('<out_dir>/*/*.parquet')")
+
+    :param fc_list: list (or single input) of feature class/table paths, path-like values,
+        or objects with .path/.catalogPath/.dataSource
+    :param out_dir: output folder, created if it does not exist
+    :param ignore_fields: list of fields to ignore (default ['objectid', 'globalid'])
+    :param workers: number of processes used to profile tables in parallel (-1 uses all cpus),
+        see export_field_sets
+    :param file_format: 'parquet' or 'arrow' (Arrow IPC file)
+    :param batch_size: number of fields per record batch
+    :return list of dictionaries (input, path, file, error) in input order
+
+    Columns: table, path, field, alias, type, count, null_count, distinct_count
+    (excluding NULL), max_length, max_value (as text), values (sorted list of text values, excluding NULL)
+    """
+    if file_format not in PROFILE_FORMATS:
+        raise ValueError("file_format must be one of {}".format(", ".join(PROFILE_FORMATS)))
+    if ignore_fields is None:
+        ignore_fields = ["objectid", "globalid"]
+    ignore_fields = {v.lower() for v in ignore_fields}
+    os.makedirs(out_dir, exist_ok=True)
+
+    fc_list = _normalize_to_sequence(fc_list)
+    profiles = _iter_export_profiles(fc_list, _worker_count(workers), _profile_table_for_columnar, ignore_fields)
+
+    results = []
+    partitions = set()
+    for lyr, profile in zip(fc_list, profiles):
+        alias = _input_display_name(lyr, default_name=profile["name"])
+        if profile.get("error"):
+            output_msg("Error processing {}: {}".format(alias, profile["error"]), severity=1)
+            results.append({"input": alias, "path": profile["path"], "file": None, "error": profile["error"]})
+            continue
+        output_msg("Writing profile of {}".format(profile["path"]))
+        # tables with the same name (eg from different geodatabases) get a numbered partition
+        partition = _safe_file_name(profile["name"])
+        number = 1
+        while partition.lower() in partitions:
+            number += 1
+            partition = "{}_{}".format(_safe_file_name(profile["name"]), number)
+        partitions.add(partition.lower())
+        partition_dir = os.path.join(out_dir, partition)
+        os.makedirs(partition_dir, exist_ok=True)
+        out_file = os.path.join(partition_dir, "{}.{}".format(partition, file_format))
+        with _timed("pyarrow write profile"):
+            _write_profile_records(out_file, profile["records"], file_format, batch_size)
+        results.append({"input": alias, "path": profile["path"], "file": out_file, "error": None})
+    return results
+
+
+def _safe_file_name(raw_name):
+    """File and folder name with characters invalid on Windows replaced"""
+    safe_name = "".join("_" if ch in '<>:"/\\|?*' else ch for ch in str(raw_name)).strip()
+    return safe_name or "table"
 
 
 def compare_schema(fc1, fc2):
@@ -494,16 +1580,162 @@ def compare_schema(fc1, fc2):
     return result_arr
 
 
-def import_schema_to_fc(csv_file, fc_name):
-    """convert csv schema from report_fields_to_csv_schema
-    to a featureclass"""
-    # assume headers as per output from export_schema_to_csv
-    # get fc type from csv file line 1
-    # load the csv file from line 2 for field info
-    # get field list
-    # ignore OBJECTID, SHAPE
-    fields_to_ignore =["OBJECTID", "GLOBALID","FID", "SHAPE", "SHAPE_AREA", "SHAPE.AREA", "SHAPE.STAREA()", "SHAPE_LENGTH", "SHAPE.LEN", "SHAPE.STLENGTH()"]
-    # create fc from fc_name
-    # add fields from field list
-    # arcpy.AddField_management(in_table, field_name, field_type, {field_precision}, {field_scale}, {field_length}, {field_alias}, {field_is_nullable}, {field_is_required}, {field_domain})
-    return None
+# system maintained fields which are not recreated by import_schema_to_fc
+_SCHEMA_IMPORT_IGNORE_FIELDS = ("OBJECTID", "GLOBALID", "FID", "SHAPE", "SHAPE_AREA", "SHAPE.AREA", "SHAPE.STAREA()",
+                                "SHAPE_LENGTH", "SHAPE.LEN", "SHAPE.STLENGTH()")
+_SCHEMA_IMPORT_IGNORE_TYPES = ("OID", "GEOMETRY", "GLOBALID")
+
+
+def _schema_rows_from_csv(csv_file):
+    """Field rows (dictionaries keyed by the export_schema_to_csv headers) from a schema csv"""
+    import csv
+
+    with open(csv_file, newline="") as schema_file:
+        return list(csv.DictReader(schema_file))
+
+
+def _schema_rows_from_table(table):
+    """Field rows in the export_schema_to_csv layout from a TableObj field_dict"""
+    rows = []
+    for field in table.field_dict.values():
+        rows.append({
+            "FieldName": field["name"],
+            "FieldType": _FIELD_TYPE_CONVERSIONS.get(field["type"], field["type"]),
+            "FieldPrecision": field["precision"],
+            "FieldScale": field["scale"],
+            "FieldLength": field["length"],
+            "FieldAlias": field["aliasName"],
+            "isNullable": field["isNullable"],
+            "Required": field["required"],
+            "FieldDomain": field["domain"],
+            "DefaultValue": field["defaultValue"],
+        })
+    return rows
+
+
+def _schema_flag(value, default):
+    """Boolean of a schema row value, True/False from a field_dict or 'True'/'False' from a csv"""
+    if value in (None, ""):
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(value)
+
+
+def _schema_number(value):
+    """Integer of a schema row value, 0 if it is empty"""
+    return int(value) if value not in (None, "") else 0
+
+
+def _schema_field_descriptions(rows, domain_index):
+    """Return (AddFields field descriptions, field options, has geometry field) for schema rows.
+    field options holds (precision, scale, nullable, required) keyed by field name for the fields
+    which AddFields cannot create: a precision or scale, not nullable or required.
+    Domains not found in domain_index are left off with a warning.
+    """
+    descriptions = []
+    options = {}
+    has_geometry = False
+    for row in rows:
+        name = (row.get("FieldName") or "").strip()
+        field_type = (row.get("FieldType") or "").strip().upper()
+        if field_type == "GEOMETRY":
+            has_geometry = True
+        if not name or name.upper() in _SCHEMA_IMPORT_IGNORE_FIELDS or field_type in _SCHEMA_IMPORT_IGNORE_TYPES:
+            continue
+        length = row.get("FieldLength") if field_type == "TEXT" else None
+        default = row.get("DefaultValue")
+        if default in (None, "", "None"):
+            default = ""
+        domain = row.get("FieldDomain") or ""
+        if domain and domain not in domain_index:
+            output_msg("Domain {} not found in output workspace, not assigned to {}".format(domain, name), severity=1)
+            domain = ""
+        # omitted AddFields parameters are empty strings
+        descriptions.append([name, field_type, row.get("FieldAlias") or name,
+                             int(length) if length not in (None, "") else "", default, domain])
+        field_options = (_schema_number(row.get("FieldPrecision")), _schema_number(row.get("FieldScale")),
+                         _schema_flag(row.get("isNullable"), True), _schema_flag(row.get("Required"), False))
+        if field_options != (0, 0, True, False):
+            options[name] = field_options
+    return descriptions, options, has_geometry
+
+
+def import_schema_to_fc(csv_file, fc_name, geometry_type=None, spatial_reference=None, schema_from_table=None):
+    """Create a featureclass or table from a csv schema written by
+    TableObj.export_schema_to_csv, or from the schema of an existing table.
+    All fields (with their domains) are added with a single AddFields call,
+    rather than one AddField call per field.
+    Fields with a precision or scale, or which are not nullable or are required,
+    are added with AddField (and AssignDefaultToField for their default value).
+    System fields (OBJECTID, GLOBALID, SHAPE_AREA etc.) are not recreated.
+
+    :param csv_file {String}:
+        Path to the schema csv, may be None when schema_from_table is used
+    :param fc_name {String}:
+        Full path of the featureclass or table to create
+    :param geometry_type {String}:
+        POINT, MULTIPOINT, POLYGON, POLYLINE or MULTIPATCH. Required for a csv
+        schema with a geometry field, defaults to the shape type of schema_from_table
+    :param spatial_reference {SpatialReference|String}:
+        Spatial reference of a new featureclass, defaults to that of schema_from_table
+    :param schema_from_table {String|pathlike|TableObj|layer object}:
+        Copy the schema of this table instead of reading csv_file
+    :return path of the created featureclass or table
+
+    Raises:
+        ValueError: no schema input, invalid output workspace or missing geometry_type
+        RuntimeError: the output could not be created
+    """
+    from .gdb import build_domain_index
+
+    if schema_from_table is not None:
+        source = schema_from_table if isinstance(schema_from_table, TableObj) else TableObj(schema_from_table)
+        rows = _schema_rows_from_table(source)
+        if hasattr(source.describe_obj, "shapeType"):
+            geometry_type = geometry_type or source.describe_obj.shapeType
+            if spatial_reference is None:
+                spatial_reference = getattr(source.describe_obj, "spatialReference", None)
+    elif csv_file:
+        rows = _schema_rows_from_csv(csv_file)
+    else:
+        raise ValueError("csv_file or schema_from_table is required")
+
+    out_path, out_name = os.path.split(os.fspath(fc_name))
+    if not out_path or not arcpy.Exists(out_path):
+        raise ValueError("invalid output workspace: {}".format(out_path))
+    # domains belong to the geodatabase, which is the parent of a feature dataset
+    workspace = out_path
+    if getattr(arcpy.Describe(out_path), "dataType", None) == "FeatureDataset":
+        workspace = os.path.dirname(out_path)
+    field_descriptions, field_options, has_geometry = _schema_field_descriptions(rows, build_domain_index(workspace))
+    if has_geometry and not geometry_type:
+        raise ValueError("geometry_type is required for a schema with a geometry field")
+
+    try:
+        if geometry_type:
+            output_msg("Creating featureclass {}".format(fc_name))
+            result = arcpy.management.CreateFeatureclass(out_path, out_name, geometry_type.upper(),
+                                                         spatial_reference=spatial_reference)
+        else:
+            output_msg("Creating table {}".format(fc_name))
+            result = arcpy.management.CreateTable(out_path, out_name)
+        out_fc = result[0] if result else os.path.join(out_path, out_name)
+        added_fields = [d for d in field_descriptions if d[0] not in field_options]
+        if added_fields:
+            output_msg("Adding {} fields".format(len(added_fields)))
+            arcpy.management.AddFields(out_fc, added_fields)
+        for name, field_type, alias, length, default, domain in field_descriptions:
+            if name not in field_options:
+                continue
+            precision, scale, nullable, required = field_options[name]
+            output_msg("Adding field {}".format(name))
+            arcpy.management.AddField(out_fc, name, field_type, precision or "", scale or "", length, alias,
+                                      "NULLABLE" if nullable else "NON_NULLABLE",
+                                      "REQUIRED" if required else "NON_REQUIRED", domain)
+            if default != "":
+                arcpy.management.AssignDefaultToField(out_fc, name, default)
+    except _execute_error() as e:
+        output_msg(arcpy.GetMessages(2), severity=2)
+        raise RuntimeError("could not create {}: {}".format(fc_name, e))
+    return out_fc
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Import time benchmark for arc_utils.
+
+Runs each import scenario in a fresh interpreter with the fake arcpy module on
+the path (which sleeps on import, like the real arcpy), and fails if a scenario
+is slower than --max-seconds or imports arcpy when it should not.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--max-seconds 0.5] [--output import.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+FAKE_ARCPY_DIR = os.path.join(BENCHMARK_DIR, "fake_arcpy")
+
+# name, code to run, whether arcpy may be imported
+SCENARIOS = [
+    ("import arc_utils", "import arc_utils", False),
+    ("import submodules", "import arc_utils.table, arc_utils.gdb, arc_utils.aprx, arc_utils.output", False),
+    ("get_valid_output_path", "import arc_utils, tempfile; arc_utils.output.get_valid_output_path(tempfile.gettempdir())", False),
+]
+
+_CHECK = "\nimport sys\nsys.exit(3 if 'arcpy' in sys.modules and not {allow} else 0)\n"
+
+
+def run_scenario(code, allow_arcpy, repeat):
+    """Return a list of wall clock seconds for running code in a new interpreter"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([FAKE_ARCPY_DIR, REPO_DIR, env.get("PYTHONPATH", "")])
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code + _CHECK.format(allow=allow_arcpy)], env=env)
+        timings.append(time.perf_counter() - start)
+        if result.returncode == 3:
+            raise RuntimeError("arcpy was imported by: {}".format(code))
+        if result.returncode != 0:
+            raise RuntimeError("scenario failed: {}".format(code))
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=0.5)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    baseline = statistics.median(run_scenario("pass", True, args.repeat))
+    results = {"python": sys.version.split()[0], "interpreter_startup": baseline, "scenarios": {}}
+    failed = False
+    for name, code, allow_arcpy in SCENARIOS:
+        median = statistics.median(run_scenario(code, allow_arcpy, args.repeat))
+        import_time = max(0.0, median - baseline)
+        results["scenarios"][name] = {"seconds": import_time}
+        status = "ok" if import_time <= args.max_seconds else "SLOW"
+        failed = failed or status != "ok"
+        print("{:<25} {:8.3f}s {}".format(name, import_time, status))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Throughput and memory benchmarks for TableObj and geodatabase hot paths.
+
+Runs against the fake arcpy module in benchmarks/fake_arcpy with generated
+tables, so it needs no ArcGIS licence. For each method and table size the
+throughput (rows/s) and peak traced memory are recorded, and written as JSON
+so results from different versions can be compared.
+
+Usage:
+    python benchmarks/bench_table.py --sizes 10000,1000000,10000000 --output results.json
+    python benchmarks/bench_table.py --sizes 10000 --compare results.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, "fake_arcpy"))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+os.environ.setdefault("ARC_UTILS_FAKE_ARCPY_IMPORT_DELAY", "0")
+
+import arcpy  # noqa: E402  (fake arcpy from benchmarks/fake_arcpy)
+import arc_utils  # noqa: E402
+from arc_utils import gdb  # noqa: E402
+from arc_utils import table  # noqa: E402
+
+GDB_PATH = os.path.join(tempfile.gettempdir(), "arc_utils_bench.gdb")
+
+DOMAINS = {
+    "status_coded": {"domainType": "CodedValue", "type": "SmallInteger",
+                     "codedValues": {0: "zero", 1: "one", 2: "two", 3: "three"}},
+}
+
+
+def _fields(rows, cardinality):
+    """Generated fields: low, configurable and high cardinality, plus nulls"""
+    return [
+        {"name": "CODE", "type": "String", "length": 10, "cardinality": 50},
+        {"name": "NAME", "type": "String", "length": 20, "cardinality": max(1, rows // 2), "null_ratio": 0.01},
+        {"name": "VALUE", "type": "Integer", "cardinality": cardinality, "null_ratio": 0.05},
+        {"name": "AMOUNT", "type": "Double", "cardinality": cardinality},
+        {"name": "STATUS", "type": "SmallInteger", "cardinality": 5, "domain": "status_coded"},
+    ]
+
+
+def build_dataset(rows, cardinality, catalog_tables):
+    """Register the benchmark geodatabase and return (table path, copy path)"""
+    arcpy.clear_registry()
+    arcpy.register_workspace(GDB_PATH, domains=DOMAINS)
+    fields = _fields(rows, cardinality)
+    path = arcpy.register_table(os.path.join(GDB_PATH, "bench_fc"), rows, fields, shape_type="Point")
+    copy = arcpy.register_table(os.path.join(GDB_PATH, "bench_fc_copy"), rows, fields, shape_type="Point")
+    # small tables to exercise catalog walking and reporting
+    for i in range(catalog_tables):
+        arcpy.register_table(os.path.join(GDB_PATH, "dataset{}".format(i % 5), "catalog_fc{}".format(i)),
+                             10, fields, shape_type="Polygon")
+    return path, copy
+
+
+def benchmarks(path, copy, tmp_dir):
+    """(name, rows scanned per run multiplier, callable) for each benchmarked method"""
+    tbl = table.TableObj(path)
+    return [
+        ("get_field_value_set", 1, lambda: tbl.get_field_value_set("VALUE")),
+        ("get_field_value_set_numpy", 1, lambda: tbl.get_field_value_set("VALUE", backend="numpy")),
+        ("get_field_value_set_parallel", 1, lambda: tbl.get_field_value_set("VALUE", parallel=4)),
+        ("get_max_field_value", 1, lambda: tbl.get_max_field_value("NAME")),
+        ("profile", 1, lambda: tbl.profile()),
+        ("find_duplicate_field_values_set", 1, lambda: tbl.find_duplicate_field_values("NAME")),
+        ("find_duplicate_field_values_df", 1,
+         lambda: tbl.find_duplicate_field_values(["CODE", "STATUS"], output="df")),
+        ("profile_parallel", 1, lambda: tbl.profile(parallel=4)),
+        ("find_duplicate_field_values_streaming", 1,
+         lambda: tbl.find_duplicate_field_values(["CODE", "STATUS"], output="df", streaming=True)),
+        ("validate_domains", 1, lambda: tbl.validate_domains()),
+        ("export_field_sets", 2,
+         lambda: table.export_field_sets([path, copy], os.path.join(tmp_dir, "field_sets.xlsx"))),
+        ("export_field_sets_streaming", 2,
+         lambda: table.export_field_sets([path, copy], os.path.join(tmp_dir, "field_sets_streaming.xlsx"),
+                                         streaming=True)),
+        ("export_profiles_to_parquet", 2,
+         lambda: table.export_profiles_to_parquet([path, copy], os.path.join(tmp_dir, "profiles"))),
+        ("compare_schema", 0, lambda: table.compare_schema(path, copy)),
+        ("report_all_fc_as_text", 0,
+         lambda: gdb.report_all_fc_as_text(GDB_PATH, os.path.join(tmp_dir, "report.txt"))),
+    ]
+
+
+def _quiet(func):
+    """Run func with stdout discarded (arc_utils prints progress messages)"""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        try:
+            return func()
+        finally:
+            sys.stdout = stdout
+
+
+def measure(func, memory=True):
+    """Return (seconds, peak traced bytes or None) for one call of func"""
+    gc.collect()
+    start = time.perf_counter()
+    _quiet(func)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            _quiet(func)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
+
+
+def run(sizes, cardinality, catalog_tables, only=None, memory=True):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in sizes:
+            path, copy = build_dataset(rows, cardinality, catalog_tables)
+            for name, multiplier, func in benchmarks(path, copy, tmp_dir):
+                if only and name not in only:
+                    continue
+                try:
+                    seconds, peak = measure(func, memory=memory)
+                except ImportError as e:
+                    print("{:<40} skipped ({})".format(name, e))
+                    continue
+                rows_read = rows * multiplier
+                result = {"method": name, "rows": rows, "seconds": seconds,
+                          "rows_per_second": rows_read / seconds if rows_read and seconds else None,
+                          "peak_memory_bytes": peak}
+                results.append(result)
+                print("{:<40} {:>10} rows {:>9.3f}s {:>14} rows/s {:>10} peak".format(
+                    name, rows, seconds,
+                    "{:,.0f}".format(result["rows_per_second"]) if result["rows_per_second"] else "-",
+                    "{:,.1f}MB".format(peak / 1e6) if peak is not None else "-"))
+    return results
+
+
+def compare(results, baseline_path):
+    """Print the ratio of each result to a previous JSON result file"""
+    with open(baseline_path) as baseline_file:
+        baseline = {(r["method"], r["rows"]): r for r in json.load(baseline_file)["results"]}
+    print("\ncompared to {}".format(baseline_path))
+    for result in results:
+        previous = baseline.get((result["method"], result["rows"]))
+        if not previous:
+            continue
+        line = "{:<40} {:>10} rows  time x{:.2f}".format(
+            result["method"], result["rows"], result["seconds"] / previous["seconds"])
+        if result["peak_memory_bytes"] and previous.get("peak_memory_bytes"):
+            line += "  memory x{:.2f}".format(result["peak_memory_bytes"] / previous["peak_memory_bytes"])
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,1000000,10000000",
+                        help="comma separated table row counts")
+    parser.add_argument("--cardinality", type=int, default=1000,
+                        help="distinct values in the VALUE and AMOUNT fields")
+    parser.add_argument("--catalog-tables", type=int, default=50,
+                        help="extra featureclasses in the geodatabase for catalog benchmarks")
+    parser.add_argument("--only", help="comma separated benchmark names to run")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced memory run")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON results file to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    only = set(args.only.split(",")) if args.only else None
+    results = run(sizes, args.cardinality, args.catalog_tables, only=only, memory=not args.no_memory)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"arc_utils_version": arc_utils.__version__, "python": platform.python_version(),
+                       "platform": platform.platform(), "results": results}, output, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""Stand-in arcpy module for running arc_utils benchmarks without ArcGIS Pro.
+
+Provides enough of the arcpy API (Describe, Exists, ListFields, da.SearchCursor,
+da.TableToNumPyArray, da.ListDomains, da.Walk ...) for arc_utils to run against
+generated tables. Rows are computed from the OID when read, so tables of any
+size use no memory. Tables are registered with register_table(), and the
+registry is copied to child processes through an environment variable.
+
+Importing the real arcpy takes several seconds, set ARC_UTILS_FAKE_ARCPY_IMPORT_DELAY
+(seconds, default 2) to simulate that cost.
+"""
+import json
+import os
+import re
+import time
+import types
+
+time.sleep(float(os.environ.get("ARC_UTILS_FAKE_ARCPY_IMPORT_DELAY", "2")))
+
+_REGISTRY_ENV = "ARC_UTILS_FAKE_ARCPY_REGISTRY"
+
+# catalog path: table spec, workspace path: workspace spec
+_tables = {}
+_workspaces = {}
+
+
+class ExecuteError(Exception):
+    pass
+
+
+class _Env(object):
+    workspace = None
+    overwriteOutput = False
+
+
+env = _Env()
+
+
+def AddMessage(message):
+    pass
+
+
+AddWarning = AddError = AddMessage
+
+
+def GetMessages(severity=0):
+    return ""
+
+
+def SetProgressor(*args, **kwargs):
+    pass
+
+
+def SetProgressorLabel(*args, **kwargs):
+    pass
+
+
+def SetProgressorPosition(*args, **kwargs):
+    pass
+
+
+def ResetProgressor():
+    pass
+
+
+def _key(path):
+    return os.path.normcase(os.path.abspath(os.fspath(path)))
+
+
+def _save_registry():
+    os.environ[_REGISTRY_ENV] = json.dumps({"tables": _tables, "workspaces": _workspaces})
+
+
+def _load_registry():
+    registry = os.environ.get(_REGISTRY_ENV)
+    if registry:
+        registry = json.loads(registry)
+        _tables.update(registry["tables"])
+        _workspaces.update(registry["workspaces"])
+
+
+def register_workspace(path, domains=None):
+    """Register a geodatabase path with optional domains
+    {name: {'domainType': 'CodedValue'|'Range', 'type': field type, 'codedValues': {}, 'range': [min, max]}}
+    """
+    _workspaces[_key(path)] = {"path": os.path.abspath(path), "domains": domains or {}}
+    _save_registry()
+    return os.path.abspath(path)
+
+
+def register_table(path, rows, fields, shape_type=None):
+    """Register a generated table.
+    :param path: catalog path, the parent folder (or feature dataset) must be a registered workspace
+    :param rows: number of rows (OIDs 1 to rows)
+    :param fields: list of dictionaries with name, type and optionally cardinality (distinct values),
+        null_ratio (0-1), length, domain and required
+    :param shape_type: geometry type for a featureclass, None for a table
+    """
+    _tables[_key(path)] = {"path": os.path.abspath(path), "rows": rows, "fields": fields,
+                           "shape_type": shape_type}
+    _save_registry()
+    return os.path.abspath(path)
+
+
+def clear_registry():
+    _tables.clear()
+    _workspaces.clear()
+    _save_registry()
+
+
+def _table(path):
+    try:
+        return _tables[_key(path)]
+    except KeyError:
+        raise IOError("{} does not exist".format(path))
+
+
+def _all_fields(table):
+    fields = [{"name": "OBJECTID", "type": "OID", "required": True}]
+    if table["shape_type"]:
+        fields.append({"name": "Shape", "type": "Geometry", "required": True})
+    return fields + table["fields"]
+
+
+def _value(field, oid, position):
+    """Deterministic value of a field for a row"""
+    field_type = field["type"]
+    if field_type == "OID":
+        return oid
+    if field_type == "Geometry":
+        return None
+    null_ratio = field.get("null_ratio", 0)
+    if null_ratio and (oid * 7919 + position) % 1000 < null_ratio * 1000:
+        return None
+    cardinality = field.get("cardinality") or 1
+    code = (oid * 2654435761 + position * 40503) % cardinality
+    if field_type == "String":
+        return "v{:07d}".format(code)[:field.get("length", 255)]
+    if field_type in ("Single", "Double"):
+        return code / 4.0
+    return code
+
+
+class Field(object):
+    def __init__(self, spec):
+        self.name = spec["name"]
+        self.baseName = spec["name"]
+        self.aliasName = spec.get("alias", spec["name"])
+        self.type = spec["type"]
+        self.length = spec.get("length", 255 if spec["type"] == "String" else 4)
+        self.required = spec.get("required", False)
+        self.domain = spec.get("domain", "")
+        self.defaultValue = None
+        self.precision = 0
+        self.scale = 0
+        self.isNullable = not self.required
+        self.editable = spec["type"] not in ("OID",)
+
+
+def ListFields(dataset, wild_card=None, field_type=None):
+    return [Field(spec) for spec in _all_fields(_table(dataset))]
+
+
+def Exists(dataset):
+    key = _key(dataset)
+    return key in _tables or key in _workspaces
+
+
+def Describe(value, data_type=None):
+    key = _key(value)
+    if key in _tables:
+        table = _tables[key]
+        desc = types.SimpleNamespace(
+            name=os.path.basename(table["path"]), baseName=os.path.basename(table["path"]),
+            catalogPath=table["path"], path=os.path.dirname(table["path"]),
+            Path=os.path.dirname(table["path"]), hasOID=True, OIDFieldName="OBJECTID",
+            dataType="FeatureClass" if table["shape_type"] else "Table",
+            fields=ListFields(value))
+        if table["shape_type"]:
+            desc.shapeType = table["shape_type"]
+        return desc
+    if key in _workspaces:
+        path = _workspaces[key]["path"]
+        return types.SimpleNamespace(
+            name=os.path.basename(path), baseName=os.path.splitext(os.path.basename(path))[0],
+            catalogPath=path, path=os.path.dirname(path), Path=os.path.dirname(path),
+            dataType="Workspace", workspaceType="LocalDatabase",
+            workspaceFactoryProgID="esriDataSourcesGDB.FileGDBWorkspaceFactory")
+    raise IOError("{} does not exist".format(value))
+
+
+def AddFieldDelimiters(datasource, field):
+    return field
+
+
+def ValidateTableName(name, workspace=None):
+    return re.sub(r"\W", "_", name)
+
+
+_OID_RANGE = re.compile(r"^\s*OBJECTID\s*(>=|>)\s*(\d+)\s+AND\s+OBJECTID\s*(<=|<)\s*(\d+)\s*$", re.I)
+
+
+def _oid_range(table, where_clause):
+    """Return the OID range selected by a where clause (only OID ranges are supported)"""
+    low, high = 1, table["rows"]
+    if where_clause:
+        match = _OID_RANGE.match(where_clause)
+        if not match:
+            raise ExecuteError("unsupported where clause: {}".format(where_clause))
+        low = max(low, int(match.group(2)) + (1 if match.group(1) == ">" else 0))
+        high = min(high, int(match.group(4)) - (1 if match.group(3) == "<" else 0))
+    return low, high
+
+
+def _field_specs(table, field_names):
+    all_fields = {f["name"].lower(): (i, f) for i, f in enumerate(_all_fields(table))}
+    specs = []
+    for name in field_names:
+        lookup = "objectid" if name.upper() == "OID@" else name.lower()
+        if lookup not in all_fields:
+            raise RuntimeError("Cannot find field '{}'".format(name))
+        specs.append(all_fields[lookup])
+    return specs
+
+
+class _DataAccess(object):
+    """arcpy.da"""
+
+    class SearchCursor(object):
+        def __init__(self, in_table, field_names, where_clause=None, spatial_reference=None,
+                     explode_to_points=False, sql_clause=(None, None), **kwargs):
+            if isinstance(field_names, str):
+                field_names = [field_names]
+            self.fields = tuple(field_names)
+            self._table = _table(in_table)
+            self._specs = _field_specs(self._table, field_names)
+            self._low, self._high = _oid_range(self._table, where_clause)
+            # rows are in OID order, ORDER BY <OID field> DESC reverses them
+            postfix = (sql_clause or (None, None))[1] or ""
+            self._descending = bool(re.match(r"^\s*ORDER BY\s+OBJECTID\s+DESC\s*$", postfix, re.I))
+
+        def __iter__(self):
+            specs = self._specs
+            oids = range(self._low, self._high + 1)
+            for oid in reversed(oids) if self._descending else oids:
+                yield tuple(_value(spec, oid, position) for position, spec in specs)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def reset(self):
+            pass
+
+    @staticmethod
+    def TableToNumPyArray(in_table, field_names, where_clause=None, skip_nulls=False, null_value=None, **kwargs):
+        import numpy
+
+        table = _table(in_table)
+        if isinstance(field_names, str):
+            field_names = [field_names]
+        specs = _field_specs(table, field_names)
+        dtypes = {"OID": "<i4", "SmallInteger": "<i2", "Integer": "<i4", "BigInteger": "<i8",
+                  "Single": "<f4", "Double": "<f8"}
+        dtype = [(name, dtypes.get(spec["type"], "<U{}".format(spec.get("length", 255))))
+                 for name, (position, spec) in zip(field_names, specs)]
+        null_value = null_value or {}
+        rows = []
+        for row in _DataAccess.SearchCursor(in_table, field_names, where_clause=where_clause):
+            if None in row:
+                if skip_nulls:
+                    continue
+                row = tuple(null_value[name] if value is None else value for name, value in zip(field_names, row))
+            rows.append(row)
+        return numpy.array(rows, dtype=dtype)
+
+    @staticmethod
+    def ListDomains(workspace):
+        domains = []
+        for name, spec in _workspaces[_key(workspace)]["domains"].items():
+            domains.append(types.SimpleNamespace(
+                name=name, domainType=spec["domainType"], type=spec.get("type", "String"),
+                codedValues=spec.get("codedValues", {}), range=spec.get("range"), description=name))
+        return domains
+
+    @staticmethod
+    def Walk(top, topdown=True, onerror=None, followlinks=False, datatype=None, type=None):
+        top = os.path.abspath(top)
+        datatypes = [datatype] if isinstance(datatype, str) else (datatype or ["FeatureClass", "Table"])
+        folders = {}
+        for table in _tables.values():
+            table_type = "FeatureClass" if table["shape_type"] else "Table"
+            parent = os.path.dirname(table["path"])
+            if table_type in datatypes and (parent == top or os.path.dirname(parent) == top):
+                folders.setdefault(parent, []).append(os.path.basename(table["path"]))
+        datasets = sorted(os.path.basename(folder) for folder in folders if folder != top)
+        yield top, datasets, sorted(folders.get(top, []))
+        for dataset in datasets:
+            yield os.path.join(top, dataset), [], sorted(folders[os.path.join(top, dataset)])
+
+
+da = _DataAccess()
+
+_load_registry()
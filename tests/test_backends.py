@@ -0,0 +1,87 @@
+from arc_utils import backends
+from arc_utils import gdb
+from arc_utils import table
+import os
+import pytest
+
+_DOMAINS = {
+    "ftext_coded": {"name": "ftext_coded", "domainType": "CodedValue", "type": "String",
+                    "codedValues": {"val1": "val1", "val2": "val2", "val3": "val3"}, "range": None},
+    "fint_range": {"name": "fint_range", "domainType": "Range", "type": "SmallInteger",
+                   "codedValues": {}, "range": (1, 12)}}
+
+
+@pytest.fixture()
+def memory_gdb(tmp_path):
+    # the test featureclass of conftest held in memory, the geodatabase path does not exist
+    backend = backends.MemoryBackend(str(tmp_path / "memory.gdb"), domains=_DOMAINS)
+    records = (("val1", None), ("val1", 4), ("val1", 4), ("val2", 7), ("val02", 7), ("val1", 10),
+               ("val2", 5), ("val1", 10), ("val2", 5), ("val1", None), (None, 5))
+    backend.add_table("test_fc", [("OBJECTID", "OID"),
+                                  {"name": "ftext", "type": "String", "domain": "ftext_coded"},
+                                  {"name": "fint", "type": "SmallInteger", "domain": "fint_range"}],
+                      [(i + 1, key, val) for i, (key, val) in enumerate(records)], dataset="ds", shape_type="Point")
+    backend.add_table("test_table", [("OBJECTID", "OID"), ("fdouble", "Double")], [(1, 0.5), (2, None)])
+    backends.register_data_backend(backend.path, backend)
+    yield backend
+    backends.register_data_backend(backend.path, None)
+
+
+def test_get_data_backend(memory_gdb):
+    assert backends.get_data_backend(os.path.join(memory_gdb.path, "ds", "test_fc")) is memory_gdb
+    assert backends.get_data_backend(memory_gdb.path) is memory_gdb
+    assert isinstance(backends.get_data_backend(memory_gdb.path + "2"), backends.ArcpyBackend)
+    with pytest.raises(ValueError):
+        table.TableObj(os.path.join(memory_gdb.path, "missing"))
+
+
+def test_memory_tableobj(memory_gdb):
+    fc = table.TableObj(os.path.join(memory_gdb.path, "ds", "test_fc"))
+    assert fc.type == "Point"
+    assert fc.fields == ["OBJECTID", "ftext", "fint"]
+    assert fc.fields2 == ["ftext", "fint"]
+    assert fc.get_field_value_set("ftext") == {"val1", "val2", "val02", "NULL"}
+    assert fc.get_max_field_value("fint") == 10
+    assert fc.find_duplicate_field_values("fint", output="set") == {10, 4, 5, 7, None}
+    assert fc.get_multiple_field_value_set(["ftext", "fint"]) >= {"val1:NULL", "NULL:5"}
+    assert fc.profile()["fint"]["null_count"] == 2
+    assert fc.profile(parallel=2) == fc.profile()
+    assert fc._oid_extent() == (1, 11)
+    oids = [row[0] for rows in fc._iter_row_chunks(["OID@"], where_clause="fint = 5 AND ftext IS NOT NULL")
+            for row in rows]
+    assert oids == [7, 9]
+    result = fc.validate_domains()
+    assert result["ftext"].unmatched == {"val02": 1}
+    assert result["fint"].null_count == 2
+
+
+def test_memory_gdbobj(memory_gdb):
+    geodatabase = gdb.GDBObj(memory_gdb.path)
+    assert geodatabase.get_feature_class_names() == ["test_fc"]
+    assert geodatabase.get_table_names() == ["test_table"]
+    assert [item.dataset for item in gdb.walk_catalog(memory_gdb.path)] == ['', 'ds']
+    assert geodatabase.domain_index["fint_range"]["range"] == (1, 12)
+    assert geodatabase.get_domain_fields("ftext_coded") == [(os.path.join(memory_gdb.path, "ds", "test_fc"), "ftext")]
+
+
+def test_memory_export_workers(memory_gdb, tmp_path):
+    # worker processes start with the data backends registered in this process
+    layers = [os.path.join(memory_gdb.path, "ds", "test_fc"), os.path.join(memory_gdb.path, "test_table")]
+    results = table.export_field_sets(layers, str(tmp_path / "fields.xlsx"), workers=2)
+    assert [r["error"] for r in results] == [None, None]
+    assert results == table.export_field_sets(layers, str(tmp_path / "fields_serial.xlsx"))
+
+
+def test_memory_export_schema_to_csv_quoting(tmp_path):
+    backend = backends.MemoryBackend(str(tmp_path / "schema.gdb"))
+    path = backend.add_table("test_table", [("OBJECTID", "OID"), {"name": "ftext", "type": "String",
+                                                                 "aliasName": 'Text, "quoted"', "defaultValue": "a,b"}],
+                             [(1, "val1")])
+    backends.register_data_backend(backend.path, backend)
+    try:
+        csv_file = table.TableObj(path).export_schema_to_csv(str(tmp_path))
+    finally:
+        backends.register_data_backend(backend.path, None)
+    rows = table._schema_rows_from_csv(csv_file)
+    assert [(r["FieldName"], r["FieldAlias"], r["DefaultValue"]) for r in rows] == [
+        ("OBJECTID", "OBJECTID", ""), ("ftext", 'Text, "quoted"', "a,b")]
@@ -0,0 +1,209 @@
+from arc_utils import _filegdb
+from arc_utils import backends
+from arc_utils import gdb
+from arc_utils import table
+import datetime
+import os
+import pytest
+import struct
+import uuid
+
+_ITEM_TYPE_UUIDS = {"Feature Class": "{70737809-852C-4A03-9E22-2CECEA5B9BFA}",
+                    "Table": "{CD06BC3B-789D-4C51-AAFA-A467912B8965}",
+                    "Feature Dataset": "{74737149-DCB5-4257-8904-B9724E32A530}",
+                    "Coded Value Domain": "{8C368B12-A12E-4C7E-9638-C9C64E69E98F}",
+                    "Range Domain": "{C29DA988-8C3E-45F7-8B5C-18E51EE7BEB4}"}
+
+_NAMESPACES = 'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" ' \
+              'xmlns:xs="http://www.w3.org/2001/XMLSchema" ' \
+              'xmlns:typens="http://www.esri.com/schemas/ArcGIS/10.1"'
+
+# .gdbtable type codes of the field types written
+_TYPE_CODES = {"SmallInteger": 0, "Integer": 1, "Double": 3, "String": 4, "Date": 5, "OID": 6, "Raster": 9,
+               "GUID": 10, "XML": 12}
+_FORMATS = {"SmallInteger": "<h", "Integer": "<i", "Double": "<d", "Raster": "<i"}
+
+
+def _varuint(value):
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _utf16(text):
+    return bytes([len(text)]) + text.encode("utf-16-le")
+
+
+def _write_table(gdb_path, number, fields, rows):
+    """Write a version 3 .gdbtable and .gdbtablx. fields are (name, type) with the OID field first,
+    rows are keyed by OID, each a list of values of the fields after the OID field
+    """
+    descriptors = b""
+    for name, field_type in fields:
+        descriptors += _utf16(name) + _utf16(name) + bytes([_TYPE_CODES[field_type]])
+        if field_type == "OID":
+            descriptors += bytes([4, 2])
+        elif field_type == "String":
+            descriptors += struct.pack("<IB", 50, 5) + _varuint(0)
+        elif field_type in ("GUID", "XML"):
+            descriptors += bytes([38 if field_type == "GUID" else 0, 5])
+        elif field_type == "Raster":
+            # raster column name, no spatial reference, a managed raster (stored as a raster id)
+            descriptors += bytes([0, 5]) + _utf16("RASTER") + struct.pack("<HBB", 0, 0, 1)
+        else:
+            descriptors += bytes([8 if field_type in ("Double", "Date") else 4, 5, 0])
+    section = struct.pack("<IIH", 4, 0, len(fields)) + descriptors
+    data = bytearray(struct.pack("<iIIiiiQQ", 3, len(rows), 0, 5, 0, 0, 0, 40))
+    data += struct.pack("<I", len(section)) + section
+    stored = fields[1:]
+    null_bytes = (len(stored) + 7) // 8
+    offsets = {}
+    for oid, values in sorted(rows.items()):
+        nulls = sum(1 << i for i, value in enumerate(values) if value is None)
+        blob = nulls.to_bytes(null_bytes, "little")
+        for (name, field_type), value in zip(stored, values):
+            if value is None:
+                continue
+            if field_type in ("String", "XML"):
+                blob += _varuint(len(value.encode("utf-8"))) + value.encode("utf-8")
+            elif field_type == "GUID":
+                blob += uuid.UUID(value).bytes_le
+            elif field_type == "Date":
+                blob += struct.pack("<d", (value - datetime.datetime(1899, 12, 30)).total_seconds() / 86400)
+            else:
+                blob += struct.pack(_FORMATS[field_type], value)
+        offsets[oid] = len(data)
+        data += struct.pack("<I", len(blob)) + blob
+        struct.pack_into("<I", data, 8, max(struct.unpack_from("<I", data, 8)[0], len(blob)))
+    struct.pack_into("<Q", data, 24, len(data))
+    max_oid = max(rows, default=0)
+    total_blocks = -(-max_oid // 1024)
+    present = [b for b in range(total_blocks) if any(b * 1024 < oid <= (b + 1) * 1024 for oid in rows)]
+    index = bytearray(struct.pack("<iIII", 3, len(present), max_oid, 4))
+    for block in present:
+        index += b"".join(struct.pack("<I", offsets.get(block * 1024 + i + 1, 0)) for i in range(1024))
+    bitmap = b""
+    if len(present) != total_blocks:
+        bits = sum(1 << b for b in present)
+        bitmap = bits.to_bytes(-(-total_blocks // 32) * 4, "little")
+    if present:
+        index += struct.pack("<IIII", len(bitmap) // 4, total_blocks, len(present), 0) + bitmap
+    base = os.path.join(gdb_path, "a{:08x}".format(number))
+    with open(base + ".gdbtable", "wb") as f:
+        f.write(data)
+    with open(base + ".gdbtablx", "wb") as f:
+        f.write(index)
+
+
+@pytest.fixture()
+def filegdb(tmp_path):
+    # a file geodatabase with the test featureclass of conftest (without geometry),
+    # written as tables so the reader can be tested without arcpy
+    path = str(tmp_path / "arc_utils_test.gdb")
+    os.mkdir(path)
+    _write_table(path, 1, [("ID", "OID"), ("Name", "String"), ("FileFormat", "Integer")], {
+        1: ["GDB_SystemCatalog", 0], 4: ["GDB_Items", 0], 5: ["GDB_ItemTypes", 0], 9: ["test_table", 0],
+        10: ["raster_table", 0]})
+    _write_table(path, 5, [("ObjectID", "OID"), ("UUID", "GUID"), ("Name", "String")],
+                 {i + 1: [uid, name] for i, (name, uid) in enumerate(_ITEM_TYPE_UUIDS.items())})
+    fields = "".join("<GPFieldInfoEx xsi:type='typens:GPFieldInfoEx'><Name>{}</Name>"
+                     "<DomainName>{}</DomainName></GPFieldInfoEx>".format(*f)
+                     for f in (("ftext", "ftext_coded"), ("fint", "fint_range")))
+    definition = "<DETableInfo xsi:type='typens:DETableInfo' {}><OIDFieldName>OBJECTID</OIDFieldName>" \
+                 "<GPFieldInfoExs>{}</GPFieldInfoExs></DETableInfo>".format(_NAMESPACES, fields)
+    coded = "<GPCodedValueDomain2 xsi:type='typens:GPCodedValueDomain2' {}><DomainName>ftext_coded</DomainName>" \
+            "<FieldType>esriFieldTypeString</FieldType><CodedValues>{}</CodedValues>" \
+            "</GPCodedValueDomain2>".format(_NAMESPACES, "".join(
+                "<CodedValue><Name>{0}</Name><Code xsi:type='xs:string'>{0}</Code></CodedValue>".format(v)
+                for v in ("val1", "val2", "val3")))
+    value_range = "<GPRangeDomain2 xsi:type='typens:GPRangeDomain2' {}><DomainName>fint_range</DomainName>" \
+                  "<FieldType>esriFieldTypeSmallInteger</FieldType><MaxValue xsi:type='xs:short'>12</MaxValue>" \
+                  "<MinValue xsi:type='xs:short'>1</MinValue></GPRangeDomain2>".format(_NAMESPACES)
+    _write_table(path, 4, [("ObjectID", "OID"), ("Name", "String"), ("Path", "String"), ("Type", "GUID"),
+                           ("Definition", "XML")], {
+        1: ["test_table", "\\test_table", _ITEM_TYPE_UUIDS["Table"], definition],
+        2: ["ftext_coded", "\\ftext_coded", _ITEM_TYPE_UUIDS["Coded Value Domain"], coded],
+        3: ["fint_range", "\\fint_range", _ITEM_TYPE_UUIDS["Range Domain"], value_range],
+        4: ["raster_table", "\\raster_table", _ITEM_TYPE_UUIDS["Table"], None]})
+    records = (("val1", None), ("val1", 4), ("val1", 4), ("val2", 7), ("val02", 7), ("val1", 10),
+               ("val2", 5), ("val1", 10), ("val2", 5), ("val1", None), (None, 5))
+    day = datetime.datetime(2020, 1, 1, 12, 30)
+    rows = {i + 1: [key, val, i * 1.5, day + datetime.timedelta(days=i)] for i, (key, val) in enumerate(records)}
+    # a deleted row, and rows in the third block of 1024 OIDs only (a sparse row offset index)
+    rows[12] = None
+    rows[2049] = ["val3", 12, 0.5, day]
+    _write_table(path, 9, [("OBJECTID", "OID"), ("ftext", "String"), ("fint", "SmallInteger"),
+                           ("fdouble", "Double"), ("fdate", "Date")],
+                 {oid: values for oid, values in rows.items() if values is not None})
+    _write_table(path, 10, [("OBJECTID", "OID"), ("image", "Raster"), ("fname", "String")],
+                 {1: [1, "a.tif"], 2: [None, "b.tif"]})
+    _filegdb.set_filegdb_reader("python")
+    yield path
+    _filegdb.set_filegdb_reader("auto")
+
+
+def test_file_geodatabase_path():
+    assert _filegdb._file_geodatabase_path("c:/data/a.gdb/ds/fc") == "c:/data/a.gdb"
+    assert _filegdb._file_geodatabase_path("c:/data/a.gdb") == "c:/data/a.gdb"
+    assert _filegdb._file_geodatabase_path("c:/data/a.gdbx/b.gdb/fc") == "c:/data/a.gdbx/b.gdb"
+    assert _filegdb._file_geodatabase_path("c:/old.gdb_backup/a.shp") is None
+
+
+def test_filegdb_tableobj(filegdb):
+    tbl = table.TableObj(os.path.join(filegdb, "test_table"))
+    assert tbl.describe_obj.OIDFieldName == "OBJECTID"
+    assert tbl.fields == ["OBJECTID", "ftext", "fint", "fdouble", "fdate"]
+    assert tbl.field_dict["fint"]["type"] == "SmallInteger"
+    assert tbl.field_dict["fint"]["domain"] == "fint_range"
+    assert tbl.field_dict["ftext"]["length"] == 50
+    rows = [row for rows in tbl._iter_row_chunks(["OID@", "ftext", "fdate"], 5) for row in rows]
+    assert len(rows) == 12
+    assert rows[0] == (1, "val1", datetime.datetime(2020, 1, 1, 12, 30))
+    assert rows[-1][0] == 2049
+    assert tbl.get_field_value_set("ftext") == {"val1", "val2", "val02", "val3", "NULL"}
+    assert tbl.get_max_field_value("fint") == 12
+    assert tbl.find_duplicate_field_values("fint", output="set") == {10, 4, 5, 7, None}
+    assert tbl.profile()["fint"]["null_count"] == 2
+    assert tbl._oid_extent() == (1, 2049)
+    assert tbl.profile(parallel=2) == tbl.profile()
+    assert tbl.validate_domains(filegdb)["ftext"].unmatched == {"val02": 1}
+
+
+def test_filegdb_raster_field(filegdb):
+    # raster fields are listed but not read, the other fields of the table are
+    path = os.path.join(filegdb, "raster_table")
+    assert backends.get_data_backend(path).exists(path)
+    tbl = table.TableObj(path)
+    assert tbl.fields == ["OBJECTID", "image", "fname"]
+    assert tbl.field_dict["image"]["type"] == "Raster"
+    assert tbl.get_field_value_set("fname") == {"a.tif", "b.tif"}
+    with pytest.raises(ValueError):
+        list(tbl._iter_row_chunks(["image"]))
+
+
+def test_filegdb_where_clause(filegdb):
+    tbl = table.TableObj(os.path.join(filegdb, "test_table"))
+
+    def oids(where_clause):
+        return [row[0] for rows in tbl._iter_row_chunks(["OID@"], where_clause=where_clause) for row in rows]
+    assert oids("OBJECTID >= 3 AND OBJECTID < 6") == [3, 4, 5]
+    assert oids("fint = 5 AND ftext IS NOT NULL") == [7, 9]
+    assert oids("ftext = 'val02'") == [5]
+    assert oids("fint IS NULL") == [1, 10]
+    with pytest.raises(ValueError):
+        oids("fint = 5 OR fint = 4")
+
+
+def test_filegdb_gdbobj(filegdb):
+    geodatabase = gdb.GDBObj(filegdb)
+    assert sorted(geodatabase.get_table_names()) == ["raster_table", "test_table"]
+    assert geodatabase.domain_index["fint_range"]["range"] == (1, 12)
+    assert geodatabase.get_domain_fields("ftext_coded") == [(os.path.join(filegdb, "test_table"), "ftext")]
+    # the catalog is parsed once per geodatabase, and again when it changes
+    backend = backends.get_data_backend(filegdb)
+    assert backends.get_data_backend(os.path.join(filegdb, "test_table")) is backend
+    os.utime(os.path.join(filegdb, "a00000004.gdbtable"), ns=(0, 0))
+    assert backends.get_data_backend(filegdb) is not backend
@@ -25,3 +25,55 @@ def test_gdb_accepts_pathlike_and_wrapper_inputs(testdatabase):
     gdbobj_wrapper = gdb.GDBObj(PathWrapper(testdatabase.gdb))
     assert sorted(gdbobj_pathlike.get_feature_class_names()) == ['test_fc1', 'test_fc2']
     assert sorted(gdbobj_wrapper.get_all_domain_names()) == ['fint_range', 'ftext_coded']
+
+
+def test_walk_catalog_yields_full_paths(testdatabase):
+    items = list(gdb.walk_catalog(testdatabase.gdb, datatype="FeatureClass"))
+    assert sorted(item.name for item in items) == ['test_fc1', 'test_fc2']
+    assert sorted(item.path for item in items) == sorted([testdatabase.fc1, testdatabase.fc2])
+    assert all(item.dataset == '' for item in items)
+
+
+def test_gdb_catalog_does_not_change_workspace(testdatabase):
+    import arcpy
+    from concurrent.futures import ThreadPoolExecutor
+    arcpy.env.workspace = None
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda p: sorted(gdb.GDBObj(p).get_feature_class_paths()),
+                                [testdatabase.gdb, testdatabase.gdb]))
+    assert results[0] == results[1] == sorted([testdatabase.fc1, testdatabase.fc2])
+    assert arcpy.env.workspace is None
+
+
+def test_report_all_fc_as_text_parallel_matches_serial(testdatabase, tmp_path):
+    serial = gdb.report_all_fc_as_text(testdatabase.gdb, str(tmp_path / "serial.txt"))
+    parallel = gdb.report_all_fc_as_text(testdatabase.gdb, str(tmp_path / "parallel.txt"), workers=4)
+    with open(serial) as f:
+        serial_lines = f.read().splitlines()
+    with open(parallel) as f:
+        parallel_lines = f.read().splitlines()
+    assert serial_lines == parallel_lines
+    assert serial_lines[0].split('\t')[:3] == ['FCDataset', 'Feature', 'name']
+    assert len(serial_lines) == 1 + 2 * 4  # header + OBJECTID, Shape, ftext, fint per featureclass
+
+
+def test_report_all_fc_as_text_multi_character_sep(testdatabase, tmp_path):
+    output_file = gdb.report_all_fc_as_text(testdatabase.gdb, str(tmp_path / "report.txt"), sep=", ")
+    with open(output_file) as f:
+        lines = f.read().splitlines()
+    assert lines[0].split(", ")[:3] == ['FCDataset', 'Feature', 'name']
+    assert len(lines) == 1 + 2 * 4
+
+
+def test_gdb_domain_index_and_usage(testdatabase):
+    gdbobj = gdb.GDBObj(testdatabase.gdb)
+    assert gdbobj.domain_index['ftext_coded']['domainType'] == 'CodedValue'
+    assert sorted(gdbobj.domain_index['ftext_coded']['codedValues']) == ['val1', 'val2', 'val3']
+    assert gdbobj.domain_index['fint_range']['range'] == (1, 12)
+    assert sorted(gdbobj.get_domain_fields('fint_range')) == sorted([(testdatabase.fc1, 'fint'), (testdatabase.fc2, 'fint')])
+    assert gdbobj.get_unused_domain_names() == []
+
+
+def test_export_all_domains(testdatabase, tmp_path):
+    gdb.export_all_domains(testdatabase.gdb, str(tmp_path))
+    assert (tmp_path / 'ftext_coded_domain.txt').exists()
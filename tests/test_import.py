@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([REPO_DIR, env.get("PYTHONPATH", "")])
+    return subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+
+
+def test_import_does_not_import_arcpy():
+    result = _run("import sys, arc_utils, arc_utils.table, arc_utils.gdb, arc_utils.aprx\n"
+                  "print('arcpy' in sys.modules)")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+
+def test_submodules_load_on_attribute_access():
+    result = _run("import arc_utils\nprint(arc_utils.table.__name__, arc_utils.sketch.__name__)")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["arc_utils.table", "arc_utils.sketch"]
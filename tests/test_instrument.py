@@ -0,0 +1,48 @@
+from arc_utils import instrument
+from arc_utils import table
+import json
+from openpyxl import Workbook
+
+
+def test_instrument_counts_cursor_rows_by_entry_point(testdatabase, tmp_path):
+    with instrument.instrument(profile=True) as report:
+        tbl = table.TableObj(testdatabase.fc1)
+        tbl.get_field_value_set('ftext')
+    calls = report.calls['arc_utils.table.TableObj.get_field_value_set']
+    assert calls['da.SearchCursor open']['count'] == 1
+    assert calls['da.SearchCursor rows']['rows'] == 11
+    assert report.totals()['Exists']['count'] >= 2
+    assert report.wall_seconds > 0
+
+    out_json = tmp_path / "report.json"
+    report.to_json(str(out_json))
+    assert json.loads(out_json.read_text())['calls'] == report.calls
+    report.dump_stats(str(tmp_path / "report.prof"))
+    assert (tmp_path / "report.prof").exists()
+
+
+def test_instrument_is_off_outside_block(testdatabase):
+    with instrument.instrument() as report:
+        pass
+    table.TableObj(testdatabase.fc1).get_field_value_set('ftext')
+    assert report.calls == {}
+
+
+def test_instrument_times_worksheet_writes(testdatabase, tmp_path):
+    with instrument.instrument() as report:
+        table.TableObj(testdatabase.fc1).export_fields_to_worksheet(Workbook().active)
+        table.export_field_sets([testdatabase.fc1], str(tmp_path / "fields.xlsx"))
+    assert report.calls['arc_utils.table.TableObj.export_fields_to_worksheet']['openpyxl worksheet writes']['count'] == 1
+    export_calls = report.calls['arc_utils.table.export_field_sets']
+    assert export_calls['openpyxl worksheet writes']['count'] == 1
+    assert export_calls['openpyxl Workbook.save']['count'] == 1
+
+
+def test_tableobj_describes_table_once(testdatabase):
+    with instrument.instrument() as report:
+        tbl = table.TableObj(testdatabase.fc1)
+        tbl.describe_obj
+        tbl.name
+    totals = report.totals()
+    assert totals['Describe']['count'] == 1
+    assert 'Exists' not in totals
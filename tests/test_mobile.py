@@ -0,0 +1,128 @@
+from arc_utils import _mobile
+from arc_utils import gdb
+from arc_utils import table
+import pytest
+import sqlite3
+
+_ITEM_TYPE_UUIDS = {"Feature Class": "{70737809-852C-4A03-9E22-2CECEA5B9BFA}",
+                    "Table": "{CD06BC3B-789D-4C51-AAFA-A467912B8965}",
+                    "Feature Dataset": "{74737149-DCB5-4257-8904-B9724E32A530}",
+                    "Coded Value Domain": "{8C368B12-A12E-4C7E-9638-C9C64E69E98F}",
+                    "Range Domain": "{C29DA988-8C3E-45F7-8B5C-18E51EE7BEB4}"}
+
+_NAMESPACES = 'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" ' \
+              'xmlns:xs="http://www.w3.org/2001/XMLSchema" ' \
+              'xmlns:typens="http://www.esri.com/schemas/ArcGIS/10.1"'
+
+_FIELD_XML = "<GPFieldInfoEx xsi:type='typens:GPFieldInfoEx'><Name>{}</Name><AliasName>{}</AliasName>" \
+             "<FieldType>esriFieldType{}</FieldType><IsNullable>true</IsNullable>" \
+             "<DomainName>{}</DomainName><Length>{}</Length></GPFieldInfoEx>"
+
+
+@pytest.fixture()
+def mobilegdb(tmp_path):
+    # a mobile geodatabase with the catalog tables of the test geodatabase in conftest
+    path = str(tmp_path / "arc_utils_test.geodatabase")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE GDB_ItemTypes (UUID TEXT, Name TEXT)")
+    conn.executemany("INSERT INTO GDB_ItemTypes VALUES (?, ?)", [(v, k) for k, v in _ITEM_TYPE_UUIDS.items()])
+    conn.execute("CREATE TABLE GDB_Items (Name TEXT, Path TEXT, Type TEXT, Definition TEXT)")
+    fields = "".join([_FIELD_XML.format("OBJECTID", "OBJECTID", "OID", "", 4),
+                      _FIELD_XML.format("ftext", "Text Field", "String", "ftext_coded", 20),
+                      _FIELD_XML.format("fint", "fint", "SmallInteger", "fint_range", 2)])
+    definition = "<DEFeatureClassInfo xsi:type='typens:DEFeatureClassInfo' {}><OIDFieldName>OBJECTID</OIDFieldName>" \
+                 "<GPFieldInfoExs>{}</GPFieldInfoExs><ShapeType>esriGeometryPoint</ShapeType>" \
+                 "</DEFeatureClassInfo>".format(_NAMESPACES, fields)
+    coded = "<GPCodedValueDomain2 xsi:type='typens:GPCodedValueDomain2' {}><DomainName>ftext_coded</DomainName>" \
+            "<FieldType>esriFieldTypeString</FieldType><CodedValues>{}</CodedValues>" \
+            "</GPCodedValueDomain2>".format(_NAMESPACES, "".join(
+                "<CodedValue><Name>{0}</Name><Code xsi:type='xs:string'>{0}</Code></CodedValue>".format(v)
+                for v in ("val1", "val2", "val3")))
+    value_range = "<GPRangeDomain2 xsi:type='typens:GPRangeDomain2' {}><DomainName>fint_range</DomainName>" \
+                  "<FieldType>esriFieldTypeSmallInteger</FieldType><MaxValue xsi:type='xs:short'>12</MaxValue>" \
+                  "<MinValue xsi:type='xs:short'>1</MinValue></GPRangeDomain2>".format(_NAMESPACES)
+    conn.executemany("INSERT INTO GDB_Items VALUES (?, ?, ?, ?)", [
+        ("main.test_fc1", "\\test_fc1", _ITEM_TYPE_UUIDS["Feature Class"], definition),
+        ("main.ds", "\\ds", _ITEM_TYPE_UUIDS["Feature Dataset"], None),
+        ("main.test_fc2", "\\ds\\test_fc2", _ITEM_TYPE_UUIDS["Feature Class"], definition),
+        ("ftext_coded", "\\ftext_coded", _ITEM_TYPE_UUIDS["Coded Value Domain"], coded),
+        ("fint_range", "\\fint_range", _ITEM_TYPE_UUIDS["Range Domain"], value_range)])
+    records = (("val1", None), ("val1", 4), ("val1", 4), ("val2", 7), ("val02", 7), ("val1", 10),
+               ("val2", 5), ("val1", 10), ("val2", 5), ("val1", None), (None, 5))
+    for name in ("test_fc1", "test_fc2"):
+        conn.execute("CREATE TABLE {} (OBJECTID INTEGER PRIMARY KEY, ftext TEXT, fint INTEGER, "
+                     "SHAPE BLOB)".format(name))
+        conn.executemany("INSERT INTO {} (ftext, fint) VALUES (?, ?)".format(name), records)
+    conn.commit()
+    conn.close()
+    _mobile.set_mobile_reader("sqlite")
+    yield path
+    _mobile.set_mobile_reader("auto")
+
+
+def test_mobile_reader_setting():
+    assert _mobile.get_mobile_reader() == "auto"
+    with pytest.raises(ValueError):
+        _mobile.set_mobile_reader("gdal")
+    assert _mobile._mobile_geodatabase_path("c:/data/a.geodatabase/ds/fc") == "c:/data/a.geodatabase"
+    assert _mobile._mobile_geodatabase_path("c:/data/a.gdb/fc") is None
+
+
+def test_mobile_tableobj(mobilegdb):
+    fc = table.TableObj(mobilegdb + "/ds/test_fc2")
+    assert fc.describe_obj.shapeType == "Point"
+    assert fc.describe_obj.OIDFieldName == "OBJECTID"
+    assert fc.fields == ["OBJECTID", "ftext", "fint", "SHAPE"]
+    assert fc.field_dict["ftext"]["type"] == "String"
+    assert fc.field_dict["ftext"]["aliasName"] == "Text Field"
+    assert fc.field_dict["ftext"]["domain"] == "ftext_coded"
+    assert fc.field_dict["ftext"]["length"] == 20
+    assert fc.get_field_value_set("ftext") == {"val1", "val2", "val02", "NULL"}
+    assert fc.profile()["fint"]["null_count"] == 2
+    assert fc.get_multiple_field_value_set(["ftext", "fint"]) >= {"val1:NULL", "NULL:5"}
+    # with pushdown the values are queried in the database
+    table.set_sql_pushdown(True)
+    try:
+        assert fc.get_field_value_set("ftext") == {"val1", "val2", "val02", "NULL"}
+        assert fc.get_max_field_value("fint") == 10
+        assert fc.find_duplicate_field_values("fint", output="set") == {10, 4, 5, 7, None}
+    finally:
+        table.set_sql_pushdown(False)
+    result = fc.validate_domains()
+    assert result["ftext"].unmatched == {"val02": 1}
+    assert result["fint"].null_count == 2
+
+
+def test_mobile_gdbobj(mobilegdb):
+    geodatabase = gdb.GDBObj(mobilegdb)
+    assert sorted(geodatabase.get_feature_class_names()) == ["main.test_fc1", "main.test_fc2"]
+    assert [item.dataset for item in gdb.walk_catalog(mobilegdb)] == ['', 'ds']
+    assert geodatabase.domain_index["ftext_coded"]["codedValues"] == {"val1": "val1", "val2": "val2", "val3": "val3"}
+    assert geodatabase.domain_index["fint_range"]["range"] == (1, 12)
+    assert len(geodatabase.get_domain_fields("fint_range")) == 2
+
+
+def test_mobile_report_errors(mobilegdb, tmp_path):
+    # errors are reported (with arcpy messages only when arcpy is installed), not raised
+    assert gdb.report_all_fc_as_text(mobilegdb, output_file=str(tmp_path / "missing" / "report.txt")) is None
+    output_file = gdb.report_all_fc_as_text(mobilegdb, output_file=str(tmp_path / "report.txt"))
+    with open(output_file) as f:
+        assert len(f.read().splitlines()) == 9
+
+
+def test_mobile_quoted_identifiers(mobilegdb):
+    # table and field names which are SQL keywords
+    conn = sqlite3.connect(mobilegdb)
+    fields = "".join([_FIELD_XML.format("OBJECTID", "OBJECTID", "OID", "", 4),
+                      _FIELD_XML.format("group", "group", "String", "", 20)])
+    definition = "<DETableInfo xsi:type='typens:DETableInfo' {}><OIDFieldName>OBJECTID</OIDFieldName>" \
+                 "<GPFieldInfoExs>{}</GPFieldInfoExs></DETableInfo>".format(_NAMESPACES, fields)
+    conn.execute("INSERT INTO GDB_Items VALUES (?, ?, ?, ?)",
+                 ("main.order", "\\order", _ITEM_TYPE_UUIDS["Table"], definition))
+    conn.execute('CREATE TABLE "order" (OBJECTID INTEGER PRIMARY KEY, "group" TEXT)')
+    conn.executemany('INSERT INTO "order" ("group") VALUES (?)', [("a",), ("b",), (None,)])
+    conn.commit()
+    conn.close()
+    tbl = table.TableObj(mobilegdb + "/order")
+    assert tbl.get_field_value_set("group") == {"a", "b", "NULL"}
+    assert [row for rows in tbl._iter_row_chunks(["OID@", "group"]) for row in rows][0] == (1, "a")
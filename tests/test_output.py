@@ -0,0 +1,46 @@
+from arc_utils import output
+
+
+def test_buffered_messages_coalesce_progress(capsys):
+    with output.buffered_messages(min_interval=60):
+        for i in range(5):
+            output.output_msg("Processing {}".format(i), progress=True)
+        output.output_msg("Done")
+        assert capsys.readouterr().out == ""
+    assert capsys.readouterr().out == "Processing 4 (+4 similar messages)\nDone\n"
+
+
+def test_buffered_messages_flush_on_warning(capsys):
+    with output.buffered_messages(min_interval=60):
+        output.output_msg("first")
+        output.output_msg("careful", severity=1)
+        assert capsys.readouterr().out == "first\ncareful\n"
+
+
+def test_message_level_filters_messages(capsys):
+    output.set_message_level(1)
+    try:
+        output.output_msg("info")
+        output.output_msg("warning", severity=1)
+    finally:
+        output.set_message_level(0)
+    assert capsys.readouterr().out == "warning\n"
+
+
+def test_progressor_steps():
+    with output.Progressor("Testing", total=3, min_interval=0) as progress:
+        for _ in range(3):
+            progress.step()
+    assert progress.position == 3
+
+
+def test_buffered_messages_other_threads(capsys):
+    import threading
+
+    with output.buffered_messages(min_interval=60):
+        output.output_msg("buffered")
+        worker = threading.Thread(target=output.output_msg, args=("from worker",))
+        worker.start()
+        worker.join()
+        assert capsys.readouterr().out == "from worker\n"
+    assert capsys.readouterr().out == "buffered\n"
@@ -0,0 +1,62 @@
+from arc_utils import _pushdown
+import sqlite3
+import types
+
+
+def _sqlite_table(tmp_path):
+    database = str(tmp_path / "pushdown.geodatabase")
+    conn = sqlite3.connect(database)
+    conn.execute("CREATE TABLE parcels (OBJECTID INTEGER PRIMARY KEY, ftext TEXT, fint INTEGER)")
+    records = (("val1", None), ("val1", 4), ("val1", 4), ("val2", 7), ("val02", 7), ("val1", 10),
+               ("val2", 5), ("val1", 10), ("val2", 5), ("val1", None), (None, 5))
+    conn.executemany("INSERT INTO parcels (ftext, fint) VALUES (?, ?)", records)
+    conn.commit()
+    conn.close()
+    return database
+
+
+def test_sql_pushdown_queries(tmp_path):
+    pushdown = _pushdown.SQLPushdown(_pushdown._sqlite_executor(_sqlite_table(tmp_path)), "main.parcels")
+    assert pushdown.value_set("ftext") == {"val1", "val2", "val02", "NULL"}
+    assert pushdown.value_set("fint") == {4, 5, 7, 10, "NULL"}
+    assert pushdown.max_value("fint") == 10
+    assert sorted(pushdown.duplicate_counts(["fint"]), key=str) == [(10, 2), (4, 2), (5, 3), (7, 2), (None, 2)]
+    assert sorted(pushdown.duplicate_counts(["ftext", "fint"]), key=str) == [
+        ("val1", 10, 2), ("val1", 4, 2), ("val1", None, 2), ("val2", 5, 2)]
+
+
+def test_sql_pushdown_quoted_identifiers(tmp_path):
+    database = str(tmp_path / "quoted.geodatabase")
+    conn = sqlite3.connect(database)
+    conn.execute('CREATE TABLE "Land Parcels" (OBJECTID INTEGER PRIMARY KEY, "Zone Code" TEXT, "Order" INTEGER)')
+    conn.executemany('INSERT INTO "Land Parcels" ("Zone Code", "Order") VALUES (?, ?)',
+                     [("R1", 1), ("R1", 2), ("C2", 2)])
+    conn.commit()
+    conn.close()
+    pushdown = _pushdown.SQLPushdown(_pushdown._sqlite_executor(database), "main.Land Parcels")
+    assert _pushdown._quote_identifier('main.a"b') == '"main"."a""b"'
+    assert pushdown.value_set("Zone Code") == {"R1", "C2"}
+    assert pushdown.max_value("Order") == 2
+    assert pushdown.duplicate_counts(["Zone Code"]) == [("R1", 2)]
+
+
+def test_sql_pushdown_workspace_detection(tmp_path):
+    class Describe(object):
+        name = "main.parcels"
+
+    database = _sqlite_table(tmp_path)
+    assert isinstance(_pushdown._table_pushdown(Describe(), database), _pushdown.SQLPushdown)
+    assert _pushdown._table_pushdown(Describe(), str(tmp_path / "data.gdb")) is None
+    archived = Describe()
+    archived.isArchived = True
+    assert _pushdown._table_pushdown(archived, database) is None
+    archived = Describe()
+    archived.fields = [types.SimpleNamespace(name="GDB_TO_DATE")]
+    assert _pushdown._table_pushdown(archived, database) is None
+
+
+def test_arcsde_rows():
+    assert _pushdown._arcsde_rows(True) == []
+    assert _pushdown._arcsde_rows(10) == [(10,)]
+    assert _pushdown._arcsde_rows(["a", 2]) == [("a", 2)]
+    assert _pushdown._arcsde_rows([["a", 2], ["b", 3]]) == [("a", 2), ("b", 3)]
@@ -0,0 +1,52 @@
+from arc_utils import backends
+from arc_utils import result_cache
+from arc_utils import table
+import os
+import pytest
+
+
+@pytest.fixture()
+def memory_table(tmp_path):
+    backend = backends.MemoryBackend(str(tmp_path / "memory.gdb"))
+    path = backend.add_table("test_table", [("OBJECTID", "OID"), ("ftext", "String"), ("fint", "SmallInteger")],
+                             [(1, "val1", 4), (2, "val2", None), (3, "val1", 4)])
+    backends.register_data_backend(backend.path, backend)
+    yield backend, path
+    backends.register_data_backend(backend.path, None)
+    result_cache.disable_result_cache()
+
+
+def test_result_cache_hits(memory_table):
+    backend, path = memory_table
+    assert result_cache.get_result_cache() is None
+    cache = result_cache.enable_result_cache()
+    tbl = table.TableObj(path)
+    assert tbl.get_field_value_set("ftext") == {"val1", "val2"}
+    values = tbl.get_field_value_set("ftext", parallel=None)
+    assert values == {"val1", "val2"}
+    values.add("changed")  # results are copies
+    assert table.TableObj(path).get_field_value_set("ftext") == {"val1", "val2"}
+    assert tbl.get_multiple_field_value_set(["ftext", "fint"]) == {"val1:4", "val2:NULL"}
+    assert tbl.get_multiple_field_value_set(["ftext", "fint"], sep="|") == {"val1|4", "val2|NULL"}
+    assert tbl.get_field_value_rows() == tbl.get_field_value_rows()
+    assert cache.stats() == {"hits": 3, "misses": 4, "hit_ratio": 3 / 7, "entries": 4}
+    tbl.get_field_value_set("ftext", backend="numpy")  # cached apart from the cursor backend result
+    assert cache.stats()["misses"] == 5
+
+
+def test_result_cache_invalidation(memory_table):
+    backend, path = memory_table
+    cache = result_cache.enable_result_cache(max_entries=1)
+    tbl = table.TableObj(path)
+    assert tbl.get_field_value_set("fint") == {4, "NULL"}
+    backend.tables[os.path.normcase(path)]["rows"].append((4, "val3", 7))
+    assert tbl.get_field_value_set("fint") == {4, 7, "NULL"}
+    assert tbl.get_field_value_set("ftext") == {"val1", "val2", "val3"}
+    assert tbl.get_field_value_set("fint") == {4, 7, "NULL"}  # evicted by ftext
+    assert cache.stats()["hits"] == 0
+    tbl.get_field_value_set("fint")
+    tbl.refresh()
+    tbl.get_field_value_set("fint")
+    assert cache.stats()["hits"] == 1
+    with pytest.raises(ValueError):
+        result_cache.ResultCache(max_entries=0)
@@ -0,0 +1,62 @@
+from arc_utils import gdb
+from arc_utils import schema_cache
+from arc_utils import table
+import os
+
+
+def test_schema_cache_hits_on_repeat(testdatabase, tmp_path):
+    cache = schema_cache.enable_schema_cache(tmp_path / "schema_cache.sqlite")
+    try:
+        first = table.TableObj(testdatabase.fc1)
+        assert first.field_dict['fint']['type'] == u'SmallInteger'
+        assert cache.stats()['hits'] == 0
+        second = table.TableObj(testdatabase.fc1)
+        assert second.field_dict == first.field_dict
+        assert second.name == 'test_fc1'
+        assert cache.stats()['hits'] == 2
+
+        assert sorted(gdb.GDBObj(testdatabase.gdb).feature_classes) == ['test_fc1', 'test_fc2']
+        assert sorted(gdb.GDBObj(testdatabase.gdb).feature_classes) == ['test_fc1', 'test_fc2']
+        assert cache.stats()['hits'] == 3
+    finally:
+        schema_cache.disable_schema_cache()
+
+
+def test_schema_cache_invalidate(tmp_path):
+    cache = schema_cache.SchemaCache(tmp_path / "cache" / "schema_cache.sqlite", ttl=None)
+    data_path = tmp_path / "data"
+    data_path.mkdir()
+    cache.set(str(tmp_path / "missing.sde" / "db.tbl"), "field_dict", {"a": 1})
+    # no change stamp and no ttl, so entries for enterprise paths never match
+    assert cache.get(str(tmp_path / "missing.sde" / "db.tbl"), "field_dict") is None
+    cache.set(str(data_path), "field_dict", {"a": 1})
+    assert cache.get(str(data_path), "field_dict") == {"a": 1}
+    cache.invalidate(str(data_path))
+    assert cache.get(str(data_path), "field_dict") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "hit_ratio": 1 / 3}
+
+
+def test_schema_cache_value_types(tmp_path):
+    import datetime
+
+    cache = schema_cache.SchemaCache(tmp_path / "schema_cache.sqlite")
+    data_path = tmp_path / "data"
+    data_path.mkdir()
+    field_dict = {"fdate": {"defaultValue": datetime.datetime(2020, 1, 1, 12, 30)},
+                  "fday": {"defaultValue": datetime.date(2020, 1, 1)},
+                  "ftime": {"defaultValue": datetime.time(12, 30)}, "ftext": {"defaultValue": "a"}}
+    cache.set(str(data_path), "field_dict", field_dict)
+    assert cache.get(str(data_path), "field_dict") == field_dict
+    # values of other types are not cached
+    cache.set(str(data_path), "describe", {"value": object()})
+    assert cache.get(str(data_path), "describe") is None
+
+
+def test_change_stamp_finds_gdb_component(tmp_path):
+    folder = tmp_path / "data.gdbx"
+    gdb_path = folder / "test.gdb"
+    gdb_path.mkdir(parents=True)
+    (gdb_path / "a00000004.gdbtable").write_bytes(b"")
+    # the stamp comes from test.gdb, not a data.gdb prefix of data.gdbx
+    assert schema_cache._change_stamp(str(gdb_path / "fc")) == max(
+        os.path.getmtime(str(gdb_path)), os.path.getmtime(str(gdb_path / "a00000004.gdbtable")))
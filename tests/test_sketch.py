@@ -0,0 +1,24 @@
+from arc_utils import sketch
+import pytest
+
+
+def test_hyperloglog_count_and_merge():
+    first = sketch.HyperLogLog(error=0.01).update("id{}".format(i) for i in range(0, 60000))
+    second = sketch.HyperLogLog(error=0.01).update("id{}".format(i) for i in range(40000, 100000))
+    assert abs(first.count() - 60000) < 60000 * 0.05
+    assert abs(first.merge(second).count() - 100000) < 100000 * 0.05
+    assert sketch.HyperLogLog().update([1, 2, 3, 3, 2]).count() == 3
+    with pytest.raises(ValueError):
+        sketch.HyperLogLog(error=0.01).merge(sketch.HyperLogLog(error=0.1))
+
+
+def test_spacesaving_top_and_merge():
+    values = ["a"] * 500 + ["b"] * 300 + ["c"] * 200 + list(range(5000))
+    first = sketch.SpaceSaving(error=0.01).update(values[::2])
+    second = sketch.SpaceSaving(error=0.01).update(values[1::2])
+    merged = first.merge(second)
+    top = merged.top(3)
+    assert [value for value, count in top] == ["a", "b", "c"]
+    for (value, count), expected in zip(top, [500, 300, 200]):
+        assert expected <= count <= expected + merged.max_error()
+    assert merged.total == len(values)
@@ -127,3 +127,222 @@ def test_find_duplicate_field_values_dataframe_output(testdatabase):
     assert isinstance(dups_alias, pandas.DataFrame)
     assert "count" in dups_alias.columns
 
+
+
+def test_tableobj_profile_single_pass(testdatabase):
+    tbl = table.TableObj(testdatabase.fc1)
+    profiles = tbl.profile(['ftext', 'fint'])
+    assert sorted(profiles) == ['fint', 'ftext']
+    assert profiles['ftext']['values'] == tbl.get_field_value_set('ftext')
+    assert profiles['ftext']['null_count'] == 1
+    assert profiles['ftext']['max_value'] == tbl.get_max_field_value('ftext')
+    assert profiles['ftext']['max_length_value'] == tbl.get_max_field_value('ftext', lengthcomp=True)
+    assert profiles['ftext']['max_length'] == tbl.get_max_field_value_length('ftext')
+    assert profiles['fint']['values'] == tbl.get_field_value_set('fint')
+    assert profiles['fint']['null_count'] == 2
+    assert profiles['fint']['max_value'] == 10
+    assert profiles['fint']['max_length'] == 2
+
+
+def test_export_field_sets_with_workers(testdatabase, tmp_path):
+    out_xlsx = tmp_path / "field_sets_parallel.xlsx"
+    inputs = [testdatabase.fc1, "invalidpath", testdatabase.fc2]
+    results = table.export_field_sets(inputs, str(out_xlsx), workers=2)
+    assert out_xlsx.exists()
+    assert [r["input"] for r in results] == ['test_fc1', 'invalidpath', 'test_fc2']
+    assert results[0]["error"] is None
+    assert results[1]["error"] == "invalid path"
+    assert results[2]["error"] is None
+
+
+def test_tableobj_lazy_metadata_and_refresh(testdatabase):
+    tbl = table.TableObj(testdatabase.fc1)
+    assert "field_dict" not in vars(tbl)
+    assert tbl.fields2 == [u'ftext', u'fint']
+    assert "field_dict" in vars(tbl)
+    tbl.refresh()
+    assert "field_dict" not in vars(tbl)
+    assert "fields2" not in vars(tbl)
+    assert tbl.fields == [u'OBJECTID', u'Shape', u'ftext', u'fint']
+
+
+def test_tableobj_numpy_backend_matches_cursor(testdatabase):
+    pytest.importorskip("numpy")
+    tbl = table.TableObj(testdatabase.fc1)
+    for field in ['ftext', 'fint']:
+        assert tbl.get_field_value_set(field, backend='numpy', chunk_size=4) == tbl.get_field_value_set(field)
+        assert tbl.get_max_field_value(field, backend='numpy', chunk_size=4) == tbl.get_max_field_value(field)
+        assert tbl.get_max_field_value_length(field, backend='numpy') == tbl.get_max_field_value_length(field)
+    assert tbl.get_max_field_value('ftext', lengthcomp=True, backend='numpy') == 'val02'
+    with pytest.raises(ValueError):
+        tbl.get_field_value_set('ftext', backend='invalid')
+
+
+def test_tableobj_numpy_backend_keeps_empty_and_min_values(testdatabase):
+    # empty strings and the smallest integers are values, not nulls
+    pytest.importorskip("numpy")
+    import arcpy
+    arcpy.CreateTable_management(testdatabase.gdb, "test_numpy_nulls")
+    path = os.path.join(testdatabase.gdb, "test_numpy_nulls")
+    arcpy.AddField_management(path, "ftext", "TEXT", field_length=10)
+    arcpy.AddField_management(path, "fshort", "SHORT")
+    arcpy.AddField_management(path, "flong", "LONG")
+    with arcpy.da.InsertCursor(path, ["ftext", "fshort", "flong"]) as cursor:
+        for row in (("", -32768, -2147483648), (None, None, None), ("a", 3, 5)):
+            cursor.insertRow(row)
+    tbl = table.TableObj(path)
+    for field in ['ftext', 'fshort', 'flong']:
+        assert tbl.get_field_value_set(field, backend='numpy', chunk_size=2) == tbl.get_field_value_set(field)
+        assert tbl.get_max_field_value(field, backend='numpy', chunk_size=2) == tbl.get_max_field_value(field)
+        assert tbl.get_max_field_value_length(field, backend='numpy') == tbl.get_max_field_value_length(field)
+    assert tbl.get_field_value_set('ftext', backend='numpy') == {"", "a", "NULL"}
+    assert tbl.get_field_value_set('fshort', backend='numpy') == {-32768, 3, "NULL"}
+
+
+def test_find_duplicate_field_values_streaming_matches_dataframe(testdatabase):
+    pytest.importorskip("pandas")
+    tbl = table.TableObj(testdatabase.fc1)
+    expected = tbl.find_duplicate_field_values(["ftext", "fint"], output="df").reset_index(drop=True)
+    in_memory = tbl.find_duplicate_field_values(["ftext", "fint"], output="df", streaming=True)
+    spilled = tbl.find_duplicate_field_values(["ftext", "fint"], output="df", streaming=True, max_keys=2)
+    assert list(in_memory.columns) == ["ftext", "fint", "count"]
+    assert in_memory.equals(expected)
+    assert spilled.equals(expected)
+
+
+def test_duplicate_key_counts_splits_large_partitions():
+    # partitions of more than max_keys keys are split again rather than loaded whole
+    rows = [(i % 5000,) for i in range(12000)]
+    expected = {key: count for key, count in collections.Counter(rows).items() if count > 1}
+    assert dict(table._duplicate_key_counts(iter(rows), max_keys=50, partitions=4)) == expected
+
+
+def test_tableobj_profile_approximate(testdatabase):
+    tbl = table.TableObj(testdatabase.fc1)
+    profiles = tbl.profile_approximate(['ftext', 'fint'], top_k=2)
+    assert profiles['ftext']['distinct_count'] == 3
+    assert profiles['ftext']['null_count'] == 1
+    assert profiles['ftext']['top_values'] == [('val1', 6), ('val2', 3)]
+    assert profiles['fint']['distinct_count'] == 4
+    rows = dict(tbl.get_field_value_rows(approximate=True))
+    assert rows['ftext'].startswith('~3 distinct + NULL (1), top ')
+
+
+def test_tableobj_validate_domains(testdatabase):
+    tbl = table.TableObj(testdatabase.fc1)
+    result = tbl.validate_domains()
+    assert sorted(result) == ['fint', 'ftext']
+    assert result['ftext'].domain == 'ftext_coded'
+    assert result['ftext'].match == {'val1': 6, 'val2': 3}
+    assert result['ftext'].unmatched == {'val02': 1}
+    assert result['ftext'].null_count == 1
+    assert result['fint'].match == {4: 2, 5: 3, 7: 2, 10: 2}
+    assert result['fint'].unmatched == {}
+    assert result['fint'].null_count == 2
+
+
+def test_import_schema_to_fc_from_csv(testdatabase, tmp_path):
+    tbl = table.TableObj(testdatabase.fc1)
+    csv_file = tbl.export_schema_to_csv(str(tmp_path))
+    out_fc = table.import_schema_to_fc(csv_file, os.path.join(testdatabase.gdb, 'schema_csv_fc'),
+                                       geometry_type='POINT')
+    new_tbl = table.TableObj(out_fc)
+    assert new_tbl.type == u'Point'
+    assert new_tbl.fields2 == [u'ftext', u'fint']
+    assert new_tbl.field_dict['ftext']['length'] == 20
+    assert new_tbl.field_dict['ftext']['domain'] == 'ftext_coded'
+    assert new_tbl.field_dict['fint']['domain'] == 'fint_range'
+
+
+def test_import_schema_to_fc_from_table(testdatabase):
+    tbl = table.TableObj(testdatabase.fc1)
+    out_fc = table.import_schema_to_fc(None, os.path.join(testdatabase.gdb, 'schema_table_fc'),
+                                       schema_from_table=tbl)
+    assert table.compare_schema(tbl, out_fc) == [
+        'OBJECTID field same in both', 'Shape field same in both', 'fint field same in both',
+        'ftext field same in both']
+
+
+def test_schema_field_descriptions():
+    rows = [{"FieldName": "OBJECTID", "FieldType": "OID"},
+            {"FieldName": "ftext", "FieldType": "TEXT", "FieldLength": "20", "FieldAlias": "Text, field",
+             "isNullable": "True", "Required": "False", "FieldDomain": "ftext_coded", "DefaultValue": "None"},
+            {"FieldName": "fnum", "FieldType": "DOUBLE", "FieldPrecision": 10, "FieldScale": 2,
+             "isNullable": False, "Required": False, "FieldDomain": "missing", "DefaultValue": 0.5},
+            {"FieldName": "Shape", "FieldType": "GEOMETRY"}]
+    descriptions, options, has_geometry = table._schema_field_descriptions(rows, {"ftext_coded": {}})
+    assert descriptions == [["ftext", "TEXT", "Text, field", 20, "", "ftext_coded"],
+                            ["fnum", "DOUBLE", "fnum", "", 0.5, ""]]
+    assert options == {"fnum": (10, 2, False, False)}
+    assert has_geometry
+
+
+def test_write_field_value_rows_overflow(tmp_path):
+    from openpyxl import Workbook
+
+    rows = [("long", ", ".join("v{}".format(i) for i in range(10))), ("short", "a, b")]
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("values")
+    assert table._write_field_value_rows(ws, rows, overflow="rows", cell_limit=12) == 7
+    wb.save(str(tmp_path / "overflow_rows.xlsx"))
+    assert table._split_values_text(rows[0][1], 12) == ['v0, v1, v2', 'v3, v4, v5', 'v6, v7, v8', 'v9']
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "values"
+    ws["A1"] = "existing"
+    assert table._write_field_value_rows(ws, rows, overflow="sheet", cell_limit=12) == 4
+    assert ws["A1"].value == "Field"
+    assert wb.sheetnames == ["values", "values~long"]
+    assert ws["B2"].value == "38 characters, see sheet values~long"
+    assert [r[0] for r in wb["values~long"].values] == ["long", 'v0, v1, v2', 'v3, v4, v5', 'v6, v7, v8', 'v9']
+
+
+def test_export_field_sets_streaming(testdatabase, tmp_path):
+    from openpyxl import load_workbook
+
+    out_xlsx = tmp_path / "field_sets_streaming.xlsx"
+    results = table.export_field_sets([testdatabase.fc1, testdatabase.fc2], str(out_xlsx), streaming=True)
+    assert [r["sheet"] for r in results] == ['test_fc1', 'test_fc2']
+    wb = load_workbook(str(out_xlsx))
+    assert wb.sheetnames == ['test_fc1', 'test_fc2']
+    assert wb['test_fc1']["A1"].value == "Field"
+
+
+def test_export_profiles_to_parquet(testdatabase, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    results = table.export_profiles_to_parquet([testdatabase.fc1, testdatabase.fc2], str(tmp_path))
+    assert [r["error"] for r in results] == [None, None]
+    records = {r["field"]: r for r in parquet.read_table(results[0]["file"]).to_pylist()}
+    assert sorted(records) == ['fint', 'ftext']
+    assert records['ftext']['table'] == 'test_fc1'
+    assert records['ftext']['values'] == ['val02', 'val1', 'val2']
+    assert records['ftext']['null_count'] == 1
+    assert records['ftext']['distinct_count'] == 3
+    assert records['fint']['max_value'] == '10'
+
+
+def test_tableobj_iter_batches(testdatabase):
+    tbl = table.TableObj(testdatabase.fc1)
+    batches = list(tbl.iter_batches(['OID@', 'ftext', 'fint'], batch_size=4))
+    assert [len(b) for b in batches] == [4, 4, 3]
+    assert batches[0].dtype.names == ('OID@', 'ftext', 'fint')
+    assert batches[0]['OID@'].tolist() == [1, 2, 3, 4]
+    assert batches[0]['fint'].tolist() == [None, 4, 4, 7]
+    assert int(sum(b['ftext'].mask.sum() for b in batches)) == 1
+
+    pytest.importorskip("pyarrow")
+    record_batch = next(tbl.iter_batches(['ftext', 'fint'], where_clause="fint = 4", output="arrow"))
+    assert record_batch.num_rows == 2
+    assert record_batch.column(0).to_pylist() == ['val1', 'val1']
+
+
+def test_tableobj_parallel_partitioned_scan(testdatabase):
+    tbl = table.TableObj(testdatabase.fc1)
+    assert tbl._oid_partitions(4) == ['OBJECTID >= 1 AND OBJECTID <= 3', 'OBJECTID >= 4 AND OBJECTID <= 6',
+                                      'OBJECTID >= 7 AND OBJECTID <= 9', 'OBJECTID >= 10 AND OBJECTID <= 11']
+    assert tbl.get_field_value_set('ftext', parallel=2) == tbl.get_field_value_set('ftext')
+    assert tbl.get_max_field_value('fint', parallel=2) == 10
+    assert tbl.get_max_field_value('ftext', lengthcomp=True, parallel=2) == 'val02'
+    assert tbl.find_duplicate_field_values('fint', parallel=2) == tbl.find_duplicate_field_values('fint')
+    assert tbl.profile(parallel=2) == tbl.profile()